@@ -0,0 +1,49 @@
+from collections import deque
+
+from backend.algorithms.core.dijkstra.csr_graph import CSRGraph
+
+
+def spfa(n: int, edges: list[tuple[int, int, float]], source: int) -> list[float]:
+    """
+    Intuition:
+        Shortest Path Faster Algorithm: Bellman-Ford that only relaxes the out-edges
+        of vertices whose distance just improved, kept in a FIFO queue (each at most once).
+        Edges out of settled regions are never re-examined, so on sparse graphs it
+        usually runs far below its O(VE) worst case.
+
+        Negative cycles: `hops[v]` counts the relaxations along v's current best path.
+        Without a negative cycle that path is simple, so it has at most V - 1 edges.
+        Reaching V hops means the path repeats a vertex and the cycle it closes is negative.
+
+    Time Complexity:
+        O(VE) worst case, typically O(E)
+
+    Args:
+        n: number of vertices `0..n-1`.
+        edges: (u, v, weight) triples.
+        source: starting vertex.
+
+    Returns:
+        `dist[v]` = shortest-path cost from `source`, `inf` where unreachable.
+    """
+
+    graph = CSRGraph.from_edges(n, edges, typecode="d")
+    offsets, targets, weights = graph.offsets, graph.targets, graph.weights
+
+    d, hops, queued = [float("inf")] * n, [0] * n, [False] * n
+    d[source], queued[source] = 0, True
+    queue = deque([source])
+
+    while queue:
+        queued[u := queue.popleft()] = False
+        d_u = d[u]
+        for i in range(offsets[u], offsets[u + 1]):
+            if (nd := d_u + weights[i]) < d[v := targets[i]]:
+                d[v], hops[v] = nd, hops[u] + 1
+                if hops[v] >= n:
+                    raise Exception("Negative-weight cycle")
+                if not queued[v]:
+                    queued[v] = True
+                    queue.append(v)
+
+    return d
@@ -0,0 +1,53 @@
+import numpy as np
+
+
+def bellman_ford_vectorized(
+    n: int, edges: list[tuple[int, int, float]], source: int, max_edges: int | None = None
+) -> np.ndarray:
+    r"""
+    Intuition:
+        Every pass relaxes all edges at once over parallel edge arrays `u`, `v`, `w`:
+        `d[u] + w` gathers one candidate per edge, and `np.minimum.at(d, v, candidates)`
+        scatters them, keeping the smallest candidate per target.
+        A plain `d[v] = candidates` would keep the last write when a target repeats.
+
+        The candidates are gathered before the scatter, so pass i only extends $\delta_{i-1}$:
+        after i passes `d[v]` is the best cost using at most i edges, without copying `d`.
+        That is what `max_edges` bounds (k stops = k + 1 edges).
+
+    Expressions:
+        'better = candidates < d[v]': only improving edges are scattered
+        'if not better.any()': distances have stabilized—no negative cycles reachable
+
+    Time Complexity:
+        O(VE)
+        but each pass is a few vectorized O(E) array operations instead of E interpreted steps.
+
+    Args:
+        n: number of vertices `0..n-1`.
+        edges: (u, v, weight) triples.
+        source: starting vertex.
+        max_edges: most edges a path may use; None for unrestricted shortest paths,
+          which raise on a reachable negative-weight cycle.
+
+    Returns:
+        float64 array of distances, `inf` where unreachable.
+    """
+
+    e = np.asarray(edges, dtype=np.float64).reshape(-1, 3)
+    u, v, w = e[:, 0].astype(np.intp), e[:, 1].astype(np.intp), e[:, 2]
+
+    d = np.full(n, np.inf)
+    d[source] = 0
+
+    for _ in range(n - 1 if max_edges is None else max_edges):
+        candidates = d[u] + w
+        better = candidates < d[v]
+        if not better.any():
+            return d
+        np.minimum.at(d, v[better], candidates[better])
+
+    if max_edges is None and (d[u] + w < d[v]).any():
+        raise Exception("Negative-weight cycle")
+
+    return d
@@ -21,7 +21,7 @@ def dijkstra(graph: dict[str, dict[str, int]], s: str):
         d_u, u = heapq.heappop(pq)
         if d_u > d[u]:
             continue
-        for v ,w in graph[u]:
+        for v, w in graph[u].items():
             if (weight := d_u + w) < d[v]:
                 d[v], p[v] = weight, u
                 heapq.heappush(pq, (weight, v))
@@ -0,0 +1,76 @@
+from array import array
+from collections.abc import Iterable
+from heapq import heapify, heappop, heappush
+
+from backend.algorithms.core.dijkstra.csr_graph import CSRGraph
+
+
+def dijkstra_csr(
+    graph: CSRGraph, sources: int | Iterable[int], target: int | None = None
+) -> tuple[list[float], array]:
+    """
+    Intuition:
+        Lazy-deletion Dijkstra over integer vertex ids:
+        `dist` and `parent` are flat arrays indexed by vertex, and the out-edges
+        of `u` are one contiguous slice of the graph's arrays. The hot loop
+        does no hashing at all.
+
+        Multi-source: every source starts at distance 0, which is Dijkstra
+        from a virtual vertex with a 0-weight edge to each of them
+        (e.g. nearest facility, or BFS-like spreading from several cells).
+
+        Early exit: a vertex's distance is final when it is popped, so we stop
+        as soon as `target` is popped. Other vertices may then hold
+        upper bounds only.
+
+    Time Complexity:
+        O((V + E) log V)
+
+    Args:
+        graph: non-negative edge weights.
+        sources: a vertex id or several.
+        target: stop once this vertex's distance is final.
+
+    Returns:
+        (dist, parent): `dist[v]` is the shortest distance (`inf` if unreachable),
+        `parent[v]` the previous vertex on that path (-1 for sources and unreachable vertices).
+    """
+
+    dist = [float("inf")] * graph.n
+    parent = array("i", [-1]) * graph.n
+    pq = []
+    for s in [sources] if isinstance(sources, int) else sources:
+        dist[s] = 0
+        pq.append((0, s))
+    heapify(pq)
+
+    offsets, targets, weights = graph.offsets, graph.targets, graph.weights
+    while pq:
+        d_u, u = heappop(pq)
+        if d_u > dist[u]:  # stale entry
+            continue
+        if u == target:
+            break
+        for i in range(offsets[u], offsets[u + 1]):
+            if (nd := d_u + weights[i]) < dist[v := targets[i]]:
+                dist[v], parent[v] = nd, u
+                heappush(pq, (nd, v))
+
+    return dist, parent
+
+
+def shortest_path(dist: list[float], parent: array, target: int) -> list[int]:
+    """
+    Intuition:
+        Follow `parent` back from `target` to the source that reached it.
+
+    Returns:
+        The vertices from source to target, or [] if target is unreachable.
+    """
+
+    if dist[target] == float("inf"):
+        return []
+    path = [target]
+    while (u := parent[path[-1]]) != -1:
+        path.append(u)
+    return path[::-1]
@@ -0,0 +1,192 @@
+"""
+Bitboard Tic Tac Toe Player
+
+Same game as tictactoe.py with each position encoded as two 9-bit masks
+(bit 3*i + j set = that player owns cell (i, j)), so wins, moves and the side
+to move are a few integer operations instead of scans over nested lists.
+The AI player is negamax with alpha-beta pruning over a transposition table
+keyed by the position's canonical form under the 8 symmetries of the board.
+"""
+
+from game import Game
+
+from tictactoe import EMPTY, Action, Board, O, Player, X
+
+# (X's mask, O's mask)
+State = tuple[int, int]
+
+FULL = 0b111_111_111
+LINES = (
+    0b000_000_111, 0b000_111_000, 0b111_000_000,  # rows
+    0b001_001_001, 0b010_010_010, 0b100_100_100,  # columns
+    0b100_010_001, 0b001_010_100,                 # diagonals
+)
+# WINS[mask]: the mask contains a full line
+WINS = bytes(any(mask & line == line for line in LINES) for mask in range(1 << 9))
+# Center, corners, edges: strong moves first make alpha-beta cut earlier
+MOVE_ORDER = tuple(1 << cell for cell in (4, 0, 2, 6, 8, 1, 3, 5, 7))
+
+# Transposition table flags: the stored value is exact, or only a lower/upper bound
+EXACT, LOWER, UPPER = 0, 1, 2
+
+
+def _symmetry_tables() -> tuple[tuple[int, ...], ...]:
+    """For each of the 8 rotations/reflections, a table mapping every 9-bit mask to its image."""
+    tables = []
+    for transpose in (False, True):
+        for turns in range(4):
+            image = []
+            for cell in range(9):
+                i, j = divmod(cell, 3)
+                if transpose:
+                    i, j = j, i
+                for _ in range(turns):
+                    i, j = j, 2 - i
+                image.append(3 * i + j)
+            tables.append(tuple(
+                sum(1 << image[cell] for cell in range(9) if mask >> cell & 1)
+                for mask in range(1 << 9)
+            ))
+    return tuple(tables)
+
+
+SYMMETRIES = _symmetry_tables()
+
+
+class BitboardTicTacToe(Game[State, Action, Player]):
+    """
+    Tic-tac-toe on bitboards with a symmetry-reduced transposition table.
+
+    Representation:
+        - state = (x, o) masks; the side to move follows from their popcounts
+        - win test = one lookup in WINS, precomputed from the 8 line masks
+        - result() builds a new tuple of two ints, no board copy
+
+    Transposition table:
+        Keyed by min over the 8 symmetries of `me | opp << 9`, the masks of the
+        side to move and of the other side, so all 8 images of a position share an entry.
+        Alpha-beta only proves a bound when a search fails high or low, so each entry
+        stores a flag with its value: EXACT, LOWER (value ≥ stored) or UPPER (value ≤ stored).
+        Storing cut-off values as exact (as `TicTacToe` does) returns wrong values
+        when the same position is later searched with a wider window.
+
+    Time Complexity Summary:
+        - result / winner / player: O(1) bit operations
+        - Minimax: at most one table entry per canonical position
+          (574 after asking for a move in every reachable position; TicTacToe stores 5477)
+        - Persistent transposition table across moves
+    """
+
+    def __init__(self):
+        """Initialize with an empty transposition table that persists across moves."""
+        self._memo: dict[int, tuple[int, int]] = {}
+
+    def initial_state(self) -> State:
+        return 0, 0
+
+    def player(self, state: State) -> Player:
+        """X if move counts are equal (X goes first), otherwise O."""
+        x, o = state
+        return X if x.bit_count() == o.bit_count() else O
+
+    def actions(self, state: State) -> set[Action]:
+        """All empty cell positions (i, j)."""
+        occupied = state[0] | state[1]
+        return {divmod(cell, 3) for cell in range(9) if not occupied >> cell & 1}
+
+    def result(self, state: State, action: Action) -> State:
+        """New state with the current player's mark at action position."""
+        x, o = state
+        bit = 1 << (3 * action[0] + action[1])
+        if (x | o) & bit:
+            raise ValueError("Invalid action: cell already occupied")
+        return (x | bit, o) if x.bit_count() == o.bit_count() else (x, o | bit)
+
+    def winner(self, state: State) -> Player | None:
+        x, o = state
+        return X if WINS[x] else (O if WINS[o] else None)
+
+    def terminal(self, state: State) -> bool:
+        x, o = state
+        return bool(WINS[x] or WINS[o]) or x | o == FULL
+
+    def utility(self, state: State) -> int:
+        """1 if X won, -1 if O won, 0 for draw."""
+        x, o = state
+        return 1 if WINS[x] else (-1 if WINS[o] else 0)
+
+    def minimax(self, state: State) -> Action | None:
+        """Optimal move using negamax with alpha-beta pruning and the transposition table."""
+        if self.terminal(state):
+            return None
+
+        x, o = state
+        me, opp = (x, o) if x.bit_count() == o.bit_count() else (o, x)
+        memo = self._memo
+
+        def negamax(me: int, opp: int, alpha: int, beta: int) -> int:
+            """
+            Args:
+                me: mask of the side to move; the value is from its point of view
+                opp: mask of the side that just moved
+                alpha: the best value the side to move can guarantee so far
+                beta: the best value the opponent lets it reach
+            """
+            if WINS[opp]:
+                return -1
+            if me | opp == FULL:
+                return 0
+
+            key = min(t[me] | t[opp] << 9 for t in SYMMETRIES)
+            if (entry := memo.get(key)) is not None:
+                value, flag = entry
+                if flag == EXACT:
+                    return value
+                if flag == LOWER:
+                    alpha = max(alpha, value)
+                else:
+                    beta = min(beta, value)
+                if alpha >= beta:
+                    return value
+
+            alpha_0, value = alpha, -1
+            empty = FULL & ~(me | opp)
+            for bit in MOVE_ORDER:
+                if empty & bit:
+                    value = max(value, -negamax(opp, me | bit, -beta, -alpha))
+                    alpha = max(alpha, value)
+                    if alpha >= beta:
+                        break
+
+            flag = UPPER if value <= alpha_0 else (LOWER if value >= beta else EXACT)
+            memo[key] = value, flag
+            return value
+
+        # Root: the first move reaching the best value, stopping early at a forced win
+        best, best_value = None, -2
+        empty = FULL & ~(me | opp)
+        for bit in MOVE_ORDER:
+            if empty & bit:
+                value = -negamax(opp, me | bit, -1, -best_value)
+                if value > best_value:
+                    best, best_value = bit, value
+                    if value == 1:
+                        break
+        return divmod(best.bit_length() - 1, 3)
+
+    def to_board(self, state: State) -> Board:
+        """Nested-list board, as used by tictactoe.py and runner.py."""
+        x, o = state
+        return [
+            [X if x >> (3 * i + j) & 1 else (O if o >> (3 * i + j) & 1 else EMPTY) for j in range(3)]
+            for i in range(3)
+        ]
+
+    def from_board(self, board: Board) -> State:
+        x = sum(1 << (3 * i + j) for i in range(3) for j in range(3) if board[i][j] == X)
+        o = sum(1 << (3 * i + j) for i in range(3) for j in range(3) if board[i][j] == O)
+        return x, o
+
+    def reset_cache(self) -> None:
+        """Clear the transposition table (useful when starting a new game)."""
+        self._memo.clear()
@@ -0,0 +1,21 @@
+from backend.algorithms.core.dijkstra.csr_dijkstra import dijkstra_csr
+from backend.algorithms.core.dijkstra.csr_graph import CSRGraph
+
+
+class Solution:
+    def networkDelayTime(self, times: list[list[int]], n: int, k: int) -> int:
+        """
+        Intuition:
+            Same single-source Dijkstra, but the graph is built once into flat arrays
+            (`CSRGraph`) and the distances live in a list indexed by node id.
+            Nodes are labeled `1..n`, so we allocate `n + 1` slots and leave slot 0 unused.
+
+        Time Complexity:
+            O(E log V)
+        """
+
+        graph = CSRGraph.from_edges(n + 1, times)
+        dist, _ = dijkstra_csr(graph, k)
+
+        # Return the maximum delay if reachable, else −1
+        return ans if (ans := max(dist[1:])) < float("inf") else -1
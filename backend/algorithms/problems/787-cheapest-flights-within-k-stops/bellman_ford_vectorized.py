@@ -0,0 +1,27 @@
+import importlib.util
+from pathlib import Path
+
+# Import the vectorized Bellman-Ford from core (its package name has a hyphen)
+_spec = importlib.util.spec_from_file_location(
+    'bellman_ford_vectorized',
+    Path(__file__).parent.parent.parent / 'core' / 'bellman-ford' / 'vectorized.py'
+)
+_vectorized_module = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(_vectorized_module)
+bellman_ford_vectorized = _vectorized_module.bellman_ford_vectorized
+
+
+def cheapest_flights_with_at_most_k_stops(
+    n: int, flights: list[list[int]], src: int, dst: int, k: int
+) -> int:
+    """
+    Intuition:
+        k stops means at most k + 1 flights, which is exactly k + 1 layered Bellman-Ford passes.
+        Each pass relaxes every flight at once in NumPy, instead of copying `d` and looping in Python.
+
+    Time Complexity:
+        O(kE)
+        where `k` is the number of stops and `E` is the number of flights.
+    """
+    d = bellman_ford_vectorized(n, flights, src, max_edges=k + 1)
+    return int(d[dst]) if d[dst] < float("inf") else -1
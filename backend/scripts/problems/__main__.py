@@ -0,0 +1,7 @@
+"""python3 -m scripts.problems <command> [args...] (see cli.py)."""
+
+import sys
+
+from .cli import main
+
+sys.exit(main())
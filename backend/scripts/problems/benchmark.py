@@ -0,0 +1,420 @@
+#!/usr/bin/env python3
+"""
+Scaling benchmark for the metadata generators on synthetic problem trees.
+
+The real tree only has ~150 problems, which hides anything worse than linear.
+This script synthesizes algorithms/ trees with N solution files (problem
+__init__.py files follow template/__init__.py, and solutions carry the docstring
+sections the generators parse: Intuition, Time/Space Complexity, Args, Returns,
+Variables and Expressions, plus inline comments and backend.algorithms.core
+imports). It then times each generator over the whole tree at every size:
+
+  uses               generate_uses.process_file over every file (+ module graph)
+  symbol_tags        generate_symbol_tags.build_symbol_tags
+  lsp_index          generate_lsp_index.build_document_symbols over every file
+  problems_metadata  extract_problems_metadata.process_directory (problems + core)
+  clean_code         code_cleaner.clean_code over every file's text (reads not timed)
+
+Every run appends one JSON record to --out (JSON lines, default
+.cache/benchmark/pipeline.jsonl):
+
+  {"started_at": "...", "python": "3.12.1", "per_problem": 3, "seed": 0, "jobs": 1,
+   "sizes": [1000, 5000],
+   "results": {"uses": [{"files": 1000, "seconds": 0.61, "us_per_file": 610.2}, ...], ...},
+   "exponents": {"uses": 1.02, ...}}
+
+The exponent is the log-log slope of time over file count between the two
+largest sizes (1.0 = linear, 2.0 = quadratic). --max-exponent makes the run exit
+with status 1 when a generator scales worse than that, so it can gate CI.
+
+Trees are generated deterministically from (size, --per-problem, --seed) and
+reused from --work-dir across runs.
+
+CLI:
+  python3 backend/scripts/problems/benchmark.py \
+    [--sizes 1000,5000,20000,50000] [--per-problem 3] [--seed 0] \
+    [--targets uses,symbol_tags,lsp_index,problems_metadata,clean_code] \
+    [--repeat 1] [--jobs 1] [--work-dir /tmp/problems-benchmark] \
+    [--out .cache/benchmark/pipeline.jsonl] [--max-exponent 1.3]
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import math
+import platform
+import random
+import shutil
+import sys
+import tempfile
+import time
+from collections.abc import Callable
+from datetime import UTC, datetime
+from functools import partial
+from pathlib import Path
+
+import profiling
+import source_model
+from code_cleaner import clean_code
+from extract_problems_metadata import process_directory
+from generate_lsp_index import build_document_symbols, iter_python_files
+from generate_symbol_tags import build_symbol_tags
+from generate_uses import process_file
+from parallel import parallel_map
+from source_model import scan_files
+
+DEFAULT_SIZES = (1000, 5000, 20000, 50000)
+DEFAULT_OUT = Path(".cache/benchmark/pipeline.jsonl")
+# Outside any dot-directory: the generators skip files under hidden paths
+DEFAULT_WORK_DIR = Path(tempfile.gettempdir()) / "problems-benchmark"
+
+# Bumped whenever the synthesized sources change, so stale trees are rebuilt
+TREE_FORMAT = 1
+CORE_MODULES = 12
+
+
+# ---------- Synthetic tree ----------
+
+_TOPICS = ["array", "hash-table", "dp", "graph", "bfs", "dfs", "heap", "binary-search",
+           "two-pointers", "sliding-window", "greedy", "prefix-sum", "tree", "backtrack"]
+_DIFFICULTIES = ["easy", "medium", "hard"]
+_WORDS = ["array", "window", "prefix", "state", "frontier", "interval", "pointer", "heap",
+          "graph", "node", "edge", "subarray", "target", "index", "count", "memo", "table"]
+
+
+def _sentence(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(_WORDS) for _ in range(words)).capitalize() + "."
+
+
+def problem_init_source(rng: random.Random, number: int, slug: str) -> str:
+    """Problem __init__.py in the template/__init__.py format."""
+    title = slug.split("-", 1)[1].replace("-", " ").title()
+    topics = ", ".join(rng.sample(_TOPICS, rng.randint(1, 3)))
+    return f'''"""
+Title: {title}
+Definition: {_sentence(rng, rng.randint(10, 30))}
+Leetcode: https://leetcode.com/problems/{slug.split("-", 1)[1]}
+Difficulty: {rng.choice(_DIFFICULTIES)}
+Topics: [{topics}]
+"""
+'''
+
+
+def core_module_source(index: int) -> str:
+    """A core algorithm module whose helpers the synthetic solutions import."""
+    return f'''"""Shared helpers for synthetic problems ({index})."""
+
+import heapq
+
+
+class Graph{index}:
+    """Adjacency-list graph."""
+
+    def __init__(self, n: int):
+        self.adj = [[] for _ in range(n)]
+
+    def add_edge(self, u: int, v: int, w: int = 1) -> None:
+        self.adj[u].append((v, w))  # directed edge u -> v
+
+    def neighbors(self, u: int) -> list[tuple[int, int]]:
+        return self.adj[u]
+
+
+def helper_{index}(nums: list[int], k: int) -> int:
+    """
+    Time Complexity:
+        O(n log k)
+    """
+    heap: list[int] = []
+    for num in nums:
+        heapq.heappush(heap, num)  # keep the k largest
+        if len(heap) > k:
+            heapq.heappop(heap)
+    return heap[0] if heap else 0
+'''
+
+
+def _function_source(rng: random.Random, name: str, core: int, loops: int) -> str:
+    """One documented solution function; loops controls its length."""
+    variables = "\n".join(
+        f"        {var}: {_sentence(rng, rng.randint(4, 10))}" for var in ("left", "best", "seen")
+    )
+    body = []
+    for i in range(loops):
+        body.append(f"    for i{i} in range(len(nums)):  # pass {i} over the input")
+        body.append(f"        left = (left + nums[i{i}] * {i + 1}) % (k + 1)")
+        body.append("        if left in seen:")
+        body.append(f"            best = max(best, i{i} - seen[left])")
+        body.append(f"        seen.setdefault(left, i{i})")
+        if rng.random() < 0.3:
+            body.append(f"        # {_sentence(rng, rng.randint(4, 9))}")
+            body.append(f"        stack.append([x * {i} for x in nums[:i{i}] if x > left])")
+    body_text = "\n".join(body)
+    return f'''def {name}(nums: list[int], k: int) -> int:
+    """
+    Intuition:
+        {_sentence(rng, rng.randint(12, 24))}
+        {_sentence(rng, rng.randint(8, 20))}
+
+    Time Complexity:
+        O(n log n)
+        where n is the length of nums.
+
+    Space Complexity:
+        O(n)
+
+    Args:
+        nums: {_sentence(rng, 5)}
+        k: {_sentence(rng, 4)}
+
+    Returns:
+        int: {_sentence(rng, 6)}
+
+    Variables:
+{variables}
+
+    Expressions:
+        'best = max(best, i0 - seen[left])': {_sentence(rng, rng.randint(6, 14))}
+    """
+    left = best = 0
+    seen: dict[int, int] = {{}}
+    stack: list[list[int]] = []
+    graph = Graph{core}(len(nums) + 1)
+    for u, v in enumerate(nums):
+        graph.add_edge(u, v % (len(nums) + 1))
+{body_text}
+
+    def score(limit: int) -> int:
+        return helper_{core}(nums, limit) + len(stack)
+
+    return max(best, score(k))
+'''
+
+
+def solution_source(rng: random.Random, problem: str, variant: int) -> str:
+    """A solution file: core imports, a main function, sometimes a class wrapper."""
+    core = rng.randrange(CORE_MODULES)
+    name = f"{problem.split('-', 1)[1].replace('-', '_')}_{variant}"
+    parts = [
+        "from collections import defaultdict\n",
+        f"from backend.algorithms.core.synthetic_{core}.algorithm import Graph{core}, helper_{core}\n\n\n",
+        _function_source(rng, name, core, rng.randint(2, 12)),
+    ]
+    if rng.random() < 0.4:
+        parts.append(f'''
+
+class Solution:
+    """{_sentence(rng, 8)}"""
+
+    def solve(self, nums: list[int], k: int) -> int:
+        counts = defaultdict(int)  # value -> occurrences
+        for num in nums:
+            counts[num] += 1
+        return {name}(nums, k) + len(counts)
+''')
+    return "".join(parts)
+
+
+def generate_tree(base: Path, files: int, per_problem: int, seed: int) -> Path:
+    """Synthesize (or reuse) an algorithms/ tree with `files` solution files; return its root."""
+    root = base / f"{files}-{per_problem}-{seed}" / "algorithms"
+    stamp = root.parent / "tree.json"
+    spec = {"format": TREE_FORMAT, "files": files, "per_problem": per_problem, "seed": seed}
+    if stamp.exists() and json.loads(stamp.read_text(encoding="utf-8")) == spec:
+        return root
+
+    if root.parent.exists():
+        shutil.rmtree(root.parent)
+    rng = random.Random(seed)
+    (root / "problems").mkdir(parents=True)
+    (root / "__init__.py").write_text("", encoding="utf-8")
+    for i in range(CORE_MODULES):
+        core_dir = root / "core" / f"synthetic_{i}"
+        core_dir.mkdir(parents=True)
+        (core_dir / "__init__.py").write_text("", encoding="utf-8")
+        (core_dir / "algorithm.py").write_text(core_module_source(i), encoding="utf-8")
+
+    for number in range(1, math.ceil(files / per_problem) + 1):
+        slug = f"{number}-synthetic-problem-{number}"
+        problem_dir = root / "problems" / slug
+        problem_dir.mkdir()
+        (problem_dir / "__init__.py").write_text(problem_init_source(rng, number, slug), encoding="utf-8")
+        for variant in range(min(per_problem, files - (number - 1) * per_problem)):
+            name = "solution.py" if variant == 0 else f"variant-{variant}.py"
+            (problem_dir / name).write_text(solution_source(rng, slug, variant), encoding="utf-8")
+
+    stamp.write_text(json.dumps(spec) + "\n", encoding="utf-8")
+    return root
+
+
+# ---------- Targets ----------
+
+def _uses(root: Path, jobs: int) -> Callable[[], object]:
+    def run():
+        source_model.module_graph.cache_clear()
+        return parallel_map(partial(process_file, root), scan_files(root), jobs)
+    return run
+
+
+def _symbol_tags(root: Path, jobs: int) -> Callable[[], object]:
+    return partial(build_symbol_tags, root, jobs=jobs)
+
+
+def _lsp_index(root: Path, jobs: int) -> Callable[[], object]:
+    return lambda: [build_document_symbols(f, root) for f in iter_python_files(root)]
+
+
+def _problems_metadata(root: Path, jobs: int) -> Callable[[], object]:
+    def run():
+        return (process_directory(root / "problems", "problems", jobs=jobs),
+                process_directory(root / "core", "core", jobs=jobs))
+    return run
+
+
+def _clean_code(root: Path, jobs: int) -> Callable[[], object]:
+    texts = [p.read_text(encoding="utf-8") for p in scan_files(root)]
+    return lambda: [clean_code(text) for text in texts]
+
+
+# Target name -> setup(root, jobs) returning the callable that is timed
+TARGETS: dict[str, Callable[[Path, int], Callable[[], object]]] = {
+    "uses": _uses,
+    "symbol_tags": _symbol_tags,
+    "lsp_index": _lsp_index,
+    "problems_metadata": _problems_metadata,
+    "clean_code": _clean_code,
+}
+
+
+def time_target(target: str, root: Path, jobs: int, repeat: int) -> float:
+    """Best-of-repeat wall time of one target over the whole tree (generator output discarded)."""
+    run = TARGETS[target](root, jobs)
+    best = math.inf
+    for _ in range(repeat):
+        # The generators report per-problem progress on stdout
+        with contextlib.redirect_stdout(io.StringIO()):
+            started = time.perf_counter()
+            run()
+            best = min(best, time.perf_counter() - started)
+    return best
+
+
+def scaling_exponent(points: list[dict]) -> float | None:
+    """Log-log slope of seconds over files between the two largest sizes."""
+    if len(points) < 2:
+        return None
+    small, large = points[-2], points[-1]
+    if small["seconds"] <= 0 or large["files"] == small["files"]:
+        return None
+    return round(math.log(large["seconds"] / small["seconds"]) / math.log(large["files"] / small["files"]), 3)
+
+
+def _previous_record(out: Path, sizes: list[int]) -> dict | None:
+    """Latest earlier record for the same sizes, to show per-file changes against."""
+    if not out.exists():
+        return None
+    previous = None
+    for line in out.read_text(encoding="utf-8").splitlines():
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError:
+            continue
+        if record.get("sizes") == sizes:
+            previous = record
+    return previous
+
+
+def _parse_sizes(value: str) -> list[int]:
+    try:
+        sizes = sorted({int(part) for part in value.split(",") if part.strip()})
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected comma-separated file counts, got {value!r}") from None
+    if not sizes or sizes[0] < 1:
+        raise argparse.ArgumentTypeError("sizes must be positive")
+    return sizes
+
+
+def _parse_targets(value: str) -> list[str]:
+    targets = [part.strip() for part in value.split(",") if part.strip()]
+    unknown = [t for t in targets if t not in TARGETS]
+    if unknown:
+        raise argparse.ArgumentTypeError(f"unknown target(s) {', '.join(unknown)}; choose from {', '.join(TARGETS)}")
+    return targets
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Time the metadata generators on synthetic problem trees of increasing size.")
+    ap.add_argument("--sizes", type=_parse_sizes, default=list(DEFAULT_SIZES),
+                    help=f"Comma-separated solution file counts (default: {','.join(map(str, DEFAULT_SIZES))})")
+    ap.add_argument("--per-problem", type=int, default=3, help="Solution files per synthetic problem (default: 3)")
+    ap.add_argument("--seed", type=int, default=0, help="Seed for the synthesized sources (default: 0)")
+    ap.add_argument("--targets", type=_parse_targets, default=list(TARGETS),
+                    help=f"Comma-separated generators to time (default: {','.join(TARGETS)})")
+    ap.add_argument("--repeat", type=int, default=1, help="Runs per target and size; the fastest is kept (default: 1)")
+    ap.add_argument("--jobs", "-j", type=int, default=1,
+                    help="Worker processes for the generators that support them (0 = one per CPU)")
+    ap.add_argument("--work-dir", type=Path, default=DEFAULT_WORK_DIR,
+                    help=f"Where synthetic trees are generated and reused (default: {DEFAULT_WORK_DIR})")
+    ap.add_argument("--out", type=Path, default=DEFAULT_OUT, help=f"Append results as a JSON line here (default: {DEFAULT_OUT})")
+    ap.add_argument("--max-exponent", type=float,
+                    help="Exit with status 1 if a target's scaling exponent exceeds this (e.g. 1.3)")
+    args = ap.parse_args()
+
+    work_dir = args.work_dir.resolve()
+    if any(part.startswith(".") for part in work_dir.parts):
+        ap.error(f"--work-dir must not be inside a hidden directory (the generators skip those): {work_dir}")
+
+    results: dict[str, list[dict]] = {target: [] for target in args.targets}
+    for files in args.sizes:
+        started = time.perf_counter()
+        root = generate_tree(work_dir, files, args.per_problem, args.seed)
+        print(f"📁 {files} solution files • {root} ({time.perf_counter() - started:.1f}s to prepare)")
+        for target in args.targets:
+            seconds = time_target(target, root, args.jobs, args.repeat)
+            results[target].append({
+                "files": files,
+                "seconds": round(seconds, 4),
+                "us_per_file": round(seconds / files * 1e6, 1),
+            })
+            print(f"   {target:<18} {seconds:>9.3f}s {seconds / files * 1e6:>9.1f} µs/file")
+
+    record = {
+        "started_at": datetime.now(UTC).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "per_problem": args.per_problem,
+        "seed": args.seed,
+        "jobs": args.jobs,
+        "sizes": args.sizes,
+        "peak_rss_mb": profiling.peak_rss_mb(),
+        "results": results,
+        "exponents": {target: scaling_exponent(points) for target, points in results.items()},
+    }
+
+    previous = _previous_record(args.out, args.sizes)
+    print("\n   target             exponent   µs/file (largest)" + ("   vs previous" if previous else ""))
+    failed = []
+    for target, points in results.items():
+        exponent = record["exponents"][target]
+        line = f"   {target:<18} {exponent if exponent is not None else '-':>8} {points[-1]['us_per_file']:>17.1f}"
+        before = previous and previous.get("results", {}).get(target)
+        if before and before[-1]["us_per_file"]:
+            line += f"   {(points[-1]['us_per_file'] / before[-1]['us_per_file'] - 1) * 100:+10.1f}%"
+        if args.max_exponent is not None and exponent is not None and exponent > args.max_exponent:
+            failed.append(target)
+            line += "   ⚠️  superlinear"
+        print(line)
+
+    args.out.parent.mkdir(parents=True, exist_ok=True)
+    with open(args.out, "a", encoding="utf-8") as fp:
+        fp.write(json.dumps(record) + "\n")
+    print(f"\nResults appended to {args.out}")
+
+    if failed:
+        print(f"❌ Scaling exponent above {args.max_exponent}: {', '.join(failed)}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Content-hash incremental build cache for the extracted-metadata generators.
+
+Each source file's per-generator output is stored on disk keyed by the file's
+content hash and by the generator's version. A generator's version is the hash
+of its own source plus the shared modules it depends on, so editing a generator
+invalidates exactly that generator's entries. On a rebuild only files whose
+content changed are re-analyzed; everything else is spliced back in from the
+cache.
+
+Cache layout (JSON):
+{
+  "format": 1,
+  "files": {
+    "/abs/path/to/solution.py": {
+      "sha": "<sha256 of file text>",
+      "outputs": {"<generator>": ["<version>", <output>], ...}
+    }
+  }
+}
+"""
+
+import hashlib
+import json
+from collections.abc import Callable
+from pathlib import Path
+from types import ModuleType
+from typing import Any
+
+import profiling
+from source_model import SourceFile
+
+CACHE_FORMAT = 1
+DEFAULT_CACHE_PATH = Path(".cache/extracted-metadata.json")
+
+
+def content_hash(text: str) -> str:
+    """sha256 of a file's text."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def generator_version(*modules: ModuleType, salt: str = "") -> str:
+    """Version string derived from the source of the given modules (plus an optional salt)."""
+    digest = hashlib.sha256(salt.encode("utf-8"))
+    for module in modules:
+        digest.update(Path(module.__file__).read_bytes())
+    return digest.hexdigest()[:16]
+
+
+class BuildCache:
+    """Per-file, per-generator output cache persisted as a single JSON file."""
+
+    def __init__(self, path: Path | None, versions: dict[str, str]):
+        self.path = path
+        self.versions = versions
+        self.hits = 0
+        self.misses = 0
+        self._files: dict[str, dict[str, Any]] = {}
+        self._dirty = False
+
+        if path and path.exists():
+            try:
+                data = json.loads(path.read_text(encoding="utf-8"))
+                if data.get("format") == CACHE_FORMAT:
+                    self._files = data.get("files", {})
+            except (OSError, json.JSONDecodeError):
+                # A corrupt cache is just a cold cache
+                self._files = {}
+
+    def get(
+        self,
+        src: SourceFile,
+        generator: str,
+        compute: Callable[[], Any],
+        salt: str = "",
+        valid: Callable[[Any], bool] | None = None,
+    ) -> Any:
+        """Return the cached output for (src, generator), computing and storing it on a miss.
+
+        salt covers inputs beyond the file itself that are known up front (e.g. the
+        set of workspace modules); valid(output) checks inputs only the output
+        itself records (e.g. the imported modules it was computed against).
+        """
+        key = str(src.path)
+        sha = content_hash(src.text)
+        version = f"{self.versions[generator]}|{salt}" if salt else self.versions[generator]
+
+        entry = self._files.get(key)
+        if entry is None or entry["sha"] != sha:
+            entry = self._files[key] = {"sha": sha, "outputs": {}}
+            self._dirty = True
+
+        cached = entry["outputs"].get(generator)
+        if cached is not None and cached[0] == version and (valid is None or valid(cached[1])):
+            self.hits += 1
+            return cached[1]
+
+        self.misses += 1
+        with profiling.stage(generator):
+            output = compute()
+        entry["outputs"][generator] = [version, output]
+        self._dirty = True
+        return output
+
+    def prune(self, keep: set[str]) -> None:
+        """Drop entries for files that no longer exist (keys are absolute paths)."""
+        stale = [key for key in self._files if key not in keep]
+        for key in stale:
+            del self._files[key]
+        if stale:
+            self._dirty = True
+
+    def save(self) -> None:
+        """Write the cache back to disk if anything changed."""
+        if not self.path or not self._dirty:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        tmp.write_text(
+            json.dumps({"format": CACHE_FORMAT, "files": self._files}, ensure_ascii=False, separators=(",", ":")),
+            encoding="utf-8",
+        )
+        tmp.replace(self.path)
@@ -0,0 +1,89 @@
+"""
+Single entry point for the problem scripts.
+
+Usage (from the repo root, as the package.json problems:* scripts run it):
+    PYTHONPATH=backend python3 -m scripts.problems <command> [args...]
+    PYTHONPATH=backend python3 -m scripts.problems --help
+
+Each command is one of the scripts in this directory; its module is imported
+only when that command runs, and this dispatcher imports nothing but os and sys.
+So `list` and `create` start about as fast as a bare interpreter, while `sync-db`
+alone pays for psycopg2 and dotenv. The scripts keep working standalone too.
+
+`startup` (startup.py) measures every command's import cost and fails when an
+interactive command exceeds its budget or imports a heavy module.
+"""
+
+import os
+import sys
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+PROG = "python3 -m scripts.problems"
+
+# command -> (script in this directory, summary)
+COMMANDS: dict[str, tuple[str, str]] = {
+    "list": ("list_problems.py", "List existing problem numbers (or check the given ones)"),
+    "create": ("create_problem.py", "Create a new problem folder interactively"),
+    "all": ("generate_all_metadata.py", "Generate every lib/extracted-metadata output in one pass"),
+    "lsp-index": ("generate_lsp_index.py", "Generate lsp_index.json"),
+    "symbol-tags": ("generate_symbol_tags.py", "Generate symbol_tags.json"),
+    "uses": ("generate_uses.py", "Generate uses.json"),
+    "filter-uses": ("filter_uses.py", "Write filtered_uses.json from uses.json and symbol_tags.json"),
+    "expressions": ("generate_expressions.py", "Generate expressions.json"),
+    "comments-inline": ("generate_comments_inline.py", "Generate comments-inline.json"),
+    "metadata": ("extract_problems_metadata.py", "Generate problems_metadata.json"),
+    "transform-fields": ("transform-field-to-lists.py", "Turn symbol_tags.json text fields into nested lists"),
+    "sync-db": ("sync_problems_to_db.py", "Sync problems and solutions to PostgreSQL"),
+    "benchmark": ("benchmark.py", "Time the generators on synthetic problem trees"),
+    "race": ("race_variants.py", "Race each problem's solution variants on size-scaled inputs"),
+    "complexity": ("complexity.py", "Fit measured running time and check it against Time Complexity docs"),
+    "startup": ("startup.py", "Check the commands' import time against the startup budget"),
+}
+
+
+def load(command: str):
+    """Import a command's script (once) and return the module."""
+    script = COMMANDS[command][0]
+    # The scripts import their siblings by bare name
+    if HERE not in sys.path:
+        sys.path.insert(0, HERE)
+    name = script.removesuffix(".py")
+    if "-" not in name:
+        return __import__(name)
+
+    # Hyphenated script names are not importable by name
+    import importlib.util
+    name = name.replace("-", "_")
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.spec_from_file_location(name, os.path.join(HERE, script))
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def print_usage(out=sys.stdout) -> None:
+    print(f"usage: {PROG} <command> [args...]\n\ncommands:", file=out)
+    width = max(map(len, COMMANDS))
+    for command, (_, summary) in COMMANDS.items():
+        print(f"  {command:<{width}}  {summary}", file=out)
+    print(f"\nRun '{PROG} <command> --help' for a command's options.", file=out)
+
+
+def main(argv: list[str] | None = None) -> int:
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv or argv[0] in ("-h", "--help"):
+        print_usage()
+        return 0 if argv else 2
+    command, args = argv[0], argv[1:]
+    if command not in COMMANDS:
+        print(f"{PROG}: unknown command '{command}'\n", file=sys.stderr)
+        print_usage(sys.stderr)
+        return 2
+
+    module = load(command)
+    # Scripts parse sys.argv themselves; argparse shows argv[0] as the program name
+    sys.argv = [f"{PROG} {command}", *args]
+    result = module.main()
+    return result if isinstance(result, int) else 0
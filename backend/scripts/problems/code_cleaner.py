@@ -7,6 +7,79 @@ docstrings and comments, ensuring that both metadata extraction and usage
 analysis work on identical code snippets.
 """
 
+import ast
+import io
+import tokenize
+
+
+def find_comments(code_text: str) -> dict[int, tuple[int, str]] | None:
+    """Map each line (0-based) that has a comment to (column of the '#', comment text).
+
+    Uses tokenize, so '#' inside any string (including triple-quoted and
+    f-strings) is never mistaken for a comment. The text is the COMMENT token,
+    '#' included. Returns None if the code cannot be tokenized.
+    """
+    comments = {}
+    if '#' not in code_text:
+        return comments
+    try:
+        for token in tokenize.generate_tokens(io.StringIO(code_text).readline):
+            if token.type == tokenize.COMMENT:
+                comments[token.start[0] - 1] = (token.start[1], token.string)
+    except (tokenize.TokenError, SyntaxError):
+        return None
+    return comments
+
+
+def _comment_at(comments: dict[int, tuple[int, str]] | None, i: int, line: str) -> tuple[int, str] | None:
+    """(column, text) of the comment on line i, scanning the line itself if tokenize failed."""
+    if comments is not None:
+        return comments.get(i)
+    column = _scan_comment_column(line)
+    return None if column is None else (column, line[column:])
+
+
+def _comment_body(text: str) -> str:
+    """'#  note ' -> 'note'."""
+    return text[1:].strip()
+
+
+def _scan_comment_column(line: str) -> int | None:
+    """Column of the first '#' outside quotes on a single line (fallback when tokenize fails)."""
+    if '#' not in line:
+        return None
+    in_string = False
+    quote_char = None
+    for j, char in enumerate(line):
+        if char in ['"', "'"] and (j == 0 or line[j-1] != '\\'):
+            if not in_string:
+                in_string = True
+                quote_char = char
+            elif char == quote_char:
+                in_string = False
+                quote_char = None
+        elif char == '#' and not in_string:
+            return j
+    return None
+
+
+def _strip_comment(
+    line: str,
+    column: int | None,
+    remove_end_of_line: bool,
+    remove_full_line: bool
+) -> str | None:
+    """Apply the comment settings to one line; None means drop the line."""
+    if column is None:
+        return line
+
+    # Full-line comment
+    if not line[:column].strip():
+        return None if remove_full_line else line
+
+    # End-of-line comment
+    return line[:column].rstrip() if remove_end_of_line else line
+
 
 def remove_comments_from_lines(
     lines: list[str],
@@ -23,42 +96,50 @@ def remove_comments_from_lines(
     Returns:
         List of lines with comments removed based on settings
     """
+    comments = find_comments('\n'.join(lines))
     clean_lines = []
 
-    for line in lines:
-        stripped = line.strip()
+    for i, line in enumerate(lines):
+        comment = _comment_at(comments, i, line)
+        column = comment[0] if comment else None
+        cleaned_line = _strip_comment(line, column, remove_end_of_line, remove_full_line)
+        if cleaned_line is not None:
+            clean_lines.append(cleaned_line)
 
-        # Check if this is a full-line comment
-        if stripped.startswith('#'):
-            if remove_full_line:
-                # Skip this line entirely
-                continue
-            else:
-                # Keep the full-line comment
-                clean_lines.append(line)
-                continue
+    return clean_lines
 
-        # Handle end-of-line comments
-        cleaned_line = line
-        if remove_end_of_line and '#' in line:
-            # Find # not in quotes
-            in_string = False
-            quote_char = None
-            for j, char in enumerate(line):
-                if char in ['"', "'"] and (j == 0 or line[j-1] != '\\'):
-                    if not in_string:
-                        in_string = True
-                        quote_char = char
-                    elif char == quote_char:
-                        in_string = False
-                        quote_char = None
-                elif char == '#' and not in_string:
-                    cleaned_line = line[:j].rstrip()
-                    break
-
-        clean_lines.append(cleaned_line)
 
-    return clean_lines
+def docstring_line_mask(tree: ast.AST, line_count: int) -> bytearray:
+    """One byte per line, set for lines covered by a function/class docstring.
+
+    Module docstrings are kept (imports live at module level).
+    """
+    mask = bytearray(line_count)
+    for node in ast.walk(tree):
+        if isinstance(node, (ast.FunctionDef, ast.ClassDef)):
+            if (node.body and
+                isinstance(node.body[0], ast.Expr) and
+                isinstance(node.body[0].value, ast.Constant) and
+                isinstance(node.body[0].value.value, str)):
+
+                docstring_node = node.body[0]
+                start = docstring_node.lineno - 1  # Convert to 0-based
+                end = (docstring_node.end_lineno or docstring_node.lineno) - 1
+                mask[start:end + 1] = b'\x01' * (end + 1 - start)
+    return mask
+
+
+def extract_inline_comments(code_text: str) -> dict[int, str]:
+    """Map each line (0-based) that has a non-empty comment to the comment text (without '#')."""
+    comments = find_comments(code_text)
+    found = {}
+    for i, line in enumerate(code_text.split('\n')):
+        if '#' not in line:
+            continue
+        comment = _comment_at(comments, i, line)
+        if comment and (body := _comment_body(comment[1])):
+            found[i] = body
+    return found
 
 
 def clean_code(
@@ -71,6 +152,9 @@ def clean_code(
     This function ensures consistent code cleaning across all scripts.
     Used by both extract_problems_metadata.py and generate_uses.py.
 
+    Docstring lines come from a line mask built in one AST walk and comment
+    positions from one tokenize pass, so the cost is linear in the file size.
+
     Args:
         code_text: Raw Python code text
         remove_inline_end_of_line_comments: Whether to remove end-of-line comments (default: True)
@@ -79,82 +163,78 @@ def clean_code(
     Returns:
         Cleaned code with docstrings and optionally comments removed
     """
-    import ast
+    return clean_code_with_comments(
+        code_text, remove_inline_end_of_line_comments, remove_inline_full_line_comments
+    )[0]
+
+
+def clean_code_with_comments(
+    code_text: str,
+    remove_inline_end_of_line_comments = True,
+    remove_inline_full_line_comments = True
+) -> tuple[str, dict[int, str]]:
+    """clean_code() plus the comments it kept, from the same tokenize pass.
 
+    Returns:
+        Tuple of (cleaned_code, comments) where comments maps a 0-based line of
+        cleaned_code to its comment text (without '#'); empty comments are skipped
+    """
     try:
         # Parse the AST to identify docstrings properly
         tree = ast.parse(code_text)
-
-        # Collect all docstring ranges
-        docstring_ranges = []
-
-        def collect_docstrings(node):
-            # Check if this node has a docstring (but NOT for Module level)
-            # We want to keep imports at module level, only remove function/class docstrings
-            if isinstance(node, (ast.FunctionDef, ast.ClassDef)):  # Removed ast.Module
-                if (hasattr(node, 'body') and node.body and
-                    isinstance(node.body[0], ast.Expr) and
-                    isinstance(node.body[0].value, ast.Constant) and
-                    isinstance(node.body[0].value.value, str)):
-
-                    docstring_node = node.body[0]
-                    docstring_ranges.append((
-                        docstring_node.lineno - 1,  # Convert to 0-based
-                        docstring_node.end_lineno - 1 if docstring_node.end_lineno else docstring_node.lineno - 1
-                    ))
-
-            # Recursively check child nodes
-            for child in ast.iter_child_nodes(node):
-                collect_docstrings(child)
-
-        collect_docstrings(tree)
-
-        # STEP 1: Remove docstrings FIRST (before comment removal)
-        lines = code_text.split('\n')
-        lines_without_docstrings = []
-
-        for i, line in enumerate(lines):
-            is_docstring_line = any(start <= i <= end for start, end in docstring_ranges)
-            if not is_docstring_line:
-                lines_without_docstrings.append(line)
-
-        # STEP 2: NOW remove comments from the docstring-free lines
-        if remove_inline_end_of_line_comments or remove_inline_full_line_comments:
-            lines_without_docstrings = remove_comments_from_lines(
-                lines_without_docstrings,
-                remove_end_of_line=remove_inline_end_of_line_comments,
-                remove_full_line=remove_inline_full_line_comments
-            )
-
-        # STEP 3: Normalize consecutive newlines (3+ newlines -> 2 newlines = 1 blank line)
-        clean_lines = []
-        consecutive_empty = 0
-
-        for line in lines_without_docstrings:
-            if line.strip():
-                clean_lines.append(line)
-                consecutive_empty = 0
-            else:
-                consecutive_empty += 1
-                # Only keep maximum 1 blank line (2 consecutive empty lines)
-                if consecutive_empty <= 1:
-                    clean_lines.append('')
-
-        # Remove leading and trailing empty lines
-        while clean_lines and not clean_lines[0].strip():
-            clean_lines.pop(0)
-        while clean_lines and not clean_lines[-1].strip():
-            clean_lines.pop()
-
-        return '\n'.join(clean_lines)
-        
     except SyntaxError:
         # If parsing fails, fall back to simple line-by-line cleaning
-        return _simple_clean_code(
+        cleaned = _simple_clean_code(
             code_text,
             remove_inline_end_of_line_comments=remove_inline_end_of_line_comments,
             remove_inline_full_line_comments=remove_inline_full_line_comments
         )
+        return cleaned, extract_inline_comments(cleaned)
+
+    lines = code_text.split('\n')
+    is_docstring_line = docstring_line_mask(tree, len(lines))
+    comments = find_comments(code_text)
+
+    clean_lines = []
+    kept_comments = {}  # index in clean_lines -> comment text
+    consecutive_empty = 0
+
+    for i, line in enumerate(lines):
+        # STEP 1: Drop docstring lines
+        if is_docstring_line[i]:
+            continue
+
+        # STEP 2: Remove comments
+        comment = _comment_at(comments, i, line) if '#' in line else None
+        if comment:
+            stripped = _strip_comment(
+                line, comment[0], remove_inline_end_of_line_comments, remove_inline_full_line_comments
+            )
+            if stripped is None:
+                continue
+            if stripped == line and (body := _comment_body(comment[1])):
+                kept_comments[len(clean_lines)] = body
+            line = stripped
+
+        # STEP 3: Normalize consecutive newlines (3+ newlines -> 2 newlines = 1 blank line)
+        if line.strip():
+            clean_lines.append(line)
+            consecutive_empty = 0
+        else:
+            consecutive_empty += 1
+            # Only keep maximum 1 blank line (2 consecutive empty lines)
+            if consecutive_empty <= 1:
+                clean_lines.append('')
+
+    # Remove leading and trailing empty lines
+    start = 0
+    while start < len(clean_lines) and not clean_lines[start].strip():
+        start += 1
+    end = len(clean_lines)
+    while end > start and not clean_lines[end - 1].strip():
+        end -= 1
+
+    return '\n'.join(clean_lines[start:end]), {i - start: text for i, text in kept_comments.items()}
 
 
 def _simple_clean_code(
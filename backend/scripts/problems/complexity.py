@@ -0,0 +1,365 @@
+#!/usr/bin/env python3
+"""
+Empirical time complexity of every solution, checked against its docstring.
+
+Each solution's entry point (found and fed as in race_variants.py) runs at
+geometrically growing input sizes until the next call would exceed --budget seconds. The
+measured times are fitted to the growth classes in GROWTH_CLASSES (a + b*f(n),
+least squares on relative error) and to a power law (the log-log slope over the
+larger half of the sizes).
+
+The bound documented under "Time Complexity:" (parsed with
+docstring_parser.parse_sections) is reduced to a polynomial degree: O(n log k)
+-> 1, O(R * C) -> 2, O(n^2) -> 2, O(2^n) -> unbounded. A solution is flagged
+when its slope exceeds the bound's own slope over the same sizes (the degree
+plus what its log factors add there, ~0.2 per log between n = 64 and 512) by
+more than --slack, e.g. a documented O(n) loop that measures ~n^2.
+Over-counting a documented bound (O(R*C) on a grid of n cells) can only hide a
+flag, never raise a false one. Under-counting can: the vertices and edges of a
+graph need not grow like n (1584's complete graph on n points has ~n^2/2
+edges), so a bound in V and E is reduced with the exponents at which
+GRAPH_SIZES' counts grow with n in the generated inputs, and left "not fitted"
+for problems without an entry there. Times below
+MIN_SECONDS at the largest size are too noisy for a verdict.
+
+With --write the fitted curves go to lib/extracted-metadata/complexity.json
+(keyed like uses.json by the path under backend/algorithms) for display:
+
+  "problems/198-house-robber/top-down-suffix.py": {
+    "entry": "rob", "documented": "O(n)", "documented_degree": 1,
+    "documented_slope": 1, "fitted": "n", "slope": 1.01, "flagged": false,
+    "points": [[8, 3.1e-06], [16, 5.6e-06], ...]}
+
+CLI:
+  python3 -m scripts.problems complexity [198 347-top-k-frequent-elements ...] \
+    [--max-n 65536] [--budget 0.5] [--repeat 3] [--slack 0.5] [--seed 0] \
+    [--write [PATH]] [--strict]
+"""
+
+import argparse
+import json
+import math
+import re
+import sys
+from collections.abc import Callable
+from pathlib import Path
+
+from docstring_parser import parse_sections
+from json_writer import dump_compact_arrays, write_json
+from race_variants import (
+    ALGORITHMS_DIR,
+    entry_function,
+    input_rng,
+    load_problem,
+    make_inputs,
+    problem_dirs,
+    reference_parameters,
+    run_variant,
+)
+
+DEFAULT_OUT = ALGORITHMS_DIR.parent.parent / "lib" / "extracted-metadata" / "complexity.json"
+MIN_N = 8
+MIN_SECONDS = 1e-3
+
+# (name, polynomial degree, f(n)); ties in fit quality go to the earlier (slower-growing) class
+GROWTH_CLASSES: list[tuple[str, float, Callable[[float], float]]] = [
+    ("1", 0, lambda _n: 1.0),
+    ("log n", 0, math.log2),
+    ("n", 1, lambda n: n),
+    ("n log n", 1, lambda n: n * math.log2(n)),
+    ("n^2", 2, lambda n: n * n),
+    ("n^2 log n", 2, lambda n: n * n * math.log2(n)),
+    ("n^3", 3, lambda n: n ** 3),
+    ("2^n", math.inf, lambda n: 2.0 ** min(n, 1000)),
+]
+
+# Inputs whose size does not grow linearly with n (see race_variants.INPUTS)
+NONLINEAR_INPUTS = {"22-generate-parentheses"}
+
+# Identifiers that name a small, fixed parameter rather than the input size
+_CONSTANT_NAMES = {"k"}
+# Identifiers for graph sizes, which only GRAPH_SIZES relates to n
+GRAPH_VARIABLES = {"v", "e"}
+
+# Vertex and edge counts (by their lowercase names in the bounds) of a problem's generated inputs
+GRAPH_SIZES: dict[str, Callable[[dict], dict[str, int]]] = {
+    "684-redundant-connection": lambda inputs: {"v": len(inputs["edges"]), "e": len(inputs["edges"])},
+    "743-network-delay-time": lambda inputs: {"v": inputs["n"], "e": len(inputs["times"])},
+    "787-cheapest-flights-within-k-stops": lambda inputs: {"v": inputs["n"], "e": len(inputs["flights"])},
+    "1514-path-with-maximum-probability": lambda inputs: {"v": inputs["n"], "e": len(inputs["edges"])},
+    # Every pair of points is an edge
+    "1584-min-cost-to-connect-all-points": lambda inputs: {
+        "v": len(inputs["points"]), "e": len(inputs["points"]) * (len(inputs["points"]) - 1) // 2,
+    },
+}
+_BIG_O = re.compile(r"(?:\\mathcal\{O\}|\\Theta|\\Omega|\\O|Θ|Ω|O)\s*\(")
+_SQRT = re.compile(r"\\?sqrt\s*(?:\{[^{}]*\}|\([^()]*\))")
+_SUPERSCRIPTS = "⁰¹²³⁴⁵⁶⁷⁸⁹"
+# A logarithm and its argument: "log n", "\log(V)", "log_2 n"
+_LOG = re.compile(r"\\?log(?:_?\{?\d+\}?)?\s*(?:\(([^()]*)\)|([a-z]\w*))?")
+
+
+# ---------- Documented bound ----------
+
+def documented_bound(text: str) -> str | None:
+    """First O(...) / Θ(...) expression in a Time Complexity section, e.g. 'n log k'."""
+    match = _BIG_O.search(text or "")
+    if not match:
+        return None
+    depth, start = 1, match.end()
+    for i in range(start, len(text)):
+        depth += {"(": 1, ")": -1}.get(text[i], 0)
+        if depth == 0:
+            return text[start:i].strip()
+    return None
+
+
+def _factors(term: str) -> list[tuple[str, int]]:
+    """(identifier, power) for each size factor of a product term, logarithms and roots removed."""
+    factors = []
+    for match in re.finditer(r"([a-z_][a-z_0-9]*)(?:\^\{?(\d+)\}?|\*\*(\d+))?", term):
+        name, power = match.group(1), int(match.group(2) or match.group(3) or 1)
+        if name in ("len", "max", "min", "sum", "text", "times", "cdot"):
+            continue
+        # Juxtaposed single-letter sizes ("mn", "rc") are products
+        factors += [(f, power) for f in (list(name) if len(name) <= 3 and name.isalpha() else [name])]
+    return factors
+
+
+def _term_degree(term: str, exponents: dict[str, float]) -> float:
+    # Logarithmic factors don't change the degree
+    term = _LOG.sub("", term)
+    term, roots = _SQRT.subn("", term)
+    return 0.5 * roots + sum(
+        power * exponents.get(f, 1) for f, power in _factors(term) if f not in _CONSTANT_NAMES
+    )
+
+
+def _normalize(bound: str) -> str:
+    expr = re.sub(f"[{_SUPERSCRIPTS}]+", lambda m: "^" + "".join(str(_SUPERSCRIPTS.index(c)) for c in m[0]),
+                  bound.lower().replace(" ", ""))
+    return expr.replace("\\cdot", "*").replace("\\times", "*").replace("·", "*").replace("×", "*")
+
+
+def documented_degree(bound: str, exponents: dict[str, float] | None = None) -> float:
+    """Polynomial degree of a documented bound in the input size (math.inf if exponential).
+
+    exponents: how fast named sizes grow with n (size ~ n^exponent); any other name counts as n.
+    """
+    expr = _normalize(bound)
+    if _exponential(expr):
+        return math.inf
+    return max(_term_degree(term, exponents or {}) for term in expr.split("+"))
+
+
+def documented_slope(bound: str, sizes: tuple[int, int], exponents: dict[str, float] | None = None) -> float:
+    """Log-log slope of a documented bound between two input sizes: its degree plus its log factors' share.
+
+    A log factor is flat in the degree but not at measurable sizes: n^2 log n has slope
+    2 + ln(ln 512 / ln 64) / ln 8 ~ 2.19 between n = 64 and 512. log(n^a) grows like
+    log n for any a > 0, so only logs of constant names (log k) add nothing.
+    """
+    expr = _normalize(bound)
+    if _exponential(expr):
+        return math.inf
+    lo, hi = sizes
+    per_log = math.log(math.log(hi) / math.log(lo)) / math.log(hi / lo)
+
+    def term_slope(term: str) -> float:
+        logs = sum(
+            any(f not in _CONSTANT_NAMES for f, _ in _factors(m[1] or m[2] or "n")) for m in _LOG.finditer(term)
+        )
+        return _term_degree(term, exponents or {}) + logs * per_log
+
+    return round(max(term_slope(term) for term in expr.split("+")), 2)
+
+
+def _exponential(expr: str) -> bool:
+    return "!" in expr or bool(re.search(r"(?:\^|\*\*)\{?\(?[a-z]", expr))
+
+
+def graph_variables(bound: str) -> set[str]:
+    """The GRAPH_VARIABLES a documented bound is stated in."""
+    expr = re.sub(r"\\?log(?:_?\{?\d+\}?)?", "", _normalize(bound))
+    return {f for term in expr.split("+") for f, _ in _factors(term)} & GRAPH_VARIABLES
+
+
+def size_exponents(problem: str, reference: list, sizes: tuple[int, int], seed: int) -> dict[str, float]:
+    """Growth exponent in n of each GRAPH_SIZES count, between two input sizes."""
+    lo, hi = (GRAPH_SIZES[problem](make_inputs(problem, reference, n, input_rng(seed, problem, n))) for n in sizes)
+    scale = math.log(sizes[1] / sizes[0])
+    return {name: round(math.log(hi[name] / lo[name]) / scale, 2) for name in lo}
+
+
+# ---------- Fitting ----------
+
+def fit_class(points: list[tuple[int, float]]) -> str | None:
+    """Growth class whose a + b*f(n) best fits the points (least squares on relative error)."""
+    best = None
+    for name, _, f in GROWTH_CLASSES:
+        # Weighted normal equations with weights 1/t^2
+        s00 = s01 = s11 = r0 = r1 = 0.0
+        for n, t in points:
+            fn, w = f(n), 1 / (t * t)
+            s00 += w
+            s01 += w * fn
+            s11 += w * fn * fn
+            r0 += w * t
+            r1 += w * fn * t
+        det = s00 * s11 - s01 * s01
+        if det == 0 or not math.isfinite(det):
+            continue
+        a = (r0 * s11 - r1 * s01) / det
+        b = (s00 * r1 - s01 * r0) / det
+        if b < 0 and name != "1":
+            continue
+        error = math.sqrt(sum(((a + b * f(n)) / t - 1) ** 2 for n, t in points) / len(points))
+        # A class must fit clearly better (5%) to beat a slower-growing one
+        if best is None or error < best[0] * 0.95:
+            best = (error, name)
+    return best[1] if best else None
+
+
+def power_law_slope(points: list[tuple[int, float]]) -> float | None:
+    """Least-squares log-log slope over the larger half of the sizes (where overhead matters least)."""
+    upper = points[len(points) // 2:]
+    if len(upper) < 2:
+        return None
+    xs = [math.log(n) for n, _ in upper]
+    ys = [math.log(t) for _, t in upper]
+    mx, my = sum(xs) / len(xs), sum(ys) / len(ys)
+    sxx = sum((x - mx) ** 2 for x in xs)
+    return round(sum((x - mx) * (y - my) for x, y in zip(xs, ys, strict=True)) / sxx, 2) if sxx else None
+
+
+# ---------- Measuring ----------
+
+def measure_problem(problem_dir: Path, args: argparse.Namespace) -> dict[str, dict]:
+    """Entries for every solution file of a problem, keyed by path under backend/algorithms."""
+    variants = load_problem(problem_dir)
+    runnable = [v for v in variants if v.entry]
+    entries: dict[str, dict] = {}
+    if not runnable:
+        return entries
+    reference = reference_parameters(runnable)
+
+    for v in runnable:
+        key = str(v.path.relative_to(ALGORITHMS_DIR))
+        doc = parse_sections(entry_function(v).__doc__ or "").get("time_complexity", "")
+        bound = documented_bound(doc)
+        degree = documented_degree(bound) if bound else None
+        entry: dict = {
+            "entry": v.entry,
+            "documented": f"O({bound})" if bound else None,
+            "documented_degree": degree if degree != math.inf else "exponential",
+        }
+        points: list[tuple[int, float]] = []
+        n = MIN_N
+        while n <= args.max_n:
+            try:
+                inputs = make_inputs(problem_dir.name, reference, n, input_rng(args.seed, problem_dir.name, n))
+            except TypeError as e:
+                entry["status"] = str(e)
+                break
+            result = run_variant(v, inputs, args.repeat, args.budget * 2, trace_memory=False)
+            if result["status"] != "ok":
+                entry["stopped"] = f"n={n}: {result['status']}"
+                break
+            points.append((n, result["seconds"]))
+            # Doubling n would take a quadratic solution past the budget
+            if result["seconds"] * 4 > args.budget:
+                break
+            n *= 2
+
+        entry["points"] = [[n, round(t, 9)] for n, t in points]
+        if len(points) >= 3:
+            entry["fitted"] = fit_class(points)
+            entry["slope"] = power_law_slope(points)
+        conclusive = len(points) >= 3 and points[-1][1] >= MIN_SECONDS and entry.get("slope") is not None
+
+        # The sizes the slope is taken from
+        sizes = (points[len(points) // 2][0], points[-1][0]) if conclusive else None
+        exponents = None
+
+        if conclusive and bound and degree != math.inf and graph_variables(bound):
+            if problem_dir.name in GRAPH_SIZES:
+                exponents = size_exponents(problem_dir.name, reference, sizes, args.seed)
+                degree = entry["documented_degree"] = documented_degree(bound, exponents)
+                entry["size_exponents"] = exponents
+            else:
+                degree = None
+                entry["status"] = "not fitted (bound in V/E, no vertex/edge counts for these inputs)"
+
+        if conclusive and degree is not None and degree != math.inf:
+            entry["documented_slope"] = documented_slope(bound, sizes, exponents)
+        entry["flagged"] = bool(
+            "documented_slope" in entry and entry["slope"] > entry["documented_slope"] + args.slack
+        )
+        if not conclusive:
+            entry["status"] = entry.get("status") or "inconclusive (too fast or too few sizes)"
+        entries[key] = entry
+    return entries
+
+
+def print_entry(key: str, entry: dict) -> None:
+    documented = entry["documented"] or "undocumented"
+    measured = f"{entry['fitted']} (slope {entry['slope']})" if entry.get("fitted") else "-"
+    mark = "⚠️ " if entry["flagged"] else "  "
+    line = f" {mark}{key:<78} {documented:<22} {measured}"
+    if entry.get("status"):
+        line += f"  [{entry['status']}]"
+    if entry.get("stopped"):
+        line += f"  [stopped at {entry['stopped']}]"
+    print(line[:220])
+
+
+def write_complexity(out: Path, entries: dict[str, dict], partial: bool) -> dict[str, dict]:
+    """Write complexity.json; a partial run (some problems only) replaces just their entries."""
+    if partial and out.exists():
+        existing = json.loads(out.read_text(encoding="utf-8"))
+        problems = {key.rsplit("/", 1)[0] for key in entries}
+        existing = {k: v for k, v in existing.items() if k.rsplit("/", 1)[0] not in problems}
+        existing.update(entries)
+        entries = dict(sorted(existing.items()))
+    out.parent.mkdir(parents=True, exist_ok=True)
+    write_json(out, entries, dump_compact_arrays)
+    return entries
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Fit each solution's measured running time and check it against its documented Time Complexity.")
+    ap.add_argument("problems", nargs="*", help="Problem slugs or numbers (default: all)")
+    ap.add_argument("--max-n", type=int, default=1 << 16, help="Largest input size (default: 65536)")
+    ap.add_argument("--budget", type=float, default=0.5,
+                    help="Seconds one call may take; n stops doubling before a quadratic solution would exceed it (default: 0.5)")
+    ap.add_argument("--repeat", type=int, default=3, help="Timed runs per size; the fastest counts (default: 3)")
+    ap.add_argument("--slack", type=float, default=0.5,
+                    help="Flag when the measured slope exceeds the documented bound's slope by more than this (default: 0.5)")
+    ap.add_argument("--seed", type=int, default=0, help="Seed for the generated inputs (default: 0)")
+    ap.add_argument("--write", type=Path, nargs="?", const=DEFAULT_OUT,
+                    help=f"Write the fitted curves as JSON (default path: {DEFAULT_OUT})")
+    ap.add_argument("--strict", action="store_true", help="Exit with status 1 if any solution is flagged")
+    args = ap.parse_args()
+
+    entries: dict[str, dict] = {}
+    for problem_dir in problem_dirs(args.problems):
+        if problem_dir.name in NONLINEAR_INPUTS:
+            continue
+        for key, entry in measure_problem(problem_dir, args).items():
+            print_entry(key, entry)
+            entries[key] = entry
+
+    flagged = [key for key, entry in entries.items() if entry["flagged"]]
+    print(f"\n{len(entries)} solutions measured • {len(flagged)} slower than documented")
+    for key in flagged:
+        entry = entries[key]
+        print(f"   ⚠️  {key}: documented {entry['documented']}, measured ~{entry['fitted']} (slope {entry['slope']})")
+
+    if args.write:
+        write_complexity(args.write, entries, partial=bool(args.problems))
+        print(f"Wrote {args.write} • {len(entries)} solutions")
+    return 1 if args.strict and flagged else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,10 +4,13 @@ Script to generate a new problem folder structure.
 
 Usage:
     python3 backend/scripts/problems/create_problem.py
+    PYTHONPATH=backend python3 -m scripts.problems create
 """
 
+# os rather than pathlib: this runs interactively and pathlib's import (re,
+# fnmatch, urllib.parse) costs more than the work itself
+import os
 import sys
-from pathlib import Path
 
 
 def slugify(text: str) -> str:
@@ -49,34 +52,39 @@ def create_problem_folder(
     url: str,
     difficulty: str,
     topics: list[str],
-    root_path: Path,
+    root_path: str,
 ) -> None:
     """Create problem folder with all necessary files."""
     # Create folder name
     slug = slugify(title)
     folder_name = f"{number}-{slug}"
-    folder_path = root_path / folder_name
+    folder_path = os.path.join(root_path, folder_name)
 
     # Create folder (allow overwrite since we already prompted)
-    folder_path.mkdir(parents=True, exist_ok=True)
+    os.makedirs(folder_path, exist_ok=True)
     print(f"Created folder: {folder_path}")
 
     # Create __init__.py
     init_content = create_init_file(title, definition, url, difficulty, topics)
-    init_path = folder_path / "__init__.py"
-    init_path.write_text(init_content)
+    init_path = os.path.join(folder_path, "__init__.py")
+    _write_text(init_path, init_content)
     print(f"Created: {init_path}")
 
     # Create solution.py
     function_name = slug.replace("-", "_")
     solution_content = create_solution_file(function_name)
-    solution_path = folder_path / "solution.py"
-    solution_path.write_text(solution_content)
+    solution_path = os.path.join(folder_path, "solution.py")
+    _write_text(solution_path, solution_content)
     print(f"Created: {solution_path}")
 
     print(f"\n✓ Successfully created problem folder: {folder_name}")
 
 
+def _write_text(path: str, content: str) -> None:
+    with open(path, "w") as f:
+        f.write(content)
+
+
 def prompt_input(prompt_text: str, required: bool = True) -> str:
     """Prompt user for input with validation."""
     while True:
@@ -117,8 +125,8 @@ def main() -> None:
     print("\n=== Create New Problem ===\n")
 
     # Use default root path
-    root_path = Path("backend/algorithms/problems")
-    if not root_path.exists():
+    root_path = os.path.join("backend", "algorithms", "problems")
+    if not os.path.exists(root_path):
         print(f"Error: Root path '{root_path}' does not exist.", file=sys.stderr)
         sys.exit(1)
 
@@ -129,8 +137,8 @@ def main() -> None:
     # Check if folder already exists early
     slug = slugify(title)
     folder_name = f"{number}-{slug}"
-    folder_path = root_path / folder_name
-    if folder_path.exists():
+    folder_path = os.path.join(root_path, folder_name)
+    if os.path.exists(folder_path):
         print(f"\n⚠️  Problem '{folder_name}' already exists at {folder_path}")
         overwrite = input("Do you want to overwrite it? (y/n): ").strip().lower()
         if overwrite != "y":
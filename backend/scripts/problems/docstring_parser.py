@@ -5,10 +5,12 @@ Shared docstring parsing utilities for extracting structured sections.
 This module provides utilities for parsing Google-style docstrings with sections like:
 Args, Returns, Raises, Examples, Topics, Difficulty, Time Complexity, Space Complexity, etc.
 
-Used by both generate_symbol_tags.py and extract_problems_metadata.py.
+Used by generate_symbol_tags.py, extract_problems_metadata.py and
+sync_problems_to_db.py.
 """
 
 import ast
+from functools import lru_cache
 from typing import Any, Optional
 
 
@@ -39,6 +41,33 @@ _SECTION_CONFIG = {
 _SECTION_HEADS = tuple(_SECTION_CONFIG.keys())
 
 
+class SectionHeads:
+    """Matcher for "Name:" section heads at the start of a stripped docstring line.
+
+    Looks up the text before the first colon in a dict, so each line costs one
+    find and one hash lookup however many sections are recognized.
+    """
+
+    def __init__(self, names: tuple[str, ...], case_sensitive: bool = True):
+        self.case_sensitive = case_sensitive
+        self._by_key = {(name if case_sensitive else name.lower()): name for name in names}
+
+    def match(self, stripped: str) -> tuple[str, str] | None:
+        """(canonical section name, text after the colon), or None if the line is not a head."""
+        colon = stripped.find(":")
+        if colon <= 0:
+            return None
+        key = stripped[:colon] if self.case_sensitive else stripped[:colon].lower()
+        name = self._by_key.get(key)
+        return (name, stripped[colon + 1:]) if name else None
+
+
+@lru_cache(maxsize=None)
+def section_heads(names: tuple[str, ...], case_sensitive: bool = True) -> SectionHeads:
+    """Shared SectionHeads instance per (names, case_sensitive)."""
+    return SectionHeads(names, case_sensitive)
+
+
 def _process_comma_list(lines: list[str]) -> list[str]:
     """Process lines as comma-separated list, handling bullets."""
     items: list[str] = []
@@ -122,9 +151,11 @@ def _process_args_lsp(lines: list[str], node: ast.AST | None = None) -> dict[str
     
     # Extract type annotations from AST node
     type_map: dict[str, str] = {}
+    signature: list[str] = []
     if node and isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
         for arg in node.args.args:
             param_name = arg.arg
+            signature.append(param_name)
             if arg.annotation:
                 try:
                     type_map[param_name] = ast.unparse(arg.annotation)
@@ -132,8 +163,9 @@ def _process_args_lsp(lines: list[str], node: ast.AST | None = None) -> dict[str
                     # Fallback if unparse fails
                     pass
     
-    # Get all parameter names from both sources
-    all_params = set(doc_map.keys()) | set(type_map.keys())
+    # Parameter names from both sources, in signature order and then docstring order
+    # (never a set: its order changes with the hash seed, i.e. per process)
+    all_params = [p for p in dict.fromkeys([*signature, *doc_map]) if p in type_map or p in doc_map]
     
     # Build LSP-style result
     result: dict[str, dict[str, str]] = {}
@@ -308,10 +340,12 @@ def parse_sections(doc: str, node: ast.AST | None = None) -> dict[str, Any]:
     lines = [ln.rstrip() for ln in processed_doc.splitlines()]
     section = "summary"
     buckets: dict[str, list[str]] = {k: [] for k in ("summary", *_SECTION_HEADS)}
+    heads = section_heads(_SECTION_HEADS)
     for ln in lines:
         s = ln.strip()
-        if s.endswith(":") and s[:-1] in _SECTION_HEADS:
-            section = s[:-1]
+        head = heads.match(s) if s.endswith(":") else None
+        if head and not head[1]:
+            section = head[0]
             continue
         buckets[section].append(ln)
 
@@ -379,4 +413,105 @@ def parse_sections(doc: str, node: ast.AST | None = None) -> dict[str, Any]:
 
 def extract_metadata(raw_doc: str, node: ast.AST | None = None) -> dict[str, Any]:
     """Parse Google-style sections from docstring."""
-    return parse_sections(raw_doc or "", node)
\ No newline at end of file
+    return parse_sections(raw_doc or "", node)
+
+# ---------- Simple "Section: value" docstrings (problem metadata / DB sync) ----------
+
+def _process_section_lines(lines: list[tuple[str, str] | str], nested_indent: int) -> str:
+    """Join section lines, re-indenting continuation lines relative to the shallowest one.
+
+    Same-line content stays at column 0; continuation lines at the base level get
+    nested_indent spaces, deeper ones keep their extra indentation on top of that.
+    """
+    if not lines:
+        return ""
+
+    processed_lines = []
+
+    # Convert any string entries to tuples for consistency
+    normalized_lines = []
+    for line in lines:
+        if isinstance(line, str):
+            if line == "":
+                normalized_lines.append(("", ""))
+            else:
+                normalized_lines.append(("", line))
+        else:
+            normalized_lines.append(line)
+
+    # Find base indentation (minimum indentation among non-empty lines)
+    base_indent = float('inf')
+    for indent, content in normalized_lines:
+        if content.strip() and indent:
+            base_indent = min(base_indent, len(indent))
+
+    if base_indent == float('inf'):
+        base_indent = 0
+
+    for indent, content in normalized_lines:
+        if not content.strip():  # Empty line
+            processed_lines.append("")
+            continue
+
+        # Same-line content (no indent) stays at 0
+        if not indent:
+            processed_lines.append(content)
+            continue
+
+        processed_lines.append(' ' * (nested_indent + len(indent) - base_indent) + content)
+
+    return '\n'.join(processed_lines).strip()
+
+
+def parse_simple_docstring(
+    docstring: str,
+    expected_sections: list[str] | tuple[str, ...],
+    nested_indent: int = 4,
+) -> dict[str, str]:
+    """
+    Parse simplified docstring format extracting sections as-is.
+
+    Format:
+        Section Name: value (can be on same line or indented on next lines)
+
+    Section names match case-insensitively; result keys are the lowercased,
+    underscored names ("Time Complexity" -> "time_complexity").
+    """
+    if not docstring:
+        return {}
+
+    heads = section_heads(tuple(expected_sections), case_sensitive=False)
+    result = {}
+    current_section = None
+    current_lines = []
+
+    def flush():
+        if current_section and current_lines:
+            processed_content = _process_section_lines(current_lines, nested_indent)
+            if processed_content:
+                result[current_section.lower().replace(' ', '_')] = processed_content
+
+    for line in docstring.strip().splitlines():
+        stripped = line.strip()
+        if not stripped:
+            if current_section and current_lines:
+                current_lines.append("")
+            continue
+
+        head = heads.match(stripped)
+        if head:
+            flush()
+            current_section, value_part = head
+            current_lines = []
+            value_part = value_part.strip()
+            if value_part:
+                current_lines.append(("", value_part))  # No indentation for same-line content
+        elif current_section:
+            # This line belongs to current section - store with original indentation
+            leading_spaces = len(line) - len(line.lstrip())
+            current_lines.append((line[:leading_spaces], stripped))
+
+    # Don't forget the last section
+    flush()
+
+    return result
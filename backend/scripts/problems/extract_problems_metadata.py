@@ -13,10 +13,15 @@ New simplified docstring format:
 
 import argparse
 import ast
-import json
+from collections.abc import Callable
 from pathlib import Path
+import profiling
 from code_cleaner import clean_code
+from docstring_parser import parse_simple_docstring
 from get_directory_timestamps import get_directory_timestamps
+from parallel import parallel_map, resolve_jobs
+from shards import write_sharded_problems_metadata
+from source_model import SourceCache, SourceFile
 
 
 def ast_type_to_string(annotation) -> str:
@@ -72,121 +77,6 @@ def extract_function_signature_types(node: ast.FunctionDef) -> dict[str, str]:
 
     return types
 
-def parse_simple_docstring(docstring: str, expected_sections: list[str]) -> dict[str, str]:
-    """
-    Parse simplified docstring format extracting sections as-is.
-
-    Format:
-        Section Name: value (can be on same line or indented on next lines)
-    """
-    if not docstring:
-        return {}
-
-    result = {}
-    lines = docstring.strip().splitlines()
-    current_section = None
-    current_lines = []
-
-    for line in lines:
-        stripped = line.strip()
-        if not stripped:
-            if current_section and current_lines:
-                current_lines.append("")
-            continue
-
-        # Check if this line starts a new section
-        section_found = False
-        for section in expected_sections:
-            if stripped.lower().startswith(f"{section.lower()}:"):
-                # Process previous section if exists
-                if current_section and current_lines:
-                    processed_content = _process_section_lines(current_lines)
-                    if processed_content:
-                        result[current_section.lower().replace(' ', '_')] = processed_content
-
-                # Start new section
-                current_section = section
-                current_lines = []
-
-                # Check if value is on the same line
-                value_part = stripped[len(f"{section}:"):].strip()
-                if value_part:
-                    current_lines.append((" " * 0, value_part))  # No indentation for same-line content
-
-                section_found = True
-                break
-
-        if not section_found and current_section:
-            # This line belongs to current section - store with original indentation
-            leading_spaces = len(line) - len(line.lstrip())
-            current_lines.append((line[:leading_spaces], stripped))
-
-    # Don't forget the last section
-    if current_section and current_lines:
-        processed_content = _process_section_lines(current_lines)
-        if processed_content:
-            result[current_section.lower().replace(' ', '_')] = processed_content
-
-    return result
-
-
-def _process_section_lines(lines: list[tuple[str, str] | str]) -> str:
-    """Process section lines and convert to MDX-ready indentation."""
-    if not lines:
-        return ""
-
-    processed_lines = []
-
-    # Convert any string entries to tuples for consistency
-    normalized_lines = []
-    for line in lines:
-        if isinstance(line, str):
-            if line == "":
-                normalized_lines.append(("", ""))
-            else:
-                normalized_lines.append(("", line))
-        else:
-            normalized_lines.append(line)
-
-    # Find base indentation (minimum indentation among non-empty lines)
-    base_indent = float('inf')
-    for indent, content in normalized_lines:
-        if content.strip() and indent:
-            base_indent = min(base_indent, len(indent))
-
-    if base_indent == float('inf'):
-        base_indent = 0
-
-    # Process all lines, mapping to MDX indentation
-    for indent, content in normalized_lines:
-        if not content.strip():  # Empty line
-            processed_lines.append("")
-            continue
-
-        # Calculate original indentation level
-        original_indent = len(indent) if indent else 0
-
-        # Same-line content (no indent) stays at 0
-        if original_indent == 0:
-            processed_lines.append(content)
-            continue
-
-        # Calculate relative indent from base
-        relative_indent = original_indent - base_indent
-
-        # Mapping:
-        # - Items at base level (relative 0) → 4 spaces
-        # - Items beyond base → 4 + relative_indent (preserves nesting)
-        if relative_indent == 0:
-            mdx_indent = 4
-        else:
-            # Preserve relative indentation: each level adds to base 4 spaces
-            mdx_indent = 4 + relative_indent
-
-        processed_lines.append(' ' * mdx_indent + content)
-
-    return '\n'.join(processed_lines).strip()
-
 def extract_function_code(content: str, node: ast.FunctionDef) -> str:
     """Extract function code and remove all docstrings using the new cleaner."""
     lines = content.splitlines()
@@ -200,26 +90,23 @@ def extract_function_code(content: str, node: ast.FunctionDef) -> str:
     return clean_code(function_code)
 
 
-def extract_function_metadata(file_path: Path) -> dict[str, str]:
+def extract_function_metadata(file_path: Path, src: SourceFile | None = None) -> dict[str, str]:
     """Extract metadata from a Python solution file using simplified docstring format."""
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
+        if src is None:
+            src = SourceFile.load(file_path)
 
         # Parse the AST
-        tree = ast.parse(content)
+        tree = src.tree
 
         # Store the full file content (cleaned of docstrings) for tooltip system
-        full_file_code = clean_code(content)
+        full_file_code = src.cleaned_text
 
         # Find the main function (first function definition)
         for node in ast.walk(tree):
             if isinstance(node, ast.FunctionDef):
                 docstring = ast.get_docstring(node, clean=True) or ""
 
-                # Extract cleaned function code
-                cleaned_code = extract_function_code(content, node)
-
                 # Extract function signature types
                 signature_types = extract_function_signature_types(node)
 
@@ -354,15 +241,30 @@ def extract_function_metadata(file_path: Path) -> dict[str, str]:
                 return result
 
         # If no function found, return the cleaned file content
-        full_file_code = clean_code(content)
         return {'code': full_file_code, 'full_file_code': full_file_code}
 
     except Exception as e:
         print(f"Error processing {file_path}: {e}")
         return {}
 
-def extract_problem_metadata(problem_dir: Path) -> dict[str, dict]:
-    """Extract metadata from a problem directory using simplified docstring format."""
+def _staged_function_metadata(file_path: Path, src: SourceFile) -> dict[str, str]:
+    # Charged to the stage generate_all_metadata's cache charges it to
+    with profiling.stage("solution_metadata"):
+        return extract_function_metadata(file_path, src)
+
+def extract_problem_metadata(
+    problem_dir: Path,
+    sources: SourceCache | None = None,
+    solution_metadata: Callable[[Path, SourceFile], dict] | None = None,
+) -> dict[str, dict]:
+    """Extract metadata from a problem directory using simplified docstring format.
+
+    When a shared SourceCache is given, files already analyzed by other generators
+    are not re-read, re-cleaned or re-parsed. solution_metadata replaces
+    extract_function_metadata for solution files (e.g. with a cached lookup).
+    """
+    sources = sources or SourceCache(problem_dir)
+    solution_metadata = solution_metadata or _staged_function_metadata
     problem_data = {
         'time_stamps': get_directory_timestamps(problem_dir),
         'solutions': {}
@@ -372,11 +274,8 @@ def extract_problem_metadata(problem_dir: Path) -> dict[str, dict]:
     init_file = problem_dir / '__init__.py'
     if init_file.exists():
         try:
-            with open(init_file, 'r', encoding='utf-8') as f:
-                content = f.read()
-
             # Extract docstring from module level
-            tree = ast.parse(content)
+            tree = sources.get(init_file).tree
             docstring = ast.get_docstring(tree, clean=True)
             if docstring:
                 # Parse using simplified format for __init__.py sections
@@ -422,81 +321,82 @@ def extract_problem_metadata(problem_dir: Path) -> dict[str, dict]:
         if py_file.name.startswith('_'):
             continue
 
-        solution_data = extract_function_metadata(py_file)
+        try:
+            src = sources.get(py_file)
+        except Exception as e:
+            print(f"Error processing {py_file}: {e}")
+            continue
+        solution_data = solution_metadata(py_file, src)
         if solution_data:
             problem_data['solutions'][py_file.name] = solution_data
 
     return problem_data
 
-def process_directory(directory_path: Path, directory_name: str) -> dict[str, dict]:
-    """Process a directory (problems or core) and extract metadata from all subdirectories."""
+def process_directory(
+    directory_path: Path,
+    directory_name: str,
+    sources: SourceCache | None = None,
+    solution_metadata: Callable[[Path, SourceFile], dict] | None = None,
+    jobs: int = 1,
+) -> dict[str, dict]:
+    """Process a directory (problems or core) and extract metadata from all subdirectories.
+
+    With jobs > 1 the subdirectories are extracted in worker processes; sources
+    and solution_metadata are in-process hooks and are not used in that mode.
+    """
     if not directory_path.exists():
         print(f"{directory_name.title()} directory not found: {directory_path}")
         return {}
 
-    all_items = {}
+    # Sorted so the output key order is stable across filesystems and job counts
+    item_dirs = sorted(
+        item_dir for item_dir in directory_path.iterdir()
+        if item_dir.is_dir() and not item_dir.name.startswith('.')
+    )
 
     # Process each subdirectory
-    for item_dir in directory_path.iterdir():
-        if not item_dir.is_dir() or item_dir.name.startswith('.'):
-            continue
-
-        print(f"Processing {directory_name}: {item_dir.name}")
-        item_data = extract_problem_metadata(item_dir)
+    if resolve_jobs(jobs) > 1:
+        print(f"Processing {len(item_dirs)} {directory_name} with {resolve_jobs(jobs)} workers")
+        results = parallel_map(extract_problem_metadata, item_dirs, jobs)
+    else:
+        results = []
+        for item_dir in item_dirs:
+            print(f"Processing {directory_name}: {item_dir.name}")
+            results.append(extract_problem_metadata(item_dir, sources, solution_metadata))
 
+    all_items = {}
+    for item_dir, item_data in zip(item_dirs, results, strict=True):
         if item_data:
             all_items[item_dir.name] = item_data
 
     return all_items
 
-class CompactJSONEncoder(json.JSONEncoder):
-    """Custom JSON encoder that keeps arrays compact (single-line)."""
-    def encode(self, obj):
-        if isinstance(obj, list):
-            return '[' + ', '.join(json.dumps(item, ensure_ascii=False) if not isinstance(item, list)
-                                   else '[' + ', '.join(json.dumps(x, ensure_ascii=False) for x in item) + ']'
-                                   for item in obj) + ']'
-        return super().encode(obj)
-
-    def iterencode(self, obj, _one_shot=False):
-        """Encode while keeping lists compact."""
-        for chunk in super().iterencode(obj, _one_shot):
-            yield chunk
-
-def compact_json_dumps(obj):
-    """Custom JSON serialization with compact arrays."""
-    def format_value(value, depth=0):
-        ind = '  ' * depth
-        if isinstance(value, dict):
-            if not value:
-                return '{}'
-            items = []
-            for k, v in value.items():
-                formatted_v = format_value(v, depth + 1)
-                items.append(f'{ind}  {json.dumps(k, ensure_ascii=False)}: {formatted_v}')
-            return '{\n' + ',\n'.join(items) + '\n' + ind + '}'
-        elif isinstance(value, list):
-            if not value:
-                return '[]'
-            # Compact array format
-            if all(isinstance(item, list) for item in value):
-                # List of lists (like group field)
-                formatted_items = ['[' + ', '.join(json.dumps(x, ensure_ascii=False) for x in item) + ']' for item in value]
-                return '[' + ', '.join(formatted_items) + ']'
-            else:
-                # Simple list (like topics field)
-                return '[' + ', '.join(json.dumps(item, ensure_ascii=False) for item in value) + ']'
-        else:
-            return json.dumps(value, ensure_ascii=False)
-
-    return format_value(obj)
+@profiling.timed("write:problems_metadata")
+def write_problems_metadata(
+    output_path: Path,
+    problems: dict[str, dict],
+    core: dict[str, dict] | None = None,
+    problem: str | None = None,
+) -> None:
+    """Write problems_metadata.json and its per-problem fragments.
+
+    In single-problem mode only that problem's fragment is replaced; core entries
+    are kept as-is (see shards.py).
+    """
+    write_sharded_problems_metadata(output_path, problems, core, problem)
 
 def main():
     """Main extraction function."""
     parser = argparse.ArgumentParser(description='Extract problem metadata to JSON')
     parser.add_argument('--problem', help='Specific problem slug to extract (e.g., "53-maximum-subarray"). If not provided, extracts all.')
+    parser.add_argument('--jobs', '-j', type=int, default=1, help='Worker processes for per-problem extraction (0 = one per CPU)')
+    profiling.add_arguments(parser)
     args = parser.parse_args()
+    with profiling.profiled(args, "extract_problems_metadata"):
+        return _run(args)
 
+
+def _run(args: argparse.Namespace):
     # Path to algorithms directory (parent of both problems and core)
     algorithms_dir = Path(__file__).parent.parent.parent / 'algorithms'
 
@@ -516,20 +416,9 @@ def main():
             print(f"❌ Problem not found: {args.problem}")
             return
 
-        # Load existing metadata
-        existing_data = {'problems': {}, 'core': {}}
-        if output_path.exists():
-            with open(output_path, 'r', encoding='utf-8') as f:
-                existing_data = json.load(f)
-
         print(f"Processing problem: {args.problem}")
         problem_data = extract_problem_metadata(problem_dir)
-
-        if problem_data:
-            existing_data['problems'][args.problem] = problem_data
-
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write(compact_json_dumps(existing_data))
+        write_problems_metadata(output_path, {args.problem: problem_data} if problem_data else {}, problem=args.problem)
 
         print(f"\n✅ Extracted metadata for {args.problem}")
         print(f"Output: {output_path}")
@@ -538,17 +427,10 @@ def main():
         problems_dir = algorithms_dir / 'problems'
         core_dir = algorithms_dir / 'core'
 
-        all_problems = process_directory(problems_dir, 'problems')
-        all_core = process_directory(core_dir, 'core')
-
-        # Generate output JSON with new structure
-        output_data = {
-            'problems': all_problems,
-            'core': all_core
-        }
+        all_problems = process_directory(problems_dir, 'problems', jobs=args.jobs)
+        all_core = process_directory(core_dir, 'core', jobs=args.jobs)
 
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write(compact_json_dumps(output_data))
+        write_problems_metadata(output_path, all_problems, all_core)
 
         print(f"\n✅ Extracted metadata for {len(all_problems)} problems and {len(all_core)} core algorithms")
         print(f"Output: {output_path}")
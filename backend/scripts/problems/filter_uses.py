@@ -4,6 +4,10 @@ Filter uses.json to only include entries that have corresponding entries in symb
 
 This script reads both files and creates a filtered version of uses.json containing
 only the entries whose 'qname' field matches a key in symbol_tags.json.
+
+Builds no longer need it: generate_all_metadata.py --filtered-uses (or
+generate_uses.py --symbol-tags) writes the same file straight from the in-memory
+uses. It remains for filtering existing files.
 """
 
 import argparse
@@ -11,6 +15,10 @@ import json
 import sys
 from pathlib import Path
 
+import profiling
+from generate_uses import filter_uses
+from json_writer import dump_range_index, write_json
+
 
 def load_json(file_path: Path) -> dict:
     """Load JSON data from a file."""
@@ -25,56 +33,6 @@ def load_json(file_path: Path) -> dict:
         sys.exit(1)
 
 
-def filter_uses_by_symbol_tags(uses_data: dict, symbol_tags_keys: set) -> dict:
-    """Filter uses data to only include entries with qnames that exist in symbol_tags."""
-    filtered_uses = {}
-    
-    for filename, entries in uses_data.items():
-        filtered_entries = []
-        
-        for entry in entries:
-            qname = entry.get('qname')
-            if qname and qname in symbol_tags_keys:
-                filtered_entries.append(entry)
-        
-        # Only include files that have at least one matching entry
-        if filtered_entries:
-            filtered_uses[filename] = filtered_entries
-    
-    return filtered_uses
-
-
-def compact_json(obj, indent=0):
-    """Custom compact formatting for ranges (matching generate_uses.py format)."""
-    if isinstance(obj, dict):
-        if "range" in obj and "qname" in obj:  # use object with range, nameRange, qname, and kind
-            range_obj = obj["range"]
-            name_range_obj = obj["nameRange"]
-            start = range_obj["start"]
-            end = range_obj["end"]
-            name_start = name_range_obj["start"]
-            name_end = name_range_obj["end"]
-            qname = json.dumps(obj["qname"])
-            kind = json.dumps(obj["kind"])
-            return f'{{"range": {{"start": {{"line": {start["line"]}, "character": {start["character"]}}}, "end": {{"line": {end["line"]}, "character": {end["character"]}}}}}, "nameRange": {{"start": {{"line": {name_start["line"]}, "character": {name_start["character"]}}}, "end": {{"line": {name_end["line"]}, "character": {name_end["character"]}}}}}, "qname": {qname}, "kind": {kind}}}'
-        else:
-            items = []
-            for k, v in obj.items():
-                key = json.dumps(k)
-                if isinstance(v, list) and all(isinstance(item, dict) and "range" in item for item in v):
-                    # List of use objects
-                    use_items = [compact_json(item, 0) for item in v]
-                    uses_str = "[\n" + ",\n".join(f"    {item}" for item in use_items) + "\n  ]"
-                    items.append(f"  {key}: {uses_str}")
-                else:
-                    items.append(f"  {key}: {compact_json(v, indent + 2)}")
-            return "{\n" + ",\n".join(items) + "\n}"
-    elif isinstance(obj, list):
-        return "[" + ", ".join(compact_json(item, indent) for item in obj) + "]"
-    else:
-        return json.dumps(obj, ensure_ascii=False)
-
-
 def main():
     """Main function to filter uses.json based on symbol_tags.json."""
     parser = argparse.ArgumentParser(description="Filter uses.json to only include entries with qnames in symbol_tags.json")
@@ -84,7 +42,13 @@ def main():
                         help="Input symbol_tags.json file path")
     parser.add_argument("--out", default="lib/extracted-metadata/filtered_uses.json",
                         help="Output filtered uses.json file path")
+    profiling.add_arguments(parser)
     args = parser.parse_args()
+    with profiling.profiled(args, "filter_uses"):
+        return _run(args)
+
+
+def _run(args: argparse.Namespace):
     
     # Resolve file paths
     uses_file = Path(args.uses)
@@ -109,7 +73,7 @@ def main():
     
     # Filter the uses data
     print("Filtering uses.json...")
-    filtered_uses = filter_uses_by_symbol_tags(uses_data, symbol_tags_keys)
+    filtered_uses = filter_uses(uses_data, symbol_tags_keys)
     
     # Count filtered entries
     filtered_count = sum(len(entries) for entries in filtered_uses.values())
@@ -121,7 +85,8 @@ def main():
     
     # Save the filtered data using the same compact format as generate_uses.py
     print(f"Writing filtered data to {output_file}...")
-    output_file.write_text(compact_json(filtered_uses), encoding="utf-8")
+    with profiling.stage("write:filtered_uses"):
+        write_json(output_file, filtered_uses, dump_range_index)
     
     print("Filtering complete!")
 
@@ -0,0 +1,380 @@
+#!/usr/bin/env python3
+"""
+Generate every lib/extracted-metadata/*.json output in a single process.
+
+Runs the same extraction as the individual scripts:
+  generate_lsp_index.py, generate_symbol_tags.py (+ transform-field-to-lists.py),
+  generate_uses.py, generate_expressions.py, generate_comments_inline.py and
+  extract_problems_metadata.py
+but reads, cleans and parses each file exactly once. Every generator is fed from
+a shared SourceFile (raw text, cleaned text, ASTs, docstring sections), so adding
+a generator no longer adds another full pass over the tree.
+
+Per-file outputs are kept in a content-hash build cache (build_cache.py), so a
+rebuild only re-analyzes files whose content (or whose generator) changed and
+splices cached results for everything else.
+
+With --watch the process stays up after the first build: the imports and the
+build cache stay in memory, and each saved file regenerates just its problem
+(or, for files outside problems/, everything, mostly from cache), optionally
+syncing that problem's rows to the database (--sync-db).
+
+CLI:
+  python3 generate_all_metadata.py \
+    --root backend/algorithms \
+    --out-dir lib/extracted-metadata \
+    [--problem 53-maximum-subarray] [--cache .cache/extracted-metadata.json | --no-cache] \
+    [--lsp-ranges] [--filtered-uses] \
+    [--watch [--sync-db]]
+"""
+
+import argparse
+import functools
+import importlib.util
+import sys
+import time
+from pathlib import Path
+
+# Add the current directory to Python path to import sibling generators
+sys.path.insert(0, str(Path(__file__).parent))
+import code_cleaner
+import docstring_parser
+import extract_problems_metadata
+import generate_comments_inline
+import generate_expressions
+import generate_lsp_index
+import generate_symbol_tags
+import generate_uses
+import profiling
+import source_model
+from build_cache import DEFAULT_CACHE_PATH, BuildCache, generator_version
+from extract_problems_metadata import (
+    extract_function_metadata,
+    extract_problem_metadata,
+    process_directory,
+    write_problems_metadata,
+)
+from generate_comments_inline import (
+    collect_comment_entries,
+    comments_for_source,
+    write_comments,
+)
+from generate_expressions import expressions_for_source, write_expressions
+from generate_lsp_index import document_symbols, ranges_path, write_lsp_index
+from generate_symbol_tags import merge_problem_tags, symbol_tags_for_file
+from generate_uses import (
+    cacheable_uses,
+    cached_uses_current,
+    write_filtered_uses,
+    write_uses,
+)
+from source_model import ModuleGraph, SourceCache, scan_files
+from watch import watch_changes
+
+# Modules every generator's output depends on
+_SHARED_MODULES = (source_model, code_cleaner, docstring_parser)
+
+
+@functools.cache
+def _load_transform_module():
+    """Import transform-field-to-lists.py (hyphenated, so not importable by name)."""
+    path = Path(__file__).parent / "transform-field-to-lists.py"
+    spec = importlib.util.spec_from_file_location("transform_field_to_lists", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def generator_versions(transform, uri_base: str, transform_fields: list[str]) -> dict[str, str]:
+    """Cache version per generator: its source, the shared modules, and any output-affecting options."""
+    return {
+        "lsp_index": generator_version(generate_lsp_index, *_SHARED_MODULES, salt=uri_base),
+        # file_path entries are relative to the working directory
+        "symbol_tags": generator_version(
+            generate_symbol_tags, transform, *_SHARED_MODULES,
+            salt=f"{Path.cwd()}|{' '.join(transform_fields)}",
+        ),
+        "uses": generator_version(generate_uses, *_SHARED_MODULES),
+        "expressions": generator_version(generate_expressions, *_SHARED_MODULES),
+        "comments": generator_version(generate_comments_inline, *_SHARED_MODULES),
+        "solution_metadata": generator_version(extract_problems_metadata, *_SHARED_MODULES),
+    }
+
+
+def generate_all(
+    root: Path,
+    out_dir: Path,
+    problem: str | None = None,
+    uri_base: str = "",
+    transform_fields: list[str] | None = None,
+    cache_path: Path | None = DEFAULT_CACHE_PATH,
+    cache: BuildCache | None = None,
+    lsp_ranges: bool = False,
+    filtered_uses: bool = False,
+) -> int:
+    """Run all generators over root and write their outputs into out_dir.
+
+    A caller that passes its own (long-lived) cache is responsible for saving it.
+    With lsp_ranges the columnar lsp_index.ranges.json sidecar is (re)created, and
+    with filtered_uses filtered_uses.json (uses whose qname has a symbol tag); either
+    file is refreshed whenever it already exists.
+    """
+    sources = SourceCache(root)
+    # Workspace modules for import resolution in uses.json (rescanned per build: files come and go in watch mode)
+    graph = ModuleGraph.scan(root)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    transform = _load_transform_module()
+    transform_fields = transform_fields or ["intuition", "topics"]
+    owns_cache = cache is None
+    if owns_cache:
+        cache = BuildCache(cache_path, generator_versions(transform, uri_base, transform_fields))
+
+    def transformed_tags(src) -> dict[str, dict[str, object]]:
+        tags = symbol_tags_for_file(src)
+        transform.transform_entries(tags, transform_fields, verbose=False)
+        return tags
+
+    def comment_pairs(src) -> list[list]:
+        # JSON object keys are strings, so keep line numbers as [line, text] pairs
+        return [[line, text] for line, text in comments_for_source(src).items()]
+
+    def file_uses(src) -> list[dict]:
+        # The module set and scan root decide import resolution; the exports of the
+        # modules a file imports from decide its bindings, so entries record those
+        entry = cache.get(
+            src, "uses", lambda: cacheable_uses(src, graph),
+            salt=f"{graph.fingerprint}|{graph.root}",
+            valid=lambda entry: cached_uses_current(entry, graph),
+        )
+        return entry["uses"]
+
+    def solution_metadata(py_file: Path, src) -> dict:
+        return cache.get(src, "solution_metadata", lambda: extract_function_metadata(py_file, src))
+
+    if problem:
+        problem_dir = root / "problems" / problem
+        if not problem_dir.is_dir():
+            print(f"❌ Problem not found: {problem}")
+            return 1
+
+    files = scan_files(root, problem)
+
+    documents: list[dict] = []
+    lsp_errors: list[str] = []
+    tags: dict[str, dict[str, object]] = {}
+    uses: dict[str, list[dict]] = {}
+    expressions: dict[str, list[dict]] = {}
+    comments: dict[str, list[int]] = {}
+    comment_symbols: dict[str, str] = {}
+
+    for f in profiling.iter_files(files):
+        src = sources.get(f)
+
+        try:
+            documents.append(cache.get(src, "lsp_index", functools.partial(document_symbols, src, uri_base)))
+        except Exception as e:
+            lsp_errors.append(f"{f}: {e}")
+
+        try:
+            tags.update(cache.get(src, "symbol_tags", functools.partial(transformed_tags, src)))
+        except Exception as e:  # keep going; report
+            print(f"[warn] skipping {f}: {e}", file=sys.stderr)
+
+        uses[src.rel_path] = file_uses(src)
+
+        file_expressions = cache.get(src, "expressions", functools.partial(expressions_for_source, src))
+        if file_expressions:
+            expressions[src.rel_path] = file_expressions
+
+        try:
+            file_comments = dict(cache.get(src, "comments", functools.partial(comment_pairs, src)))
+        except Exception as e:
+            print(f"Warning: Failed to process {f}: {e}")
+            file_comments = {}
+        if file_comments:
+            line_numbers, symbols = collect_comment_entries(src.rel_path, file_comments)
+            comments[src.rel_path] = line_numbers
+            comment_symbols.update(symbols)
+
+    # ---- lsp_index.json
+    lsp_out = out_dir / "lsp_index.json"
+    documents = write_lsp_index(lsp_out, documents, problem, ranges_path(lsp_out) if lsp_ranges else None)
+    print(f"Wrote {lsp_out} • {len(documents)} documents")
+    if lsp_errors:
+        print(f"Skipped {len(lsp_errors)} files due to errors:", *lsp_errors, sep="\n")
+
+    # ---- symbol_tags.json (list-field transform already applied per file, new entries only)
+    tags_out = out_dir / "symbol_tags.json"
+    if problem:
+        tags = merge_problem_tags(tags_out, tags, problem)
+    transform.write_symbol_tags_json(tags_out, tags)
+    print(f"Wrote {tags_out} • {len(tags)} symbols")
+
+    # ---- uses.json
+    uses_out = out_dir / "uses.json"
+    uses = write_uses(uses_out, uses, problem)
+    print(f"Wrote {uses_out} • {sum(len(v) for v in uses.values())} uses")
+
+    # ---- filtered_uses.json (joined with the in-memory symbol tags, no re-read of uses.json)
+    filtered_out = out_dir / "filtered_uses.json"
+    if filtered_uses or filtered_out.exists():
+        filtered = write_filtered_uses(filtered_out, uses, tags, problem)
+        print(f"Wrote {filtered_out} • {sum(len(v) for v in filtered.values())} uses")
+
+    # ---- expressions.json
+    expressions_out = out_dir / "expressions.json"
+    expressions = write_expressions(expressions_out, expressions, problem)
+    print(f"Wrote {expressions_out} • {sum(len(v) for v in expressions.values())} expressions")
+
+    # ---- comments-inline.json / comments-inline-symbols.json
+    comments_out = out_dir / "comments-inline.json"
+    comment_symbols_out = out_dir / "comments-inline-symbols.json"
+    comments, comment_symbols = write_comments(
+        comments_out, comment_symbols_out, comments, comment_symbols, problem
+    )
+    print(f"Wrote {comments_out} • {len(comments)} files")
+    print(f"Wrote {comment_symbols_out} • {len(comment_symbols)} comment text entries")
+
+    # ---- problems_metadata.json (reuses the already-analyzed sources)
+    metadata_out = out_dir / "problems_metadata.json"
+    if problem:
+        problem_data = extract_problem_metadata(root / "problems" / problem, sources, solution_metadata)
+        write_problems_metadata(metadata_out, {problem: problem_data} if problem_data else {}, problem=problem)
+        print(f"Wrote {metadata_out} • {problem}")
+    else:
+        all_problems = process_directory(root / "problems", "problems", sources, solution_metadata)
+        all_core = process_directory(root / "core", "core", sources, solution_metadata)
+        write_problems_metadata(metadata_out, all_problems, all_core)
+        print(f"Wrote {metadata_out} • {len(all_problems)} problems, {len(all_core)} core algorithms")
+
+    if not problem:
+        cache.prune({str(f) for f in files})
+    if owns_cache:
+        cache.save()
+        if cache.path:
+            print(f"Build cache: {cache.hits} hits, {cache.misses} misses")
+
+    return 0
+
+
+def affected_problems(root: Path, paths: set[Path]) -> set[str] | None:
+    """Problem slugs the changed files belong to; None if any file lies outside problems/<slug>/."""
+    problems_dir = (root / "problems").resolve()
+    slugs = set()
+    for path in paths:
+        try:
+            parts = path.resolve().relative_to(problems_dir).parts
+        except ValueError:
+            return None
+        if len(parts) < 2:
+            return None
+        slugs.add(parts[0])
+    return slugs
+
+
+def watch(
+    root: Path,
+    out_dir: Path,
+    uri_base: str = "",
+    transform_fields: list[str] | None = None,
+    cache_path: Path | None = DEFAULT_CACHE_PATH,
+    sync_db: bool = False,
+    lsp_ranges: bool = False,
+    filtered_uses: bool = False,
+) -> int:
+    """Build once, then regenerate the affected problems on every change until interrupted."""
+    transform_fields = transform_fields or ["intuition", "topics"]
+    cache = BuildCache(cache_path, generator_versions(_load_transform_module(), uri_base, transform_fields))
+
+    conn = None
+    if sync_db:
+        # Imported lazily: needs psycopg2/dotenv and a database
+        import sync_problems_to_db
+        conn = sync_problems_to_db.get_db_connection()
+
+    def regenerate(problem: str | None, create_optional: bool = False) -> None:
+        started = time.perf_counter()
+        status = generate_all(
+            root, out_dir, problem, uri_base, transform_fields, cache=cache,
+            lsp_ranges=create_optional and lsp_ranges, filtered_uses=create_optional and filtered_uses,
+        )
+        if status != 0 and problem:
+            # e.g. the problem directory was deleted
+            status = generate_all(root, out_dir, None, uri_base, transform_fields, cache=cache)
+        elapsed = (time.perf_counter() - started) * 1000
+        print(f"⟳ {problem or 'all'} regenerated in {elapsed:.0f} ms")
+
+        if conn is not None and problem and (root / "problems" / problem).is_dir():
+            plan, _, _ = sync_problems_to_db.pipeline_sync(conn, [root / "problems" / problem], jobs=1)
+            sync_problems_to_db.print_plan(plan)
+
+    # Optional outputs, once created, are refreshed by every later write
+    regenerate(None, create_optional=True)
+    cache.save()
+    try:
+        for paths in watch_changes(root):
+            slugs = affected_problems(root, paths)
+            for problem in sorted(slugs) if slugs is not None else [None]:
+                try:
+                    regenerate(problem)
+                except Exception as e:  # keep watching; report
+                    print(f"❌ Failed to regenerate {problem or 'all'}: {e}", file=sys.stderr)
+    except KeyboardInterrupt:
+        print("\nStopping watch")
+    finally:
+        cache.save()
+        if conn is not None:
+            conn.close()
+
+    return 0
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Generate all extracted-metadata JSON files in one pass.")
+    ap.add_argument("--root", type=Path, default=Path("backend/algorithms"),
+                    help="Root directory to scan for Python files (default: backend/algorithms)")
+    ap.add_argument("--out-dir", type=Path, default=Path("lib/extracted-metadata"),
+                    help="Output directory (default: lib/extracted-metadata)")
+    ap.add_argument("--problem", type=str,
+                    help="Specific problem slug to process (e.g., '53-maximum-subarray')")
+    ap.add_argument("--uri-base", type=str, default="",
+                    help="Base path for lsp_index URI generation (e.g., 'repo/src')")
+    ap.add_argument("--fields", nargs="+", default=["intuition", "topics"],
+                    help="symbol_tags fields to transform to nested lists (default: intuition topics)")
+    ap.add_argument("--cache", type=Path, default=DEFAULT_CACHE_PATH,
+                    help=f"Incremental build cache file (default: {DEFAULT_CACHE_PATH})")
+    ap.add_argument("--no-cache", action="store_true",
+                    help="Ignore and do not write the build cache")
+    ap.add_argument("--lsp-ranges", action="store_true",
+                    help="Also write the columnar lsp_index.ranges.json sidecar (kept up to date once it exists)")
+    ap.add_argument("--filtered-uses", action="store_true",
+                    help="Also write filtered_uses.json, the uses that have a symbol tag (kept up to date once it exists)")
+    ap.add_argument("--watch", action="store_true",
+                    help="Keep running and regenerate affected problems whenever a .py file under --root changes")
+    ap.add_argument("--sync-db", action="store_true",
+                    help="With --watch, also sync each regenerated problem to the database")
+    profiling.add_arguments(ap)
+    args = ap.parse_args()
+    with profiling.profiled(args, "generate_all_metadata"):
+        return _run(args)
+
+
+def _run(args: argparse.Namespace) -> int:
+    if not args.root.exists():
+        print(f"Error: Root directory {args.root} does not exist")
+        return 1
+
+    cache_path = None if args.no_cache else args.cache
+    if args.watch:
+        return watch(
+            args.root, args.out_dir, args.uri_base, args.fields, cache_path,
+            args.sync_db, args.lsp_ranges, args.filtered_uses,
+        )
+    return generate_all(
+        args.root, args.out_dir, args.problem, args.uri_base, args.fields, cache_path,
+        lsp_ranges=args.lsp_ranges, filtered_uses=args.filtered_uses,
+    )
+
+
+if __name__ == "__main__":
+    sys.exit(main())
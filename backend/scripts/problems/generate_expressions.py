@@ -16,56 +16,91 @@ CLI:
 """
 
 import argparse
+import ast
 import json
+import re
 import sys
 from pathlib import Path
 
 # Add current directory to Python path to import utilities
 sys.path.insert(0, str(Path(__file__).parent))
-from docstring_parser import extract_metadata
-from code_cleaner import clean_code
+from json_writer import dump_range_index, write_json
+import profiling
+from source_model import SourceFile, scan_files
 
 
-def find_expression_positions(source_lines: list[str], expr_text: str) -> list[dict]:
+def compile_expressions(expr_texts: list[str]) -> tuple[re.Pattern[str], dict[str, list[str]]]:
     """
-    Find all occurrences of an expression in source code.
-    
+    Build one matcher for a set of expressions.
+
+    The pattern is a zero-width lookahead over the alternation of all expressions,
+    longest first, so scanning a line once yields every position where some
+    expression starts, together with the longest expression starting there. The
+    shorter expressions that also match at that position are exactly the ones
+    that are prefixes of the longest, which the returned map lists per expression.
+
+    Args:
+        expr_texts: Expression texts (e.g., "hold1 = max(hold1, -p)")
+
+    Returns:
+        Tuple of (pattern, prefixes) where prefixes[expr] lists the other expressions expr starts with
+    """
+    ordered = sorted({e for e in expr_texts if e}, key=len, reverse=True)
+    pattern = re.compile("(?=(" + "|".join(map(re.escape, ordered)) + "))")
+    prefixes = {e: [p for p in ordered if len(p) < len(e) and e.startswith(p)] for e in ordered}
+    return pattern, prefixes
+
+
+def find_expression_positions(
+    source_lines: list[str],
+    expr_texts: list[str],
+    line_range: tuple[int, int] | None = None,
+) -> dict[str, list[dict]]:
+    """
+    Find all occurrences of several expressions in one pass over the source.
+
     Args:
         source_lines: List of source code lines
-        expr_text: Expression text to search for (e.g., "hold1 = max(hold1, -p)")
-    
+        expr_texts: Expression texts to search for (e.g., "hold1 = max(hold1, -p)")
+        line_range: (first, last) 0-based lines to search, inclusive; the whole source if None
+
     Returns:
-        List of position dictionaries with LSP-style ranges (0-based, consistent with generate_uses.py)
+        Expression text -> list of position dictionaries with LSP-style ranges
+        (0-based, consistent with generate_uses.py), in source order. Overlapping
+        occurrences are all reported.
     """
-    positions = []
-    
-    for line_num, line in enumerate(source_lines):
-        start_char = 0
-        while True:
-            pos = line.find(expr_text, start_char)
-            if pos == -1:
-                break
-            
-            # Create LSP-style range for the full expression
-            # Use same 0-based indexing as generate_uses.py and generate_lsp_index.py
-            position = {
-                "range": {
-                    "start": {"line": line_num, "character": pos},
-                    "end": {"line": line_num, "character": pos + len(expr_text)}
-                },
-                "nameRange": {
-                    "start": {"line": line_num, "character": pos},
-                    "end": {"line": line_num, "character": pos + len(expr_text)}
-                }
-            }
-            positions.append(position)
-            
-            # Continue searching from next character to find overlapping matches
-            start_char = pos + 1
-    
+    positions: dict[str, list[dict]] = {e: [] for e in expr_texts}
+    pattern, prefixes = compile_expressions(expr_texts)
+    if not prefixes:
+        return positions
+
+    first, last = line_range if line_range else (0, len(source_lines) - 1)
+    for line_num in range(max(first, 0), min(last, len(source_lines) - 1) + 1):
+        for match in pattern.finditer(source_lines[line_num]):
+            pos = match.start()
+            longest = match.group(1)
+            for expr_text in (longest, *prefixes[longest]):
+                # Create LSP-style range for the full expression
+                # Use same 0-based indexing as generate_uses.py and generate_lsp_index.py
+                end = pos + len(expr_text)
+                positions[expr_text].append({
+                    "range": {
+                        "start": {"line": line_num, "character": pos},
+                        "end": {"line": line_num, "character": end}
+                    },
+                    "nameRange": {
+                        "start": {"line": line_num, "character": pos},
+                        "end": {"line": line_num, "character": end}
+                    }
+                })
+
     return positions
 
 
+def _def_children(node: ast.AST) -> list[ast.AST]:
+    return [n for n in node.body if isinstance(n, (ast.ClassDef, ast.FunctionDef, ast.AsyncFunctionDef))]
+
+
 def extract_file_expressions(file_path: Path, module_name: str) -> list[dict]:
     """
     Extract all documented expressions from a Python file.
@@ -77,44 +112,70 @@ def extract_file_expressions(file_path: Path, module_name: str) -> list[dict]:
     Returns:
         List of expression entries with position and metadata
     """
+    try:
+        src = SourceFile.load(file_path)
+    except Exception as e:
+        print(f"Warning: Failed to process {file_path}: {e}")
+        return []
+    with profiling.stage("expressions"):
+        return expressions_for_source(src, module_name)
+
+
+def expressions_for_source(src: SourceFile, module_name: str | None = None) -> list[dict]:
+    """
+    Extract all documented expressions from a loaded source file.
+
+    Args:
+        src: Source file model (raw text for docstrings, cleaned text for positions)
+        module_name: Module name for qname generation (defaults to src.module)
+
+    Returns:
+        List of expression entries with position and metadata
+    """
+    module_name = module_name or src.module
     expressions = []
     
     try:
-        # Read the source code (keep raw for docstring parsing, but also get cleaned for position matching)
-        raw_code = file_path.read_text(encoding="utf-8")
-        cleaned_code = clean_code(raw_code)
-        source_lines = cleaned_code.split('\n')
+        # Cleaned lines for position matching
+        source_lines = src.cleaned_text.split('\n')
         
-        # Parse the RAW file to extract function metadata including expressions (need docstrings!)
-        import ast
-        tree = ast.parse(raw_code)
-        
-        def process_node_with_context(node, context_path=""):
+        # The RAW tree carries the function metadata including expressions (need docstrings!)
+        tree = src.tree
+
+        # The cleaned tree has the same classes/functions, with line numbers of the cleaned code
+        try:
+            cleaned_tree = src.cleaned_tree
+        except SyntaxError:
+            cleaned_tree = None
+
+        def process_node_with_context(node, cleaned_node, context_path=""):
             """Recursively process AST nodes, maintaining the full context path."""
             if isinstance(node, ast.ClassDef):
                 class_name = node.name
                 new_context = f"{context_path}.{class_name}" if context_path else class_name
-                # Process all nodes within this class
-                for child_node in node.body:
-                    process_node_with_context(child_node, new_context)
+                # Process all classes/functions within this class
+                process_children(node, cleaned_node, new_context)
 
             elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
                 function_name = node.name
                 new_context = f"{context_path}.{function_name}" if context_path else function_name
 
                 # Process docstring for this function/method
-                docstring = ast.get_docstring(node)
-                if docstring:
+                if ast.get_docstring(node):
                     # Extract metadata including expressions
-                    metadata = extract_metadata(raw_doc=docstring, node=node)
+                    metadata = src.sections(node)
 
                     # Check if this function has documented expressions
                     if 'expressions' in metadata and metadata['expressions']:
-                        # Process each documented expression
-                        for expr_text, description in metadata['expressions'].items():
-                            # Find all occurrences of this expression in the source
-                            positions = find_expression_positions(source_lines, expr_text)
+                        # Search only the function's own lines (whole file if they are unknown)
+                        line_range = None
+                        if cleaned_node is not None:
+                            line_range = (cleaned_node.lineno - 1, (cleaned_node.end_lineno or cleaned_node.lineno) - 1)
+                        all_positions = find_expression_positions(
+                            source_lines, list(metadata['expressions']), line_range
+                        )
 
+                        for expr_text, positions in all_positions.items():
                             # Create expression entries for each occurrence
                             for pos in positions:
                                 qname = f"{module_name}:{new_context}.{expr_text}"
@@ -128,16 +189,24 @@ def extract_file_expressions(file_path: Path, module_name: str) -> list[dict]:
                                 expressions.append(expression_entry)
 
                 # Process nested functions within this function
-                for child_node in node.body:
-                    if isinstance(child_node, (ast.FunctionDef, ast.AsyncFunctionDef)):
-                        process_node_with_context(child_node, new_context)
+                process_children(node, cleaned_node, new_context, functions_only=True)
+
+        def process_children(node, cleaned_node, context_path="", functions_only=False):
+            children = _def_children(node)
+            cleaned_children = _def_children(cleaned_node) if cleaned_node is not None else []
+            if len(cleaned_children) != len(children):
+                cleaned_children = []
+            for i, child_node in enumerate(children):
+                if functions_only and isinstance(child_node, ast.ClassDef):
+                    continue
+                cleaned_child = cleaned_children[i] if cleaned_children else None
+                process_node_with_context(child_node, cleaned_child, context_path)
 
         # Start processing from the root
-        for node in tree.body:
-            process_node_with_context(node)
+        process_children(tree, cleaned_tree)
     
     except Exception as e:
-        print(f"Warning: Failed to process {file_path}: {e}")
+        print(f"Warning: Failed to process {src.path}: {e}")
     
     return expressions
 
@@ -150,6 +219,26 @@ def module_name_from_path(root: Path, file_path: Path) -> str:
     return ".".join(parts)
 
 
+@profiling.timed("write:expressions")
+def write_expressions(output_path: Path, all_expressions: dict[str, list[dict]], problem: str | None = None) -> dict[str, list[dict]]:
+    """Write expressions.json (merging in single-problem mode); return the written data."""
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+
+    if problem:
+        # Single problem mode - merge with existing data
+        if output_path.exists():
+            existing_data = json.loads(output_path.read_text(encoding="utf-8"))
+            # Remove old entries for this problem
+            problem_prefix = f"problems/{problem}/"
+            existing_data = {k: v for k, v in existing_data.items() if not k.startswith(problem_prefix)}
+            # Merge with new data
+            existing_data.update(all_expressions)
+            all_expressions = existing_data
+
+    write_json(output_path, all_expressions, dump_range_index)
+    return all_expressions
+
+
 def main():
     parser = argparse.ArgumentParser(description="Generate expressions.json for expression tooltips")
     parser.add_argument("--root", default="backend/algorithms/new",
@@ -158,8 +247,13 @@ def main():
                         help="Output JSON file path")
     parser.add_argument("--problem", type=str,
                         help="Specific problem slug to process (e.g., '53-maximum-subarray')")
+    profiling.add_arguments(parser)
     args = parser.parse_args()
+    with profiling.profiled(args, "generate_expressions"):
+        return _run(args)
 
+
+def _run(args: argparse.Namespace):
     root = Path(args.root)
     if not root.exists():
         print(f"Error: Root directory {root} does not exist")
@@ -169,18 +263,9 @@ def main():
     all_expressions: dict[str, list[dict]] = {}
     total_expressions = 0
 
-    for py_file in root.rglob("*.py"):
-        if not py_file.is_file():
-            continue
-
-        # Skip hidden directories and __pycache__
-        if any(part.startswith('.') or part == '__pycache__' for part in py_file.parts):
-            continue
-
-        # Filter to specific problem if provided
-        if args.problem and f"problems/{args.problem}/" not in str(py_file):
-            continue
-        
+    # Only the given problem (and the core modules it imports) is scanned when provided
+    root = root.resolve()
+    for py_file in profiling.iter_files(scan_files(root, args.problem)):
         # Generate module name and extract expressions
         module_name = module_name_from_path(root, py_file)
         file_expressions = extract_file_expressions(py_file, module_name)
@@ -193,50 +278,7 @@ def main():
     
     # Write output file
     output_path = Path(args.out)
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-
-    if args.problem:
-        # Single problem mode - merge with existing data
-        if output_path.exists():
-            existing_data = json.loads(output_path.read_text(encoding="utf-8"))
-            # Remove old entries for this problem
-            problem_prefix = f"problems/{args.problem}/"
-            existing_data = {k: v for k, v in existing_data.items() if not k.startswith(problem_prefix)}
-            # Merge with new data
-            existing_data.update(all_expressions)
-            all_expressions = existing_data
-
-    # Use compact JSON formatting similar to generate_uses.py
-    def compact_json(obj, indent=0):
-        if isinstance(obj, dict):
-            if "range" in obj and "qname" in obj:  # Expression entry
-                range_obj = obj["range"]
-                name_range_obj = obj["nameRange"]
-                start = range_obj["start"]
-                end = range_obj["end"]
-                name_start = name_range_obj["start"]
-                name_end = name_range_obj["end"]
-                qname = json.dumps(obj["qname"])
-                kind = json.dumps(obj["kind"])
-                return f'{{"range": {{"start": {{"line": {start["line"]}, "character": {start["character"]}}}, "end": {{"line": {end["line"]}, "character": {end["character"]}}}}}, "nameRange": {{"start": {{"line": {name_start["line"]}, "character": {name_start["character"]}}}, "end": {{"line": {name_end["line"]}, "character": {name_end["character"]}}}}}, "qname": {qname}, "kind": {kind}}}'
-            else:
-                items = []
-                for k, v in obj.items():
-                    key = json.dumps(k)
-                    if isinstance(v, list) and all(isinstance(item, dict) and "range" in item for item in v):
-                        # List of expression objects
-                        expr_items = [compact_json(item, 0) for item in v]
-                        expr_str = "[\n" + ",\n".join(f"    {item}" for item in expr_items) + "\n  ]"
-                        items.append(f"  {key}: {expr_str}")
-                    else:
-                        items.append(f"  {key}: {compact_json(v, indent + 2)}")
-                return "{\n" + ",\n".join(items) + "\n}"
-        elif isinstance(obj, list):
-            return "[" + ", ".join(compact_json(item, indent) for item in obj) + "]"
-        else:
-            return json.dumps(obj, ensure_ascii=False)
-    
-    output_path.write_text(compact_json(all_expressions), encoding="utf-8")
+    all_expressions = write_expressions(output_path, all_expressions, args.problem)
     print(f"\nWrote {output_path} • {total_expressions} expressions from {len(all_expressions)} files")
     
     return 0
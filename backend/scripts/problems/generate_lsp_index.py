@@ -19,18 +19,37 @@ Rules:
 - detail: "name(arg: Type, ...) -> Ret" for defs; "class Name" for classes.
 - children: nested functions within functions; methods (and nested) within classes.
 - selectionRange: spans just the identifier token in the header (found by scanning the header line).
+
+Optional columnar sidecar (--ranges-out, default lsp_index.ranges.json next to --out):
+{
+  "format": 1,
+  "uris": [uri, ...],
+  "offsets": b64 int32[len(uris) + 1],  # document d owns symbols offsets[d]..offsets[d+1]-1
+  "names": [name, ...],                  # every symbol, depth-first (parent before children)
+  "kinds": b64 int32[n],
+  "parents": b64 int32[n],               # index of the enclosing symbol, -1 at top level
+  "ranges": b64 int32[4n],               # start line, start char, end line, end char
+  "nameRanges": b64 int32[4n]
+}
+Integer columns are little-endian int32 arrays, base64-encoded. Within a document
+symbols are sorted by start position, so a tool can binary-search ranges without
+parsing the nested JSON. Nothing in the app reads it yet; once the sidecar
+exists it is kept up to date by every later write.
 """
 
 import argparse
 import ast
+import base64
 import json
-import re
 import sys
+from array import array
 from pathlib import Path
 
 # Add the current directory to Python path to import code_cleaner
 sys.path.insert(0, str(Path(__file__).parent))
-from code_cleaner import clean_code
+import profiling
+from json_writer import dump_lsp_index, write_json
+from source_model import SourceFile, scan_files
 
 try:
     from lsprotocol.types import SymbolKind
@@ -293,17 +312,16 @@ def _symbol_entry(node: ast.AST, cleaned_text_lines: list[str], parent_is_class:
     return entry
 
 def build_document_symbols(py_path: Path, scan_root: Path, uri_base: str = "") -> dict:
-    # Read and clean the code using the same logic as other scripts
-    raw_text = py_path.read_text(encoding="utf-8")
-    cleaned_text = clean_code(raw_text)
-    
-    # Use cleaned text lines for consistent positioning
-    cleaned_text_lines = cleaned_text.splitlines()
+    return document_symbols(SourceFile.load(py_path, scan_root), uri_base)
+
+def document_symbols(src: SourceFile, uri_base: str = "") -> dict:
+    # Use cleaned text lines for consistent positioning (same cleaning as other scripts)
+    cleaned_text_lines = src.cleaned_text.splitlines()
     
     try:
-        tree = ast.parse(cleaned_text)
+        tree = src.cleaned_tree
     except SyntaxError as e:
-        raise RuntimeError(f"Syntax error in {py_path}: {e}") from e
+        raise RuntimeError(f"Syntax error in {src.path}: {e}") from e
     # Ensure end_lineno/end_col_offset are available
     ast.increment_lineno(tree, n=0)  # no-op; ensures attributes are set on some Python versions
 
@@ -318,13 +336,114 @@ def build_document_symbols(py_path: Path, scan_root: Path, uri_base: str = "") -
     # Sort by position for stability
     top_symbols.sort(key=lambda s: (s["range"]["start"]["line"], s["range"]["start"]["character"]))
     return {
-        "uri": file_uri(py_path, scan_root, uri_base),
+        "uri": file_uri(src.path, src.root, uri_base),
         "symbols": top_symbols,
     }
 
 def iter_python_files(root: Path) -> list[Path]:
     return [p for p in root.rglob("*.py") if p.is_file() and "__pycache__" not in p.parts and not any(part.startswith(".") for part in p.parts)]
 
+# -- Columnar sidecar ----------------------------------------------------------
+
+RANGES_FORMAT = 1
+
+
+def ranges_path(out: Path) -> Path:
+    """Default sidecar path: lsp_index.json -> lsp_index.ranges.json."""
+    return out.with_suffix(".ranges.json")
+
+
+def _b64_int32(values: list[int]) -> str:
+    packed = array("i", values)
+    if sys.byteorder == "big":
+        packed.byteswap()
+    return base64.b64encode(packed.tobytes()).decode("ascii")
+
+
+def encode_ranges(documents: list[dict]) -> dict:
+    """Flatten the documents' symbol trees into the columnar sidecar layout."""
+    offsets = [0]
+    names: list[str] = []
+    kinds: list[int] = []
+    parents: list[int] = []
+    ranges: list[int] = []
+    name_ranges: list[int] = []
+
+    def add(symbols: list[dict], parent: int) -> None:
+        for sym in symbols:
+            index = len(names)
+            names.append(sym["name"])
+            kinds.append(sym["kind"])
+            parents.append(parent)
+            for column, rng in ((ranges, sym["range"]), (name_ranges, sym["nameRange"])):
+                column += (rng["start"]["line"], rng["start"]["character"], rng["end"]["line"], rng["end"]["character"])
+            add(sym["children"], index)
+
+    for doc in documents:
+        add(doc["symbols"], -1)
+        offsets.append(len(names))
+
+    return {
+        "format": RANGES_FORMAT,
+        "uris": [doc["uri"] for doc in documents],
+        "offsets": _b64_int32(offsets),
+        "names": names,
+        "kinds": _b64_int32(kinds),
+        "parents": _b64_int32(parents),
+        "ranges": _b64_int32(ranges),
+        "nameRanges": _b64_int32(name_ranges),
+    }
+
+
+@profiling.timed("write:lsp_index")
+def write_lsp_index(
+    out: Path,
+    documents: list[dict],
+    problem: str | None = None,
+    ranges_out: Path | None = None,
+) -> list[dict]:
+    """Write lsp_index.json (merging into the existing file in single-problem mode); return all documents.
+
+    The columnar sidecar is written to ranges_out when given, and otherwise
+    refreshed if it already exists at its default path.
+    """
+    # Ensure output directory exists
+    out.parent.mkdir(parents=True, exist_ok=True)
+
+    if problem:
+        # Single problem mode - merge with existing data
+        existing_documents = []
+        if out.exists():
+            existing_data = json.loads(out.read_text(encoding="utf-8"))
+            existing_documents = existing_data.get("documents", [])
+
+        # Filter out old documents for this problem (and any re-generated core modules it imports)
+        problem_prefix = f"problems/{problem}/"
+        new_uris = {d["uri"] for d in documents}
+        existing_documents = [
+            d for d in existing_documents
+            if problem_prefix not in d["uri"] and d["uri"] not in new_uris
+        ]
+
+        # Add new documents
+        documents = existing_documents + documents
+
+    # Sort documents by URI
+    documents.sort(key=lambda d: d["uri"])
+
+    payload = {"documents": documents}
+
+    # indent=2 JSON with range objects on one line, written as it is generated
+    # (ASCII-escaped to properly escape backslashes and avoid SyntaxWarnings)
+    write_json(out, payload, dump_lsp_index)
+
+    if ranges_out is None and ranges_path(out).exists():
+        ranges_out = ranges_path(out)
+    if ranges_out is not None:
+        ranges_out.parent.mkdir(parents=True, exist_ok=True)
+        ranges_out.write_text(json.dumps(encode_ranges(documents), indent=2) + "\n", encoding="utf-8")
+    return documents
+
 def main() -> None:
     # Calculate project root relative to script location
     project_root = Path(__file__).resolve().parent.parent.parent.parent
@@ -336,61 +455,39 @@ def main() -> None:
     ap.add_argument("--out", type=Path, default=default_output, help=f"Output JSON path (default: {default_output})")
     ap.add_argument("--uri-base", type=str, default="", help="Base path for URI generation (e.g., 'repo/src')")
     ap.add_argument("--problem", type=str, help="Specific problem slug to process (e.g., '53-maximum-subarray')")
+    ap.add_argument("--ranges", action="store_true",
+                    help="Also write the columnar range sidecar (lsp_index.ranges.json next to --out)")
+    ap.add_argument("--ranges-out", type=Path, help="Columnar range sidecar path (implies --ranges)")
+    profiling.add_arguments(ap)
     args = ap.parse_args()
+    with profiling.profiled(args, "generate_lsp_index"):
+        return _run(args)
 
+
+def _run(args: argparse.Namespace) -> None:
     if args.problem:
         # Single problem mode - only process files in that problem's directory
+        # (plus the core modules it imports)
         problem_dir = args.root / "problems" / args.problem
         if not problem_dir.exists():
             print(f"Error: Problem directory not found: {problem_dir}")
             return
-        files = iter_python_files(problem_dir)
+        files = scan_files(args.root, args.problem)
     else:
         files = iter_python_files(args.root)
     documents: list[dict] = []
     errors: list[str] = []
 
-    for f in files:
+    for f in profiling.iter_files(files):
         try:
-            doc = build_document_symbols(f, args.root, args.uri_base)
-            documents.append(doc)
+            src = SourceFile.load(f, args.root)
+            with profiling.stage("lsp_index"):
+                documents.append(document_symbols(src, args.uri_base))
         except Exception as e:
             errors.append(f"{f}: {e}")
 
-    # Ensure output directory exists
-    args.out.parent.mkdir(parents=True, exist_ok=True)
-
-    if args.problem:
-        # Single problem mode - merge with existing data
-        existing_documents = []
-        if args.out.exists():
-            existing_data = json.loads(args.out.read_text(encoding="utf-8"))
-            existing_documents = existing_data.get("documents", [])
-
-        # Filter out old documents for this problem
-        problem_prefix = f"problems/{args.problem}/"
-        existing_documents = [d for d in existing_documents if problem_prefix not in d["uri"]]
-
-        # Add new documents
-        documents = existing_documents + documents
-
-    # Sort documents by URI
-    documents.sort(key=lambda d: d["uri"])
-
-    payload = {"documents": documents}
-
-    # Custom JSON formatting for compact ranges
-    # Use ensure_ascii=True to properly escape backslashes and avoid SyntaxWarnings
-    json_str = json.dumps(payload, ensure_ascii=True, indent=2)
-    
-    # Make range and selectionRange objects single-line
-    json_str = re.sub(
-        r'"(range|selectionRange)":\s*{\s*\n\s*"start":\s*{\s*\n\s*"line":\s*(\d+),\s*\n\s*"character":\s*(\d+)\s*\n\s*},\s*\n\s*"end":\s*{\s*\n\s*"line":\s*(\d+),\s*\n\s*"character":\s*(\d+)\s*\n\s*}\s*\n\s*}', 
-        r'"\1": {"start": {"line": \2, "character": \3}, "end": {"line": \4, "character": \5}}', 
-        json_str
-    )
-    
-    args.out.write_text(json_str, encoding="utf-8")
+    ranges_out = args.ranges_out or (ranges_path(args.out) if args.ranges else None)
+    documents = write_lsp_index(args.out, documents, args.problem, ranges_out)
 
     # Simple summary to stderr/stdout
     print(f"Wrote {args.out} • {len(documents)} documents, {sum(len(d['symbols']) for d in documents)} top-level symbols.")
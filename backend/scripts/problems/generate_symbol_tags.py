@@ -22,42 +22,21 @@ import argparse
 import ast
 import json
 import sys
+from functools import partial
 from pathlib import Path
 
-# Import shared docstring parsing utilities
-from docstring_parser import extract_metadata
+# Import shared cleaning and per-file source model
 from code_cleaner import clean_code
+from json_writer import dump_sorted_compact, write_json
+from parallel import parallel_map
+import profiling
+from source_model import SourceFile, scan_files
 
 # ---------- Defaults ----------
 DEFAULT_ROOT: Path = Path("../../algorithms/new")
 DEFAULT_OUT: Path = Path("../../lib/extracted-metadata/symbol_tags.json")
 
 
-# ---------- Filesystem ----------
-
-def iter_py(root: Path) -> list[Path]:
-    """All .py files under root (skip hidden dirs and __pycache__)."""
-    root = root.resolve()
-    out: list[Path] = []
-    for p in root.rglob("*.py"):
-        if not p.is_file():
-            continue
-        parts = p.parts
-        if "__pycache__" in parts or any(seg.startswith(".") for seg in parts):
-            continue
-        out.append(p)
-    return out
-
-
-def module_name(root: Path, file: Path) -> str:
-    """Derive dotted module name from path relative to root."""
-    rel = file.resolve().relative_to(root.resolve())
-    pieces = list(rel.parts)
-    if pieces[-1].endswith(".py"):
-        pieces[-1] = pieces[-1][:-3]
-    return ".".join(pieces)
-
-
 # ---------- Signature extraction ----------
 
 def _extract_function_signature(node: ast.FunctionDef | ast.AsyncFunctionDef) -> str:
@@ -118,234 +97,236 @@ def extract_name_from_qname(qname: str) -> str:
     """Extract the name from qname (everything after the last '.' or ':')"""
     return qname.split(':')[-1].split('.')[-1] if ':' in qname or '.' in qname else qname
 
-def build_symbol_tags(root: Path, problem: str | None = None) -> dict[str, dict[str, object]]:
+def build_symbol_tags(root: Path, problem: str | None = None, jobs: int = 1) -> dict[str, dict[str, object]]:
+    # Only the given problem (and the core modules it imports) is scanned when provided
+    files = scan_files(root, problem)
+
     tags: dict[str, dict[str, object]] = {}
+    # Merge in file order so results don't depend on worker scheduling
+    for file_tags in parallel_map(partial(_symbol_tags_for_path, root), files, jobs):
+        tags.update(file_tags)
+    return tags
 
-    for f in iter_py(root):
-        # Filter to specific problem if provided
-        if problem and f"problems/{problem}/" not in str(f):
-            continue
-        try:
-            text = f.read_text(encoding="utf-8")
-            tree = ast.parse(text)
-        except Exception as e:  # keep going; report
-            print(f"[warn] skipping {f}: {e}", file=sys.stderr)
+
+def _symbol_tags_for_path(root: Path, f: Path) -> dict[str, dict[str, object]]:
+    try:
+        src = SourceFile.load(f, root)
+        with profiling.stage("symbol_tags"):
+            return symbol_tags_for_file(src)
+    except Exception as e:  # keep going; report
+        print(f"[warn] skipping {f}: {e}", file=sys.stderr)
+        return {}
+
+
+def symbol_tags_for_file(src: SourceFile) -> dict[str, dict[str, object]]:
+    """Symbol tag entries for a single file (raises SyntaxError if it does not parse)."""
+    tags: dict[str, dict[str, object]] = {}
+    text = src.text
+
+    for qname, node, is_method in walk_symbols(src.module, src.tree):
+        # Skip entries with no docstring
+        if not (ast.get_docstring(node, clean=True) or "").strip():
             continue
 
-        mod = module_name(root, f)
-        for qname, node, is_method in walk_symbols(mod, tree):
-            raw = ast.get_docstring(node, clean=True) or ""
-            
-            # Skip entries with no docstring
-            if not raw.strip():
-                continue
-                
-            meta = extract_metadata(raw, node)
+        meta = src.sections(node)
 
-            # Process the main symbol entry
-            main_entry = dict(meta) if meta else {}
-            
-            # Convert returns "documentation" field to "summary" for consistency
-            if "returns" in main_entry and isinstance(main_entry["returns"], dict):
-                returns_data = main_entry["returns"]
-                if "documentation" in returns_data:
-                    returns_data["summary"] = returns_data.pop("documentation")
-            
-            # Add name field extracted from qname
-            main_entry["name"] = extract_name_from_qname(qname)
-            
-            # Add kind field based on AST node type
-            if isinstance(node, ast.ClassDef):
-                main_entry["kind"] = "class"
-            elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
-                # Use the is_method flag from walk_symbols which tracks class context
-                main_entry["kind"] = "method" if is_method else "function"
-                
-                # Extract function signature
-                signature = _extract_function_signature(node)
-                if signature:
-                    main_entry["label"] = signature
-            
-            # Extract variables and args for flattening
-            variables_dict = meta.get("variables", {}) if meta else {}
-            args_dict = meta.get("args", {}) if meta else {}
+        # Process the main symbol entry
+        main_entry = dict(meta) if meta else {}
+        
+        # Convert returns "documentation" field to "summary" for consistency
+        if "returns" in main_entry and isinstance(main_entry["returns"], dict):
+            returns_data = main_entry["returns"]
+            if "documentation" in returns_data:
+                returns_data["summary"] = returns_data.pop("documentation")
+        
+        # Add name field extracted from qname
+        main_entry["name"] = extract_name_from_qname(qname)
+        
+        # Add kind field based on AST node type
+        if isinstance(node, ast.ClassDef):
+            main_entry["kind"] = "class"
+        elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            # Use the is_method flag from walk_symbols which tracks class context
+            main_entry["kind"] = "method" if is_method else "function"
             
-            # If no args from docstring but this is a function, extract parameters from AST
-            if not args_dict and isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
-                args_dict = {}
-                for arg in node.args.args:
-                    param_name = arg.arg
-                    arg_info = {}
-                    if arg.annotation:
-                        arg_info["label"] = ast.unparse(arg.annotation)
-                    # Don't add documentation field if it would be None/null
-                    args_dict[param_name] = arg_info
+            # Extract function signature
+            signature = _extract_function_signature(node)
+            if signature:
+                main_entry["label"] = signature
+        
+        # Extract variables and args for flattening
+        variables_dict = meta.get("variables", {}) if meta else {}
+        args_dict = meta.get("args", {}) if meta else {}
+        
+        # If no args from docstring but this is a function, extract parameters from AST
+        if not args_dict and isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            args_dict = {}
+            for arg in node.args.args:
+                param_name = arg.arg
+                arg_info = {}
+                if arg.annotation:
+                    arg_info["label"] = ast.unparse(arg.annotation)
+                # Don't add documentation field if it would be None/null
+                args_dict[param_name] = arg_info
+        
+        # Convert variables dict to list of names for parent reference
+        if variables_dict:
+            main_entry["variables"] = list(variables_dict.keys())
+        
+        # Convert args dict to list of names for parent reference  
+        if args_dict:
+            main_entry["args"] = list(args_dict.keys())
+        
+        # Extract and clean code for functions and classes  
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            # Extract only the specific function/class code, not the entire file
+            lines = text.splitlines()
+            start_line = node.lineno - 1  # AST line numbers are 1-based
+            end_line = node.end_lineno if node.end_lineno else len(lines)
             
-            # Convert variables dict to list of names for parent reference
-            if variables_dict:
-                main_entry["variables"] = list(variables_dict.keys())
+            # Extract just the function/class definition
+            function_lines = lines[start_line:end_line]
+            function_code = '\n'.join(function_lines)
             
-            # Convert args dict to list of names for parent reference  
-            if args_dict:
-                main_entry["args"] = list(args_dict.keys())
+            # Clean the extracted code (remove docstrings, etc.)
+            cleaned_function_code = clean_code(function_code)
+            main_entry["code"] = cleaned_function_code
             
-            # Extract and clean code for functions and classes  
-            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
-                # Extract only the specific function/class code, not the entire file
-                lines = text.splitlines()
-                start_line = node.lineno - 1  # AST line numbers are 1-based
-                end_line = node.end_lineno if node.end_lineno else len(lines)
-                
-                # Extract just the function/class definition
-                function_lines = lines[start_line:end_line]
-                function_code = '\n'.join(function_lines)
+            # Calculate relative file path (same approach as extract_problems_metadata.py)
+            try:
+                relative_file_path = str(src.path.relative_to(Path.cwd()))
+            except ValueError:
+                relative_file_path = str(src.path)
+            main_entry["file_path"] = relative_file_path
+        
+        tags[qname] = main_entry
+        
+        # Create individual entries for variables (only if they exist)
+        if isinstance(variables_dict, dict):
+            for var_name, var_desc in variables_dict.items():
+                var_qname = f"{qname}.{var_name}"
+                tags[var_qname] = {
+                    "name": extract_name_from_qname(var_qname),
+                    "summary": var_desc,
+                    "kind": "variable"
+                }
+        
+        # Create individual entries for args/parameters (only if they have documentation)
+        if isinstance(args_dict, dict):
+            for arg_name, arg_info in args_dict.items():
+                arg_qname = f"{qname}.{arg_name}"
+                arg_entry = {
+                    "name": extract_name_from_qname(arg_qname),
+                    "kind": "parameter"
+                }
                 
-                # Clean the extracted code (remove docstrings, etc.)
-                cleaned_function_code = clean_code(function_code)
-                main_entry["code"] = cleaned_function_code
+                has_documentation = False
                 
-                # Calculate relative file path (same approach as extract_problems_metadata.py)
-                try:
-                    relative_file_path = str(f.relative_to(Path.cwd()))
-                except ValueError:
-                    relative_file_path = str(f)
-                main_entry["file_path"] = relative_file_path
-            
-            tags[qname] = main_entry
-            
-            # Create individual entries for variables (only if they exist)
-            if isinstance(variables_dict, dict):
-                for var_name, var_desc in variables_dict.items():
-                    var_qname = f"{qname}.{var_name}"
-                    tags[var_qname] = {
-                        "name": extract_name_from_qname(var_qname),
-                        "summary": var_desc,
-                        "kind": "variable"
-                    }
-            
-            # Create individual entries for args/parameters (only if they have documentation)
-            if isinstance(args_dict, dict):
-                for arg_name, arg_info in args_dict.items():
-                    arg_qname = f"{qname}.{arg_name}"
-                    arg_entry = {
-                        "name": extract_name_from_qname(arg_qname),
-                        "kind": "parameter"
-                    }
-                    
-                    has_documentation = False
-                    
-                    if isinstance(arg_info, dict):
-                        # Create LSP-style label: "name: type"
-                        if "label" in arg_info and arg_info["label"] is not None:
-                            arg_entry["label"] = f"{arg_name}: {arg_info['label']}"
-                        else:
-                            # No type annotation, just name
-                            arg_entry["label"] = arg_name
-                        if "documentation" in arg_info and arg_info["documentation"] is not None:
-                            arg_entry["summary"] = arg_info["documentation"]
-                            has_documentation = True
-                    elif isinstance(arg_info, str):
-                        # Simple string description, no type
+                if isinstance(arg_info, dict):
+                    # Create LSP-style label: "name: type"
+                    if "label" in arg_info and arg_info["label"] is not None:
+                        arg_entry["label"] = f"{arg_name}: {arg_info['label']}"
+                    else:
+                        # No type annotation, just name
                         arg_entry["label"] = arg_name
-                        arg_entry["summary"] = arg_info
+                    if "documentation" in arg_info and arg_info["documentation"] is not None:
+                        arg_entry["summary"] = arg_info["documentation"]
                         has_documentation = True
-                    
-                    # Only add parameter entries that have documentation
-                    if has_documentation:
-                        tags[arg_qname] = arg_entry
-            
-            # Create individual entries for expressions (only if they exist)
-            expressions_dict = meta.get("expressions")
-            if isinstance(expressions_dict, dict):
-                for expr_text, expr_desc in expressions_dict.items():
-                    expr_qname = f"{qname}.{expr_text}"
-                    tags[expr_qname] = {
-                        "name": expr_text,
-                        "summary": expr_desc,
-                        "kind": "expression"
+                elif isinstance(arg_info, str):
+                    # Simple string description, no type
+                    arg_entry["label"] = arg_name
+                    arg_entry["summary"] = arg_info
+                    has_documentation = True
+                
+                # Only add parameter entries that have documentation
+                if has_documentation:
+                    tags[arg_qname] = arg_entry
+        
+        # Create individual entries for expressions (only if they exist)
+        expressions_dict = meta.get("expressions")
+        if isinstance(expressions_dict, dict):
+            for expr_text, expr_desc in expressions_dict.items():
+                expr_qname = f"{qname}.{expr_text}"
+                tags[expr_qname] = {
+                    "name": expr_text,
+                    "summary": expr_desc,
+                    "kind": "expression"
+                }
+
+        # Create individual entries for instance attributes
+        # Can appear in class docstrings or __init__ docstrings
+        instance_attrs_dict = meta.get("instance_attributes")
+        if isinstance(instance_attrs_dict, dict):
+            # Strip "self." prefix from keys and add to parent entry
+            cleaned_attrs = {}
+            for attr_name, attr_desc in instance_attrs_dict.items():
+                # Strip "self." prefix if present
+                clean_name = attr_name[5:] if attr_name.startswith("self.") else attr_name
+                cleaned_attrs[clean_name] = attr_desc
+
+            if cleaned_attrs:
+                main_entry["instance_attributes"] = list(cleaned_attrs.keys())
+
+                # Determine the base qname for attributes
+                # If this is __init__, use parent class qname; otherwise use current qname
+                if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)) and node.name == "__init__":
+                    # qname is "mod:Class.__init__" -> base is "mod:Class"
+                    attr_base_qname = qname.rsplit(".", 1)[0] if "." in qname.split(":")[-1] else qname
+                else:
+                    attr_base_qname = qname
+
+                # Create individual entries for each attribute
+                for attr_name, attr_desc in cleaned_attrs.items():
+                    attr_qname = f"{attr_base_qname}.{attr_name}"
+                    tags[attr_qname] = {
+                        "name": attr_name,
+                        "summary": attr_desc,
+                        "kind": "attribute"
+                    }
+
+        # Create individual entries for class attributes (only for classes)
+        class_attrs_dict = meta.get("class_attributes")
+        if isinstance(class_attrs_dict, dict) and isinstance(node, ast.ClassDef):
+            if class_attrs_dict:
+                main_entry["class_attributes"] = list(class_attrs_dict.keys())
+
+                # Create individual entries for each class attribute
+                for attr_name, attr_desc in class_attrs_dict.items():
+                    attr_qname = f"{qname}.{attr_name}"
+                    tags[attr_qname] = {
+                        "name": attr_name,
+                        "summary": attr_desc,
+                        "kind": "class_attribute"
                     }
 
-            # Create individual entries for instance attributes
-            # Can appear in class docstrings or __init__ docstrings
-            instance_attrs_dict = meta.get("instance_attributes")
-            if isinstance(instance_attrs_dict, dict):
-                # Strip "self." prefix from keys and add to parent entry
-                cleaned_attrs = {}
-                for attr_name, attr_desc in instance_attrs_dict.items():
-                    # Strip "self." prefix if present
-                    clean_name = attr_name[5:] if attr_name.startswith("self.") else attr_name
-                    cleaned_attrs[clean_name] = attr_desc
-
-                if cleaned_attrs:
-                    main_entry["instance_attributes"] = list(cleaned_attrs.keys())
-
-                    # Determine the base qname for attributes
-                    # If this is __init__, use parent class qname; otherwise use current qname
-                    if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)) and node.name == "__init__":
-                        # qname is "mod:Class.__init__" -> base is "mod:Class"
-                        attr_base_qname = qname.rsplit(".", 1)[0] if "." in qname.split(":")[-1] else qname
-                    else:
-                        attr_base_qname = qname
-
-                    # Create individual entries for each attribute
-                    for attr_name, attr_desc in cleaned_attrs.items():
-                        attr_qname = f"{attr_base_qname}.{attr_name}"
-                        tags[attr_qname] = {
-                            "name": attr_name,
-                            "summary": attr_desc,
-                            "kind": "attribute"
-                        }
-
-            # Create individual entries for class attributes (only for classes)
-            class_attrs_dict = meta.get("class_attributes")
-            if isinstance(class_attrs_dict, dict) and isinstance(node, ast.ClassDef):
-                if class_attrs_dict:
-                    main_entry["class_attributes"] = list(class_attrs_dict.keys())
-
-                    # Create individual entries for each class attribute
-                    for attr_name, attr_desc in class_attrs_dict.items():
-                        attr_qname = f"{qname}.{attr_name}"
-                        tags[attr_qname] = {
-                            "name": attr_name,
-                            "summary": attr_desc,
-                            "kind": "class_attribute"
-                        }
 
     return tags
 
 
 # ---------- Main ----------
 
-def format_json_compact_arrays(data: dict[str, dict[str, object]]) -> str:
-    """Format JSON with compact arrays and simple objects but indented complex objects."""
-    # First format with standard indentation
-    formatted = json.dumps(data, ensure_ascii=False, indent=2, sort_keys=True)
-    
-    import re
-    
-    # Replace multi-line arrays with single-line arrays
-    # Pattern to match arrays like: [\n      "item1",\n      "item2"\n    ]
-    array_pattern = r'\[\n\s*(".*?"(?:,\n\s*".*?")*)\n\s*\]'
-    
-    def compact_array(match):
-        content = match.group(1)
-        # Remove newlines and extra spaces, keep items comma-separated
-        items = re.findall(r'".*?"', content)
-        return '[' + ', '.join(items) + ']'
-    
-    formatted = re.sub(array_pattern, compact_array, formatted)
-    
-    # Replace simple single-property objects with single-line objects
-    # Pattern to match objects like: {\n      "key": "value"\n    }
-    simple_object_pattern = r'\{\n\s*(".*?"):\s*(".*?")\n\s*\}'
-    formatted = re.sub(simple_object_pattern, r'{\1: \2}', formatted)
-    
-    # Also handle objects with non-string values like numbers, booleans
-    # Pattern to match objects like: {\n      "key": value\n    } where value is not a string
-    simple_object_non_string_pattern = r'\{\n\s*(".*?"):\s*([^"\n\{\[]+)\n\s*\}'
-    formatted = re.sub(simple_object_non_string_pattern, r'{\1: \2}', formatted)
-    
-    return formatted
+def merge_problem_tags(out: Path, data: dict[str, dict[str, object]], problem: str) -> dict[str, dict[str, object]]:
+    """Replace one problem's entries in the existing output with freshly built ones."""
+    if not out.exists():
+        return data
+    existing_data = json.loads(out.read_text(encoding="utf-8"))
+    # Remove old entries for this problem
+    problem_prefix = f"problems.{problem}."
+    existing_data = {k: v for k, v in existing_data.items() if not k.startswith(problem_prefix)}
+    # Merge with new data
+    existing_data.update(data)
+    return existing_data
+
+
+@profiling.timed("write:symbol_tags")
+def write_symbol_tags(out: Path, data: dict[str, dict[str, object]], problem: str | None = None) -> dict[str, dict[str, object]]:
+    """Write symbol_tags.json (merging in single-problem mode); return the written data."""
+    if problem:
+        # Single problem mode - merge with existing data
+        data = merge_problem_tags(out, data, problem)
+
+    write_json(out, data, dump_sorted_compact)
+    return data
 
 
 def main() -> None:
@@ -353,24 +334,16 @@ def main() -> None:
     ap.add_argument("--root", type=Path, default=DEFAULT_ROOT, help=f"Workspace root (default: {DEFAULT_ROOT})")
     ap.add_argument("--out", type=Path, default=DEFAULT_OUT, help=f"Output JSON path (default: {DEFAULT_OUT})")
     ap.add_argument("--problem", type=str, help="Specific problem slug to process (e.g., '53-maximum-subarray')")
+    ap.add_argument("--jobs", "-j", type=int, default=1, help="Worker processes for per-file extraction (0 = one per CPU)")
+    profiling.add_arguments(ap)
     args = ap.parse_args()
+    with profiling.profiled(args, "generate_symbol_tags"):
+        return _run(args)
 
-    data = build_symbol_tags(args.root, args.problem)
 
-    if args.problem:
-        # Single problem mode - merge with existing data
-        if args.out.exists():
-            import json
-            existing_data = json.loads(args.out.read_text(encoding="utf-8"))
-            # Remove old entries for this problem
-            problem_prefix = f"problems.{args.problem}."
-            existing_data = {k: v for k, v in existing_data.items() if not k.startswith(problem_prefix)}
-            # Merge with new data
-            existing_data.update(data)
-            data = existing_data
-
-    formatted_json = format_json_compact_arrays(data)
-    args.out.write_text(formatted_json, encoding="utf-8")
+def _run(args: argparse.Namespace) -> None:
+    data = build_symbol_tags(args.root, args.problem, args.jobs)
+    data = write_symbol_tags(args.out, data, args.problem)
     print(f"Wrote {args.out} • {len(data)} symbols")
 
 
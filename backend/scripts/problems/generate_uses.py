@@ -3,11 +3,16 @@
 
 import argparse, ast, json, sys
 from dataclasses import dataclass
+from functools import partial
 from pathlib import Path
 
 # Add the current directory to Python path to import code_cleaner
 sys.path.insert(0, str(Path(__file__).parent))
-from code_cleaner import clean_code
+import profiling
+from json_writer import dump_range_index, write_json
+from parallel import parallel_map
+from shards import write_sharded_index
+from source_model import ModuleGraph, SourceFile, module_graph, scan_files
 
 # ---------- LSP range ----------
 def lsp_range(n: ast.AST) -> dict:
@@ -91,11 +96,13 @@ class Scope:
 
 # ---------- Resolver ----------
 class Uses(ast.NodeVisitor):
-    def __init__(self, modname: str):
+    def __init__(self, modname: str, graph: ModuleGraph | None = None):
         self.mod = modname
+        self.graph = graph  # workspace modules for import resolution (None: imports kept as written)
         self.scopes: list[Scope] = [Scope(modname)]
         self.uses: list[dict] = []
         self.sys_path_additions: list[str] = []  # Track dynamic sys.path additions
+        self.consulted: set[str] = set()  # Workspace modules whose exports decided a binding
 
     # scope helpers
     @property
@@ -188,41 +195,20 @@ class Uses(ast.NodeVisitor):
                         # This represents a relative path from the current file
                         relative_parts = path_parts[1:]  # Skip __file__
                         path_str = "/".join(relative_parts)
-                        print(f"DEBUG: Found sys.path addition: {path_str} in module {self.mod}")  # Debug output
                         self.sys_path_additions.append(path_str)
 
-    def _resolve_full_module_path(self, module_name: str) -> str:
-        """Convert a potentially relative module name to a fully qualified path"""
-        print(f"DEBUG: Resolving module '{module_name}' in context '{self.mod}' with sys_path_additions: {self.sys_path_additions}")  # Debug
-        if module_name == "solution":
-            # Check if we have sys.path modifications that might affect this
-            for path_addition in self.sys_path_additions:
-                if path_addition:  # Non-empty path addition
-                    # Convert the path addition to a module path
-                    # e.g., "../325-maximum-size-subarray-sum-equals-k" -> "problems.325-maximum-size-subarray-sum-equals-k"
-                    current_parts = self.mod.split(".")
-                    if path_addition.startswith("../"):
-                        # Go up one directory and then down to the specified directory
-                        target_dir = path_addition[3:]  # Remove "../"
-                        if len(current_parts) >= 2:
-                            # If we're in problems.525-contiguous-array.solution, go to problems.325-max...solution
-                            # current_parts[:-1] gives us problems.525-contiguous-array, then [:-1] gives problems
-                            base_parts = current_parts[:-1]  # Remove the current file name (solution)
-                            if len(base_parts) >= 1:
-                                root_parts = base_parts[:-1]  # Remove the current problem dir
-                                resolved = ".".join(root_parts + [target_dir, "solution"])
-                                print(f"DEBUG: Resolved '{module_name}' to '{resolved}'")  # Debug
-                                return resolved
-
-            # Fallback: assume it's in the same directory context
-            current_parts = self.mod.split(".")
-            if len(current_parts) >= 2:
-                resolved = ".".join(current_parts[:-1] + ["solution"])
-                print(f"DEBUG: Fallback resolved '{module_name}' to '{resolved}'")  # Debug
-                return resolved
-            else:
+    def _resolve_full_module_path(self, module_name: str, level: int = 0) -> str:
+        """Convert an import's module name to the workspace module name used in qnames"""
+        if level:
+            # Relative import: anchor at the importing module's package
+            package = self.mod.split(".")[:-level]
+            module_name = ".".join(package + ([module_name] if module_name else []))
+            if self.graph is None:
                 return module_name
-        return module_name
+            return self.graph.canonical(module_name) or module_name
+        if self.graph is None:
+            return module_name
+        return self.graph.resolve(self.mod, module_name, tuple(self.sys_path_additions))
 
     def add_use(self, node: ast.AST, qname: str | None, kind: str | None = None):
         if qname:
@@ -238,16 +224,28 @@ class Uses(ast.NodeVisitor):
     def visit_Import(self, node: ast.Import):
         for a in node.names:
             local = a.asname or a.name.split(".", 1)[0]
-            self.define(local, ImportModule(a.name))
+            # Only a name bound to the module itself can be resolved (`import a.b` binds `a`)
+            module = self._resolve_full_module_path(a.name) if a.asname or "." not in a.name else a.name
+            self.define(local, ImportModule(module))
 
     def visit_ImportFrom(self, node: ast.ImportFrom):
-        if node.module is None: return
+        if node.module is None and not node.level: return
+        # Convert relative/script-relative module paths to workspace module names
+        full_module = self._resolve_full_module_path(node.module or "", node.level)
         for a in node.names:
             if a.name == "*": continue  # skip star-imports
             local = a.asname or a.name
-            # Convert relative module paths to fully qualified paths
-            full_module = self._resolve_full_module_path(node.module)
-            self.define(local, ImportSymbol(full_module, a.name))
+            submodule = self._submodule(full_module, a.name)
+            self.define(local, ImportModule(submodule) if submodule else ImportSymbol(full_module, a.name))
+
+    def _submodule(self, package: str, name: str) -> str | None:
+        """Workspace module for `from package import name` when name is a submodule rather than a symbol"""
+        if self.graph is None:
+            return None
+        self.consulted.add(package)
+        if name in self.graph.exports(package):
+            return None
+        return self.graph.canonical(f"{package.removesuffix('.__init__')}.{name}")
 
     # ---------- Definitions (skip annotations) ----------
     def visit_FunctionDef(self, node: ast.FunctionDef):
@@ -409,23 +407,68 @@ class Uses(ast.NodeVisitor):
         self.pop()
 
 # ---------- Driver ----------
-def module_name(root: Path, file: Path) -> str:
-    rel = file.resolve().relative_to(root.resolve())
-    parts = list(rel.parts)
-    parts[-1] = parts[-1].removesuffix(".py")
-    return ".".join(parts)
-
 def process_file(root: Path, path: Path) -> list[dict]:
-    # Read and clean the code using the same logic as generate_symbol_tags.py
-    raw_code = path.read_text(encoding="utf-8")
-    cleaned_code = clean_code(raw_code)  # Now preserves imports
-    
-    # Parse the cleaned code to get consistent line numbers
-    tree = ast.parse(cleaned_code)
-    vis = Uses(module_name(root, path))
-    vis.visit(tree)
+    src = SourceFile.load(path, root)
+    with profiling.stage("uses"):
+        return uses_for_source(src)
+
+def visit_uses(src: SourceFile, graph: ModuleGraph | None = None) -> Uses:
+    # Parse the cleaned code (same cleaning as generate_symbol_tags.py) to get consistent line numbers
+    # Imports resolve against the workspace module graph (scanned once per process unless given)
+    vis = Uses(src.module, graph or module_graph(src.root))
+    vis.visit(src.cleaned_tree)
     vis.uses.sort(key=lambda u: (u["range"]["start"]["line"], u["range"]["start"]["character"]))
-    return vis.uses
+    return vis
+
+def uses_for_source(src: SourceFile, graph: ModuleGraph | None = None) -> list[dict]:
+    return visit_uses(src, graph).uses
+
+def cacheable_uses(src: SourceFile, graph: ModuleGraph) -> dict:
+    """Uses plus a digest of the exports of every module that decided one of its bindings."""
+    vis = visit_uses(src, graph)
+    return {"uses": vis.uses, "exports": {m: graph.exports_digest(m) for m in sorted(vis.consulted)}}
+
+def cached_uses_current(entry: dict, graph: ModuleGraph) -> bool:
+    """A cacheable_uses() entry still holds while none of the modules it consulted changed their exports."""
+    return all(graph.exports_digest(m) == digest for m, digest in entry["exports"].items())
+
+@profiling.timed("write:uses")
+def write_uses(out: Path, index: dict[str, list[dict]], problem: str | None = None) -> dict[str, list[dict]]:
+    """Write uses.json and its per-problem fragments; return the index that was written.
+
+    In single-problem mode only that problem's fragment is replaced (see shards.py).
+    """
+    out.parent.mkdir(parents=True, exist_ok=True)
+    write_sharded_index(out, index, problem)
+    return index
+
+def filter_uses(index: dict[str, list[dict]], qnames: set[str] | dict) -> dict[str, list[dict]]:
+    """Only the uses whose qname is in qnames (e.g. the symbol_tags keys); files left empty are dropped."""
+    filtered = {}
+    for rel_path, uses in index.items():
+        kept = [u for u in uses if u.get("qname") in qnames]
+        if kept:
+            filtered[rel_path] = kept
+    return filtered
+
+@profiling.timed("write:filtered_uses")
+def write_filtered_uses(
+    out: Path, index: dict[str, list[dict]], qnames: set[str] | dict, problem: str | None = None
+) -> dict[str, list[dict]]:
+    """Write filtered_uses.json straight from the in-memory uses (merging in single-problem mode).
+
+    Replaces a separate filter_uses.py pass that re-read uses.json and symbol_tags.json.
+    """
+    filtered = filter_uses(index, qnames)
+    if problem and out.exists():
+        prefix = f"problems/{problem}/"
+        existing = json.loads(out.read_text(encoding="utf-8"))
+        existing = {k: v for k, v in existing.items() if not k.startswith(prefix) and k not in index}
+        existing.update(filtered)
+        filtered = existing
+    out.parent.mkdir(parents=True, exist_ok=True)
+    write_json(out, filtered, dump_range_index)
+    return filtered
 
 def main():
     parser = argparse.ArgumentParser(description="Generate uses.json with identifier mappings")
@@ -435,64 +478,38 @@ def main():
                         help="Output JSON file path")
     parser.add_argument("--problem", type=str,
                         help="Specific problem slug to process (e.g., '53-maximum-subarray')")
+    parser.add_argument("--jobs", "-j", type=int, default=1,
+                        help="Worker processes for per-file extraction (0 = one per CPU)")
+    parser.add_argument("--symbol-tags", type=Path,
+                        help="symbol_tags.json whose keys select the uses written to --filtered-out")
+    parser.add_argument("--filtered-out", type=Path,
+                        help="Filtered uses output (default: filtered_uses.json next to --out; needs --symbol-tags)")
+    profiling.add_arguments(parser)
     args = parser.parse_args()
-
-    root = Path(args.root)
-    index: dict[str, list[dict]] = {}
-    for py in root.rglob("*.py"):
-        # Filter to specific problem if provided
-        if args.problem and f"problems/{args.problem}/" not in str(py):
-            continue
-        # Use relative path from root instead of absolute URI
-        rel_path = py.relative_to(root)
-        index[str(rel_path)] = process_file(root, py)
+    with profiling.profiled(args, "generate_uses"):
+        return _run(args)
+
+def _run(args: argparse.Namespace):
+    root = Path(args.root).resolve()
+    # Sorted so the output key order is stable across filesystems and job counts;
+    # with --problem only that problem (and the core modules it imports) is scanned
+    files = scan_files(root, args.problem)
+    results = parallel_map(partial(process_file, root), files, args.jobs)
+    # Use relative path from root instead of absolute URI
+    index: dict[str, list[dict]] = {
+        str(py.relative_to(root)): uses for py, uses in zip(files, results, strict=True)
+    }
 
     out = Path(args.out)
-    out.parent.mkdir(parents=True, exist_ok=True)
-
-    if args.problem:
-        # Single problem mode - merge with existing data
-        if out.exists():
-            existing_data = json.loads(out.read_text(encoding="utf-8"))
-            # Remove old entries for this problem
-            problem_prefix = f"problems/{args.problem}/"
-            existing_data = {k: v for k, v in existing_data.items() if not k.startswith(problem_prefix)}
-            # Merge with new data
-            existing_data.update(index)
-            index = existing_data
-
-    # Custom compact formatting for ranges
-    def compact_json(obj, indent=0):
-        if isinstance(obj, dict):
-            if "range" in obj and "qname" in obj:  # use object with range, nameRange, qname, and kind
-                range_obj = obj["range"]
-                name_range_obj = obj["nameRange"]
-                start = range_obj["start"]
-                end = range_obj["end"]
-                name_start = name_range_obj["start"]
-                name_end = name_range_obj["end"]
-                qname = json.dumps(obj["qname"])
-                kind = json.dumps(obj["kind"])
-                return f'{{"range": {{"start": {{"line": {start["line"]}, "character": {start["character"]}}}, "end": {{"line": {end["line"]}, "character": {end["character"]}}}}}, "nameRange": {{"start": {{"line": {name_start["line"]}, "character": {name_start["character"]}}}, "end": {{"line": {name_end["line"]}, "character": {name_end["character"]}}}}}, "qname": {qname}, "kind": {kind}}}'
-            else:
-                items = []
-                for k, v in obj.items():
-                    key = json.dumps(k)
-                    if isinstance(v, list) and all(isinstance(item, dict) and "range" in item for item in v):
-                        # List of use objects
-                        use_items = [compact_json(item, 0) for item in v]
-                        uses_str = "[\n" + ",\n".join(f"    {item}" for item in use_items) + "\n  ]"
-                        items.append(f"  {key}: {uses_str}")
-                    else:
-                        items.append(f"  {key}: {compact_json(v, indent + 2)}")
-                return "{\n" + ",\n".join(items) + "\n}"
-        elif isinstance(obj, list):
-            return "[" + ", ".join(compact_json(item, indent) for item in obj) + "]"
-        else:
-            return json.dumps(obj, ensure_ascii=False)
-    
-    out.write_text(compact_json(index), encoding="utf-8")
+    index = write_uses(out, index, args.problem)
     print(f"Wrote {out} • {sum(len(v) for v in index.values())} uses")
 
+    if args.symbol_tags:
+        qnames = json.loads(args.symbol_tags.read_text(encoding="utf-8"))
+        filtered_out = args.filtered_out or out.with_name("filtered_uses.json")
+        filtered = write_filtered_uses(filtered_out, index, qnames, args.problem)
+        print(f"Wrote {filtered_out} • {sum(len(v) for v in filtered.values())} uses")
+
+
 if __name__ == "__main__":
     main()
@@ -31,7 +31,8 @@ def get_directory_timestamps(problem_dir: Path) -> dict[str, str]:
 
     # Get directory creation time
     dir_stat = problem_dir.stat()
-    created_at = datetime.fromtimestamp(dir_stat.st_birthtime)
+    # st_birthtime is only reported on macOS/BSD; elsewhere use the inode change time
+    created_at = datetime.fromtimestamp(getattr(dir_stat, 'st_birthtime', dir_stat.st_ctime))
 
     # Find the latest modification time among all files in the directory
     latest_mtime = dir_stat.st_mtime
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Streaming JSON writers for the compact extracted-metadata layouts.
+
+The generators emit four hand-formatted layouts (one-line range entries in
+uses.json/expressions.json, one-line "range" objects in lsp_index.json, one-line
+arrays in problems_metadata.json, sorted keys with one-line string arrays in
+symbol_tags.json). These writers produce the
+same bytes the old string builders did, but write them to the file handle as
+they go instead of assembling the whole document in memory first.
+
+  with open(path, "w", encoding="utf-8") as fp:
+      dump_range_index(data, fp)
+
+or simply write_json(path, data, dump_range_index).
+"""
+
+import json
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any, TextIO
+
+
+def write_json(path: Path, obj: Any, dump: Callable[[Any, TextIO], None]) -> None:
+    """Stream obj to path with one of the dump_* layouts below."""
+    with open(path, "w", encoding="utf-8") as fp:
+        dump(obj, fp)
+
+
+# ---------- uses.json / expressions.json / filtered_uses.json ----------
+
+def _range_entry(obj: dict) -> str:
+    """One use/expression entry on a single line."""
+    start = obj["range"]["start"]
+    end = obj["range"]["end"]
+    name_start = obj["nameRange"]["start"]
+    name_end = obj["nameRange"]["end"]
+    qname = json.dumps(obj["qname"])
+    kind = json.dumps(obj["kind"])
+    return (
+        f'{{"range": {{"start": {{"line": {start["line"]}, "character": {start["character"]}}}, '
+        f'"end": {{"line": {end["line"]}, "character": {end["character"]}}}}}, '
+        f'"nameRange": {{"start": {{"line": {name_start["line"]}, "character": {name_start["character"]}}}, '
+        f'"end": {{"line": {name_end["line"]}, "character": {name_end["character"]}}}}}, '
+        f'"qname": {qname}, "kind": {kind}}}'
+    )
+
+
+def dump_range_index(obj: Any, fp: TextIO) -> None:
+    """file -> [entry, ...] maps: one entry per line, each entry on a single line."""
+    if isinstance(obj, dict):
+        if "range" in obj and "qname" in obj:
+            fp.write(_range_entry(obj))
+            return
+        fp.write("{\n")
+        for i, (k, v) in enumerate(obj.items()):
+            if i:
+                fp.write(",\n")
+            key = json.dumps(k)
+            if isinstance(v, list) and all(isinstance(item, dict) and "range" in item for item in v):
+                fp.write(f"  {key}: [\n")
+                for j, item in enumerate(v):
+                    fp.write(",\n    " if j else "    ")
+                    dump_range_index(item, fp)
+                fp.write("\n  ]")
+            else:
+                fp.write(f"  {key}: ")
+                dump_range_index(v, fp)
+        fp.write("\n}")
+    elif isinstance(obj, list):
+        fp.write("[")
+        for i, item in enumerate(obj):
+            if i:
+                fp.write(", ")
+            dump_range_index(item, fp)
+        fp.write("]")
+    else:
+        fp.write(json.dumps(obj, ensure_ascii=False))
+
+
+# ---------- lsp_index.json ----------
+
+def dump_lsp_index(obj: Any, fp: TextIO, depth: int = 0) -> None:
+    """json.dumps(indent=2) layout (ASCII-escaped) with "range"/"selectionRange" values on one line."""
+    ind = "  " * depth
+    if isinstance(obj, dict):
+        if not obj:
+            fp.write("{}")
+            return
+        fp.write("{\n")
+        for i, (k, v) in enumerate(obj.items()):
+            if i:
+                fp.write(",\n")
+            fp.write(f"{ind}  {json.dumps(k)}: ")
+            if k in ("range", "selectionRange") and isinstance(v, dict):
+                start, end = v["start"], v["end"]
+                fp.write(
+                    f'{{"start": {{"line": {start["line"]}, "character": {start["character"]}}}, '
+                    f'"end": {{"line": {end["line"]}, "character": {end["character"]}}}}}'
+                )
+            else:
+                dump_lsp_index(v, fp, depth + 1)
+        fp.write(f"\n{ind}}}")
+    elif isinstance(obj, list):
+        if not obj:
+            fp.write("[]")
+            return
+        fp.write("[\n")
+        for i, item in enumerate(obj):
+            if i:
+                fp.write(",\n")
+            fp.write(f"{ind}  ")
+            dump_lsp_index(item, fp, depth + 1)
+        fp.write(f"\n{ind}]")
+    else:
+        fp.write(json.dumps(obj))
+
+
+# ---------- problems_metadata.json ----------
+
+def _dumps(value: Any) -> str:
+    return json.dumps(value, ensure_ascii=False)
+
+
+def dump_compact_arrays(obj: Any, fp: TextIO, depth: int = 0) -> None:
+    """Indented objects (insertion order) with every array on a single line."""
+    ind = "  " * depth
+    if isinstance(obj, dict):
+        if not obj:
+            fp.write("{}")
+            return
+        fp.write("{\n")
+        for i, (k, v) in enumerate(obj.items()):
+            if i:
+                fp.write(",\n")
+            fp.write(f"{ind}  {_dumps(k)}: ")
+            dump_compact_arrays(v, fp, depth + 1)
+        fp.write(f"\n{ind}}}")
+    elif isinstance(obj, list):
+        if not obj:
+            fp.write("[]")
+        elif all(isinstance(item, list) for item in obj):
+            # List of lists (like the group field)
+            fp.write("[" + ", ".join("[" + ", ".join(_dumps(x) for x in item) + "]" for item in obj) + "]")
+        else:
+            fp.write("[" + ", ".join(_dumps(item) for item in obj) + "]")
+    else:
+        fp.write(_dumps(obj))
+
+
+# ---------- symbol_tags.json ----------
+
+def dump_sorted_compact(obj: Any, fp: TextIO, depth: int = 0) -> None:
+    """json.dumps(indent=2, sort_keys=True) layout, with string-only arrays and
+    single-key objects holding a scalar written on one line."""
+    ind = "  " * depth
+    if isinstance(obj, dict):
+        if not obj:
+            fp.write("{}")
+            return
+        if len(obj) == 1:
+            (k, v), = obj.items()
+            if not isinstance(v, (dict, list)):
+                fp.write(f"{{{_dumps(k)}: {_dumps(v)}}}")
+                return
+        fp.write("{\n")
+        for i, k in enumerate(sorted(obj)):
+            if i:
+                fp.write(",\n")
+            fp.write(f"{ind}  {_dumps(k)}: ")
+            dump_sorted_compact(obj[k], fp, depth + 1)
+        fp.write(f"\n{ind}}}")
+    elif isinstance(obj, list):
+        if not obj:
+            fp.write("[]")
+        elif all(isinstance(item, str) for item in obj):
+            fp.write("[" + ", ".join(_dumps(item) for item in obj) + "]")
+        else:
+            fp.write("[\n")
+            for i, item in enumerate(obj):
+                if i:
+                    fp.write(",\n")
+                fp.write(f"{ind}  ")
+                dump_sorted_compact(item, fp, depth + 1)
+            fp.write(f"\n{ind}]")
+    else:
+        fp.write(_dumps(obj))
@@ -5,16 +5,19 @@ Script to list existing problem numbers.
 Usage:
     python3 backend/scripts/problems/list_problems.py           # List all problem numbers
     python3 backend/scripts/problems/list_problems.py 1 2 3    # Check which of these exist
+    PYTHONPATH=backend python3 -m scripts.problems list [1 2 3]  # Same, via the dispatcher (cli.py)
 """
 
+# os rather than pathlib: this runs interactively and pathlib's import (re,
+# fnmatch, urllib.parse) costs more than the listing itself
+import os
 import sys
-from pathlib import Path
 
 
-def get_existing_problems(root_path: Path) -> dict[int, str]:
+def get_existing_problems(root_path: str) -> dict[int, str]:
     """Get all existing problem numbers and their folder names."""
     problems = {}
-    for folder in root_path.iterdir():
+    for folder in os.scandir(root_path):
         if folder.is_dir() and "-" in folder.name:
             try:
                 number = int(folder.name.split("-")[0])
@@ -25,8 +28,8 @@ def get_existing_problems(root_path: Path) -> dict[int, str]:
 
 
 def main() -> None:
-    root_path = Path("backend/algorithms/problems")
-    if not root_path.exists():
+    root_path = os.path.join("backend", "algorithms", "problems")
+    if not os.path.isdir(root_path):
         print(f"Error: Root path '{root_path}' does not exist.", file=sys.stderr)
         sys.exit(1)
 
@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+"""
+Opt-in instrumentation for the extraction pipeline (--profile on every generator).
+
+Records, for one script run:
+  - wall time per stage (parse, clean, docstrings, write, ...), exclusive of
+    nested stages so the stage times of one thread add up,
+  - wall time per input file, and the top-N slowest files,
+  - peak RSS of the process and of its worker processes.
+
+Code marks its work with `with profiling.stage("parse"):` (or @profiling.timed)
+and `for path in profiling.iter_files(paths):`. These are no-ops unless a profile
+is active, so the hooks stay in place permanently. Worker processes started by parallel.py send
+their stage and file times back with each result.
+
+A run prints a summary and appends one JSON record per run to --profile-out
+(JSON lines, default .cache/profile/<script>.jsonl) for tracking regressions:
+
+  {"script": "generate_uses", "argv": [...], "started_at": "...", "total_s": 1.93,
+   "peak_rss_mb": 81.2, "children_peak_rss_mb": 64.0,
+   "stages": {"parse": {"seconds": 0.41, "calls": 512}, ...},
+   "files": [{"path": "problems/...", "seconds": 0.05}, ...]}
+"""
+
+import argparse
+import functools
+import json
+import sys
+import threading
+import time
+from collections.abc import Callable, Iterable, Iterator
+from contextlib import contextmanager
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+DEFAULT_PROFILE_DIR = Path(".cache/profile")
+DEFAULT_TOP = 10
+
+
+class Profile:
+    """Stage and file timings of one run (or of one worker task)."""
+
+    def __init__(self, script: str = ""):
+        self.script = script
+        self.started = time.perf_counter()
+        self.started_at = datetime.now(UTC).isoformat(timespec="seconds")
+        self.stages: dict[str, list[float]] = {}  # name -> [seconds, calls]
+        self.files: dict[str, float] = {}
+        self._local = threading.local()  # per-thread stack of [name, resumed_at] for the open stages
+
+    @property
+    def _stack(self) -> list[list]:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def _charge(self, name: str, seconds: float, calls: int = 0) -> None:
+        entry = self.stages.setdefault(name, [0.0, 0])
+        entry[0] += seconds
+        entry[1] += calls
+
+    def enter(self, name: str) -> None:
+        now = time.perf_counter()
+        if self._stack:
+            # Pause the enclosing stage
+            parent = self._stack[-1]
+            self._charge(parent[0], now - parent[1])
+        self._stack.append([name, now])
+
+    def exit(self) -> None:
+        now = time.perf_counter()
+        name, resumed_at = self._stack.pop()
+        self._charge(name, now - resumed_at, 1)
+        if self._stack:
+            self._stack[-1][1] = now
+
+    def add_file(self, path: str, seconds: float) -> None:
+        self.files[path] = self.files.get(path, 0.0) + seconds
+
+    def merge(self, stages: dict[str, list[float]], files: dict[str, float]) -> None:
+        """Add timings recorded elsewhere (a worker process)."""
+        for name, (seconds, calls) in stages.items():
+            self._charge(name, seconds, calls)
+        for path, seconds in files.items():
+            self.add_file(path, seconds)
+
+    def to_dict(self, top: int | None = None) -> dict[str, Any]:
+        files = sorted(self.files.items(), key=lambda kv: kv[1], reverse=True)
+        return {
+            "script": self.script,
+            "argv": sys.argv[1:],
+            "started_at": self.started_at,
+            "total_s": round(time.perf_counter() - self.started, 4),
+            "peak_rss_mb": peak_rss_mb(),
+            "children_peak_rss_mb": peak_rss_mb(children=True),
+            "stages": {
+                name: {"seconds": round(seconds, 4), "calls": int(calls)}
+                for name, (seconds, calls) in sorted(self.stages.items(), key=lambda kv: kv[1][0], reverse=True)
+            },
+            "files": [{"path": path, "seconds": round(seconds, 4)} for path, seconds in files[:top]],
+        }
+
+
+_active: Profile | None = None
+
+
+def active() -> Profile | None:
+    """The running profile, or None when profiling is off."""
+    return _active
+
+
+class _Stage:
+    __slots__ = ("name",)
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __enter__(self) -> None:
+        if _active is not None:
+            _active.enter(self.name)
+
+    def __exit__(self, *exc) -> None:
+        if _active is not None:
+            _active.exit()
+
+
+_stages: dict[str, _Stage] = {}
+
+
+def stage(name: str) -> _Stage:
+    """Context manager charging the enclosed wall time to a stage (no-op when profiling is off)."""
+    ctx = _stages.get(name)
+    if ctx is None:
+        ctx = _stages[name] = _Stage(name)
+    return ctx
+
+
+def timed(name: str) -> Callable[[Callable], Callable]:
+    """Decorator form of stage(), e.g. @profiling.timed("write:uses") on an output writer."""
+    def decorate(fn: Callable) -> Callable:
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with stage(name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+@contextmanager
+def file(path: str | Path) -> Iterator[None]:
+    """Charge the enclosed wall time to an input file."""
+    if _active is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        _active.add_file(_display_path(path), time.perf_counter() - started)
+
+
+def iter_files[T](paths: Iterable[T]) -> Iterator[T]:
+    """Yield paths, charging the loop body's wall time for each one to that file."""
+    if _active is None:
+        yield from paths
+        return
+    for path in paths:
+        started = time.perf_counter()
+        yield path
+        _active.add_file(_display_path(path), time.perf_counter() - started)
+
+
+def _display_path(path: Any) -> str:
+    """Paths under the working directory are recorded relative to it."""
+    try:
+        return str(Path(path).resolve().relative_to(Path.cwd()))
+    except (TypeError, ValueError):
+        return str(path)
+
+
+def peak_rss_mb(children: bool = False) -> float | None:
+    """Peak resident set size in MiB (None where the resource module is unavailable)."""
+    if resource is None:
+        return None
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN if children else resource.RUSAGE_SELF)
+    # ru_maxrss is KiB on Linux and bytes on macOS
+    scale = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return round(usage.ru_maxrss / scale, 1)
+
+
+# ---------- Worker processes (parallel.py) ----------
+
+def call_profiled(fn, item):
+    """Run fn(item) in a worker under a fresh profile; return (result, stages, files)."""
+    global _active
+    previous, _active = _active, Profile()
+    try:
+        with file(item):
+            result = fn(item)
+        return result, _active.stages, _active.files
+    finally:
+        _active = previous
+
+
+# ---------- CLI ----------
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add --profile, --profile-out and --profile-top to a script's parser."""
+    parser.add_argument("--profile", action="store_true",
+                        help="Report per-stage and per-file timings and peak RSS")
+    parser.add_argument("--profile-out", type=Path,
+                        help=f"Append the profile as a JSON line here (default: {DEFAULT_PROFILE_DIR}/<script>.jsonl)")
+    parser.add_argument("--profile-top", type=int, default=DEFAULT_TOP,
+                        help=f"Slowest files to print and record (default: {DEFAULT_TOP})")
+
+
+@contextmanager
+def profiled(args: argparse.Namespace, script: str) -> Iterator[Profile | None]:
+    """Profile the enclosed run if args.profile is set; report and record it at the end."""
+    global _active
+    if not getattr(args, "profile", False):
+        yield None
+        return
+
+    _active = Profile(script)
+    try:
+        yield _active
+    finally:
+        profile, _active = _active, None
+        record = profile.to_dict(args.profile_top)
+        print_report(record, args.profile_top)
+        out = args.profile_out or DEFAULT_PROFILE_DIR / f"{script}.jsonl"
+        out.parent.mkdir(parents=True, exist_ok=True)
+        with open(out, "a", encoding="utf-8") as fp:
+            fp.write(json.dumps(record) + "\n")
+        print(f"Profile appended to {out}", file=sys.stderr)
+
+
+def print_report(record: dict[str, Any], top: int = DEFAULT_TOP) -> None:
+    """Human-readable summary of a profile record (on stderr, next to the generators' warnings)."""
+    out = sys.stderr
+    rss = record["peak_rss_mb"]
+    children = record["children_peak_rss_mb"]
+    print(f"\n⏱  {record['script']}: {record['total_s']:.3f}s total"
+          + (f", peak RSS {rss} MiB" if rss is not None else "")
+          + (f" (workers {children} MiB)" if children else ""), file=out)
+    if record["stages"]:
+        print("   stage                     seconds     calls", file=out)
+        for name, data in record["stages"].items():
+            print(f"   {name:<24} {data['seconds']:>8.3f} {data['calls']:>9}", file=out)
+    if record["files"]:
+        print(f"   slowest {min(top, len(record['files']))} files:", file=out)
+        for entry in record["files"][:top]:
+            print(f"   {entry['seconds']:>8.3f}  {entry['path']}", file=out)
@@ -0,0 +1,632 @@
+#!/usr/bin/env python3
+"""
+Race every solution variant of a problem against the others.
+
+Most problem directories hold several interchangeable solutions, e.g.
+347-top-k-frequent-elements/{heap.py,heap-nlargets.py,sort-frequency-bucketing.py,_sort.py}.
+Their hyphenated paths are not importable by name, so this script loads each
+file by path with importlib, finds the entry point every variant shares (a
+Solution method or a module function, matched by name, falling back to each
+file's first function), generates size-scaled inputs, checks that the variants
+agree, and reports wall time and peak traced memory per variant and size.
+
+Inputs come from the entry point's annotations and parameter names (list[int]
+-> n ints, list[list[str]] -> a sqrt(n) x sqrt(n) '0'/'1' grid, intervals,
+edges, ...), or from INPUTS for problems whose inputs have constraints the
+annotations don't express (connected graphs, distinct frequencies, trees).
+Problems with no generator for a parameter type are skipped.
+
+Each variant gets fresh deep copies of the inputs, so in-place solutions (which
+return None) are compared by the arguments they mutated. Results that differ
+only in list order count as agreeing. A call that exceeds --timeout (or raises,
+e.g. RecursionError in a top-down variant) is reported, and that variant is not
+run at larger sizes.
+
+Every run appends one JSON line per problem to --out (default
+.cache/benchmark/variants.jsonl):
+
+  {"problem": "198-house-robber", "entry": "rob", "sizes": [10, 100, ...],
+   "variants": {"bottom-up-prefix.py": [{"size": 10, "status": "ok", "seconds": 2e-06,
+                                         "peak_kib": 0.4}, ...], ...},
+   "agree": {"10": true, ...}, "fastest": {"10": "bottom-up-prefix.py", ...}}
+
+CLI:
+  python3 -m scripts.problems race [198 347-top-k-frequent-elements ...] \
+    [--sizes 10,100,1000,10000] [--repeat 3] [--timeout 2] [--seed 0] [--out ...]
+"""
+
+import argparse
+import contextlib
+import copy
+import dataclasses
+import importlib.util
+import inspect
+import json
+import math
+import random
+import signal
+import sys
+import time
+import tracemalloc
+from collections import Counter
+from collections.abc import Callable
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+
+ALGORITHMS_DIR = Path(__file__).resolve().parent.parent.parent / "algorithms"
+PROBLEMS_DIR = ALGORITHMS_DIR / "problems"
+REPO_ROOT = ALGORITHMS_DIR.parent.parent
+
+DEFAULT_SIZES = (10, 100, 1000, 10000)
+DEFAULT_OUT = Path(".cache/benchmark/variants.jsonl")
+
+
+# ---------- Loading ----------
+
+@dataclasses.dataclass
+class Variant:
+    """One solution file and the entry point chosen for it."""
+
+    path: Path
+    module: Any = None
+    error: str | None = None
+    candidates: list[tuple[str, bool]] = dataclasses.field(default_factory=list)  # (name, is_method)
+    entry: str | None = None
+    is_method: bool = False
+
+    @property
+    def name(self) -> str:
+        return self.path.name
+
+    def function(self) -> Callable:
+        """The entry point, bound to a fresh Solution instance for methods."""
+        if self.is_method:
+            return getattr(self.module.Solution(), self.entry)
+        return getattr(self.module, self.entry)
+
+
+def load_variant(path: Path) -> Variant:
+    """Import a solution file by path; its siblings are importable by bare name while it loads."""
+    variant = Variant(path)
+    name = "_race_" + "".join(c if c.isalnum() else "_" for c in f"{path.parent.name}_{path.stem}")
+    for entry in (str(REPO_ROOT), str(ALGORITHMS_DIR)):
+        if entry not in sys.path:
+            sys.path.append(entry)
+    before = set(sys.modules)
+    sys.path.insert(0, str(path.parent))
+    try:
+        spec = importlib.util.spec_from_file_location(name, path)
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[name] = module
+        with contextlib.redirect_stdout(None):
+            spec.loader.exec_module(module)
+        variant.module = module
+    except BaseException as e:  # noqa: BLE001 - solution files may do anything at import
+        variant.error = f"import failed: {type(e).__name__}: {e}"
+        return variant
+    finally:
+        sys.path.remove(str(path.parent))
+        # Forget sibling modules (e.g. `from solution import ...`) so other problems' files
+        # with the same name are imported afresh
+        for mod in set(sys.modules) - before - {name}:
+            if str(getattr(sys.modules[mod], "__file__", "") or "").startswith(str(path.parent)):
+                del sys.modules[mod]
+
+    solution = vars(module).get("Solution")
+    if inspect.isclass(solution):
+        variant.candidates += [
+            (attr, True) for attr, value in vars(solution).items()
+            if inspect.isfunction(value) and not attr.startswith("_")
+        ]
+    variant.candidates += [
+        (attr, False) for attr, value in vars(module).items()
+        if inspect.isfunction(value) and value.__module__ == name and not attr.startswith("_")
+    ]
+    if not variant.candidates:
+        variant.error = "no entry point"
+    return variant
+
+
+def choose_entry_points(variants: list[Variant]) -> str | None:
+    """Pick the entry point name most variants define; others fall back to their first function."""
+    loaded = [v for v in variants if v.candidates]
+    if not loaded:
+        return None
+    counts = Counter(name for v in loaded for name in dict(v.candidates))
+    order = {name: i for i, (name, _) in enumerate(loaded[0].candidates)}
+    shared = max(counts, key=lambda name: (counts[name], -order.get(name, len(order))))
+    for v in loaded:
+        entries = dict(v.candidates)
+        v.entry = shared if shared in entries else v.candidates[0][0]
+        v.is_method = entries[v.entry]
+    return shared
+
+
+def load_problem(problem_dir: Path) -> list[Variant]:
+    """Load every solution file of a problem and choose their entry points."""
+    variants = [load_variant(p) for p in solution_files(problem_dir)]
+    choose_entry_points(variants)
+    return variants
+
+
+def solution_files(problem_dir: Path) -> list[Path]:
+    return sorted(p for p in problem_dir.glob("*.py") if p.name != "__init__.py")
+
+
+def entry_function(variant: Variant) -> Callable:
+    """The unbound entry point (the Solution method itself for methods)."""
+    return getattr(variant.module.Solution if variant.is_method else variant.module, variant.entry)
+
+
+def _parameters(variant: Variant) -> list[inspect.Parameter]:
+    params = list(inspect.signature(entry_function(variant)).parameters.values())
+    return params[1:] if variant.is_method else params
+
+
+def reference_parameters(variants: list[Variant]) -> list[inspect.Parameter]:
+    """Parameters inputs are generated for: those of the most annotated runnable variant."""
+    runnable = [v for v in variants if v.entry]
+    reference = max(runnable, key=lambda v: sum(p.annotation is not inspect.Parameter.empty for p in _parameters(v)))
+    return _parameters(reference)
+
+
+# ---------- Inputs ----------
+
+def _annotation_text(annotation: Any) -> str:
+    if annotation is inspect.Parameter.empty:
+        return ""
+    if isinstance(annotation, str):
+        return annotation.replace(" ", "")
+    if isinstance(annotation, type):
+        return annotation.__name__
+    return str(annotation).replace(" ", "").replace("typing.", "")
+
+
+def _matrix(rng: random.Random, rows: int, cols: int, values: Callable[[], Any]) -> list[list]:
+    return [[values() for _ in range(cols)] for _ in range(rows)]
+
+
+def _intervals(rng: random.Random, n: int) -> list[list[int]]:
+    intervals = []
+    for _ in range(n):
+        start = rng.randint(0, 10 * n)
+        intervals.append([start, start + rng.randint(1, 20)])
+    return intervals
+
+
+def _edges(rng: random.Random, nodes: int, count: int, first: int = 0, weights: bool = True) -> list[list[int]]:
+    """count directed edges over nodes first..first+nodes-1; a path through all nodes keeps it connected."""
+    edges = [[first + i, first + i + 1] for i in range(nodes - 1)]
+    while len(edges) < count:
+        edges.append([first + rng.randrange(nodes), first + rng.randrange(nodes)])
+    if weights:
+        for edge in edges:
+            edge.append(rng.randint(1, 100))
+    return edges
+
+
+def generic_value(name: str, annotation: str, n: int, rng: random.Random) -> Any:
+    """A size-n value for one parameter, from its annotation and name; raises TypeError if unsupported."""
+    lname = name.lower()
+    side = max(1, math.isqrt(n))
+    if annotation == "int" or (not annotation and lname in ("n", "k", "x", "target", "amount")):
+        return max(1, min(n, 10)) if lname == "k" else n
+    if annotation == "float":
+        return rng.random() * n
+    if annotation == "bool":
+        return rng.random() < 0.5
+    if annotation == "str":
+        return "".join(rng.choice("abcde") for _ in range(n))
+    if annotation in ("list[int]", "List[int]"):
+        return [rng.randint(0, 2 * n) for _ in range(n)]
+    if annotation in ("list[float]", "List[float]"):
+        return [rng.random() for _ in range(n)]
+    if annotation in ("list[str]", "List[str]"):
+        return ["".join(rng.choice("abcde") for _ in range(rng.randint(1, 6))) for _ in range(n)]
+    if annotation in ("list[list[str]]", "List[List[str]]"):
+        return _matrix(rng, side, side, lambda: rng.choice("01"))
+    if annotation in ("list[list[int]]", "List[List[int]]") or (not annotation and lname in ("intervals", "points")):
+        if "interval" in lname or "meeting" in lname:
+            return _intervals(rng, n)
+        if "point" in lname:
+            return [[rng.randint(-n, n), rng.randint(-n, n)] for _ in range(n)]
+        if lname in ("edges", "times", "flights"):
+            return _edges(rng, side, n)
+        return _matrix(rng, side, side, lambda: rng.randint(0, 9))
+    raise TypeError(f"no input generator for {name}: {annotation or 'unannotated'}")
+
+
+def _distinct_frequencies(n: int, rng: random.Random) -> dict:
+    # Value i appears i + 1 times, so the top k are unique
+    nums = [value for value in range(max(1, math.isqrt(2 * n))) for _ in range(value + 1)][:n]
+    rng.shuffle(nums)
+    return {"nums": nums, "k": max(1, min(10, len(set(nums)) // 2))}
+
+
+def _network(n: int, rng: random.Random) -> dict:
+    nodes = max(2, math.isqrt(n))
+    return {"times": _edges(rng, nodes, n, first=1), "n": nodes, "k": 1}
+
+
+def _probability_graph(n: int, rng: random.Random) -> dict:
+    nodes = max(2, math.isqrt(n))
+    edges = _edges(rng, nodes, n, weights=False)
+    return {"n": nodes, "edges": edges, "succProb": [rng.random() for _ in edges], "start": 0, "end": nodes - 1}
+
+
+def _flights(n: int, rng: random.Random) -> dict:
+    nodes = max(2, math.isqrt(n))
+    return {"n": nodes, "flights": _edges(rng, nodes, n), "src": 0, "dst": nodes - 1, "k": min(nodes, 10)}
+
+
+def _redundant_connection(n: int, rng: random.Random) -> dict:
+    # A random tree on 1..n plus one extra edge closing a cycle
+    nodes = max(3, n)
+    edges = [[rng.randint(1, v - 1), v] for v in range(2, nodes + 1)]
+    u, v = rng.sample(range(1, nodes + 1), 2)
+    edges.insert(rng.randrange(len(edges) + 1), [min(u, v), max(u, v)])
+    return {"edges": edges}
+
+
+def _obstacle_grid(n: int, rng: random.Random) -> dict:
+    side = max(2, math.isqrt(n))
+    grid = _matrix(rng, side, side, lambda: int(rng.random() < 0.3))
+    grid[0][0] = grid[-1][-1] = 0
+    return {"grid": grid, "k": max(1, side // 4)}
+
+
+def _sparse_matrices(n: int, rng: random.Random) -> dict:
+    side = max(1, math.isqrt(n))
+    def sparse() -> int:
+        return rng.randint(1, 9) if rng.random() < 0.1 else 0
+    return {"A": _matrix(rng, side, side, sparse), "B": _matrix(rng, side, side, sparse)}
+
+
+def _insert_interval(n: int, rng: random.Random) -> dict:
+    # Sorted, non-overlapping intervals
+    intervals, start = [], 0
+    for _ in range(n):
+        start += rng.randint(1, 5)
+        end = start + rng.randint(0, 3)
+        intervals.append([start, end])
+        start = end
+    middle = rng.randint(0, max(1, start))
+    return {"intervals": intervals, "new": [middle, middle + rng.randint(0, 20)]}
+
+
+def _bold_tags(n: int, rng: random.Random) -> dict:
+    s = "".join(rng.choice("ab") for _ in range(n))
+    return {"s": s, "words": ["".join(rng.choice("ab") for _ in range(rng.randint(2, 5))) for _ in range(max(1, n // 100))]}
+
+
+def _parentheses(n: int, rng: random.Random) -> dict:
+    # The output is Catalan(n) strings, so scale n logarithmically
+    return {"n": max(1, int(math.log2(n)))}
+
+
+def _paint_costs(colors: int | None) -> Callable[[int, random.Random], dict]:
+    """n houses x colors costs (k colors scaling with n when colors is None)."""
+    def generate(n: int, rng: random.Random) -> dict:
+        k = colors or max(2, math.isqrt(n) // 4)
+        return {"costs": _matrix(rng, n, k, lambda: rng.randint(1, 20))}
+    return generate
+
+
+def _colors(n: int, rng: random.Random) -> dict:
+    return {"nums": [rng.randint(0, 2) for _ in range(n)]}
+
+
+def _bounded_product(n: int, rng: random.Random) -> dict:
+    # Any product must fit in 32 bits, or the arithmetic itself grows with n
+    nums = [rng.choice((-1, 1)) for _ in range(n)]
+    for i in rng.sample(range(n), min(n, 16)):
+        nums[i] = rng.choice((-3, -2, 0, 2, 3))
+    return {"nums": nums}
+
+
+def _full_tree_traversals(n: int, rng: random.Random) -> dict:
+    """pre/post order of a random full binary tree with distinct values (the only kind they determine)."""
+    values = iter(rng.sample(range(1, 10 * n + 1), 2 * n + 1))
+    pre, post = [], []
+    stack = [(False, n | 1)]  # (exiting, node count or value); subtree sizes stay odd
+    while stack:
+        exiting, item = stack.pop()
+        if exiting:
+            post.append(item)
+            continue
+        value = next(values)
+        pre.append(value)
+        stack.append((True, value))
+        if item > 1:
+            left = rng.randrange(1, item - 1, 2)
+            stack += [(False, item - 1 - left), (False, left)]
+    return {"pre": pre, "post": post}
+
+
+def _jobs(n: int, rng: random.Random) -> dict:
+    start = [rng.randint(1, 10 * n) for _ in range(n)]
+    return {
+        "startTime": start,
+        "endTime": [s + rng.randint(1, 50) for s in start],
+        "profit": [rng.randint(1, 1000) for _ in range(n)],
+    }
+
+
+def _points(n: int, rng: random.Random) -> dict:
+    points = rng.sample([[x, y] for x in range(-n, n + 1) for y in range(-2, 3)], n)
+    return {"points": points, "k": max(1, n // 10)}
+
+
+# Problems whose inputs have constraints their annotations don't express.
+# Each returns {parameter name: value}; variants with other parameter names get the values positionally.
+INPUTS: dict[str, Callable[[int, random.Random], dict]] = {
+    "22-generate-parentheses": _parentheses,
+    "238-product-of-array-except-self": _bounded_product,
+    "256-paint-house": _paint_costs(3),
+    "265-paint-house-ii": _paint_costs(None),
+    "311-sparse-matrix-multiplication": _sparse_matrices,
+    "347-top-k-frequent-elements": _distinct_frequencies,
+    "57-insert-interval": _insert_interval,
+    "616-add-bold-tag-in-string": _bold_tags,
+    "684-redundant-connection": _redundant_connection,
+    "743-network-delay-time": _network,
+    "75-sort-colors": _colors,
+    "787-cheapest-flights-within-k-stops": _flights,
+    "889-construct-binary-tree-from-preorder-and-postorder-traversal": _full_tree_traversals,
+    "937-k-closest-points-to-origin": _points,
+    "1235-maximum-profit-in-job-scheduling": _jobs,
+    "1293-shortest-path-in-a-grid-with-obstacles-elimination": _obstacle_grid,
+    "1514-path-with-maximum-probability": _probability_graph,
+}
+
+
+def input_rng(seed: int, problem: str, n: int) -> random.Random:
+    """Inputs depend only on (seed, problem, size), so every variant and run sees the same ones."""
+    return random.Random(f"{seed}:{problem}:{n}")
+
+
+def make_inputs(problem: str, reference: list[inspect.Parameter], n: int, rng: random.Random) -> dict:
+    if problem in INPUTS:
+        return INPUTS[problem](n, rng)
+    return {p.name: generic_value(p.name, _annotation_text(p.annotation), n, rng) for p in reference}
+
+
+def _arguments(params: list[inspect.Parameter], inputs: dict) -> tuple[list, dict]:
+    """Call arguments for a variant: by name when it uses the same names, else positionally."""
+    names = [p.name for p in params]
+    if all(name in inputs for name in names):
+        return [], {name: inputs[name] for name in names}
+    values = list(inputs.values())
+    if len(values) == len(names):
+        return values, {}
+    # e.g. one variant also takes n: drop the extra leading values
+    return values[len(values) - len(names):], {}
+
+
+# ---------- Running ----------
+
+class _Timeout(BaseException):
+    """Not an Exception, so solutions' own except clauses don't swallow it."""
+
+
+@contextlib.contextmanager
+def _time_limit(seconds: float):
+    """Raise _Timeout in the running call after seconds (POSIX main thread only; no limit elsewhere)."""
+    if not hasattr(signal, "setitimer"):
+        yield
+        return
+
+    def expire(signum, frame):
+        raise _Timeout()
+
+    previous = signal.signal(signal.SIGALRM, expire)
+    signal.setitimer(signal.ITIMER_REAL, seconds)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+def run_variant(variant: Variant, inputs: dict, repeat: int, timeout: float, trace_memory: bool = True) -> dict:
+    """Time one variant on one input: best of repeat, then (optionally) one traced run for peak memory."""
+    params = _parameters(variant)
+    best, result, mutated, peak = math.inf, None, None, None
+    try:
+        for _ in range(repeat):
+            args, kwargs = copy.deepcopy(_arguments(params, inputs))
+            fn = variant.function()
+            with _time_limit(timeout), contextlib.redirect_stdout(None):
+                started = time.perf_counter()
+                result = fn(*args, **kwargs)
+                best = min(best, time.perf_counter() - started)
+            mutated = [*args, *kwargs.values()]
+
+        if trace_memory:
+            args, kwargs = copy.deepcopy(_arguments(params, inputs))
+            fn = variant.function()
+            tracemalloc.start()
+            try:
+                with _time_limit(timeout * 4), contextlib.redirect_stdout(None):
+                    fn(*args, **kwargs)
+                peak = tracemalloc.get_traced_memory()[1]
+            finally:
+                tracemalloc.stop()
+    except _Timeout:
+        return {"status": "timeout"}
+    except RecursionError:
+        return {"status": "RecursionError"}
+    except Exception as e:  # noqa: BLE001 - any failure is a result
+        return {"status": f"{type(e).__name__}: {e}"[:120]}
+    return {
+        "status": "ok",
+        "seconds": best,
+        "peak_kib": round(peak / 1024, 1) if peak is not None else None,
+        # In-place solutions are compared by what they did to their arguments
+        "_output": mutated if result is None else result,
+    }
+
+
+def canonical(value: Any, ordered: bool = True) -> Any:
+    """Comparable form of a result; ordered=False also sorts lists."""
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return (type(value).__name__, *(canonical(getattr(value, f.name), ordered) for f in dataclasses.fields(value)))
+    if isinstance(value, float):
+        return round(value, 6)
+    if isinstance(value, (list, tuple)):
+        items = [canonical(v, ordered) for v in value]
+        if not ordered:
+            with contextlib.suppress(TypeError):
+                items.sort(key=repr)
+        return items
+    if isinstance(value, dict):
+        return {k: canonical(v, ordered) for k, v in value.items()}
+    if isinstance(value, (set, frozenset)):
+        return sorted((canonical(v, ordered) for v in value), key=repr)
+    return value
+
+
+def _agree(outputs: list[Any]) -> bool:
+    if len(outputs) < 2:
+        return True
+    for ordered in (True, False):
+        first = canonical(outputs[0], ordered)
+        if all(canonical(o, ordered) == first for o in outputs[1:]):
+            return True
+    return False
+
+
+def race_problem(problem_dir: Path, sizes: list[int], repeat: int, timeout: float, seed: int) -> dict | None:
+    """Race the variants of one problem; None if it has fewer than two solution files."""
+    if len(solution_files(problem_dir)) < 2:
+        return None
+    variants = load_problem(problem_dir)
+    runnable = [v for v in variants if v.entry]
+    record: dict[str, Any] = {
+        "problem": problem_dir.name,
+        "entry": Counter(v.entry for v in runnable).most_common(1)[0][0] if runnable else None,
+        "sizes": sizes,
+        "variants": {v.name: [] for v in variants},
+        "agree": {},
+        "fastest": {},
+    }
+    for v in variants:
+        if not v.entry:
+            record["variants"][v.name].append({"status": v.error or "no entry point"})
+    if not runnable:
+        record["skipped"] = "no variant could be loaded"
+        return record
+
+    reference = reference_parameters(runnable)
+    given_up: set[str] = set()
+    for n in sizes:
+        try:
+            inputs = make_inputs(problem_dir.name, reference, n, input_rng(seed, problem_dir.name, n))
+        except TypeError as e:
+            record["skipped"] = str(e)
+            break
+        outputs = {}
+        for v in runnable:
+            if v.name in given_up:
+                record["variants"][v.name].append({"size": n, "status": "skipped"})
+                continue
+            result = run_variant(v, inputs, repeat, timeout)
+            if result["status"] == "ok":
+                outputs[v.name] = result.pop("_output")
+            else:
+                given_up.add(v.name)
+            record["variants"][v.name].append({"size": n, **result})
+        if outputs:
+            record["agree"][str(n)] = _agree(list(outputs.values()))
+            timings = {name: record["variants"][name][-1]["seconds"] for name in outputs}
+            record["fastest"][str(n)] = min(timings, key=timings.get)
+    return record
+
+
+# ---------- Report ----------
+
+def _format_seconds(seconds: float) -> str:
+    if seconds < 1e-3:
+        return f"{seconds * 1e6:.1f}µs"
+    if seconds < 1:
+        return f"{seconds * 1e3:.1f}ms"
+    return f"{seconds:.2f}s"
+
+
+def print_record(record: dict) -> None:
+    print(f"\n🏁 {record['problem']} • entry {record['entry']}")
+    if record.get("skipped"):
+        print(f"   skipped: {record['skipped']}")
+    sizes = [n for n in record["sizes"] if str(n) in record["agree"]]
+    if not sizes:
+        for name, results in record["variants"].items():
+            if results:
+                print(f"   {name}: {results[0]['status']}")
+        return
+    width = max(map(len, record["variants"]))
+    print(f"   {'variant':<{width}}" + "".join(f"{'n=' + str(n):>22}" for n in sizes))
+    for name, results in record["variants"].items():
+        by_size = {r.get("size"): r for r in results}
+        cells = []
+        for n in sizes:
+            r = by_size.get(n) or (results[0] if results and "size" not in results[0] else {"status": "-"})
+            if r["status"] == "ok":
+                cells.append(f"{_format_seconds(r['seconds'])} {r['peak_kib']:.0f}KiB")
+            else:
+                cells.append(r["status"][:20])
+        print(f"   {name:<{width}}" + "".join(f"{cell:>22}" for cell in cells))
+    print(f"   {'fastest':<{width}}" + "".join(f"{record['fastest'][str(n)][:20]:>22}" for n in sizes))
+    disagree = [str(n) for n in sizes if not record["agree"][str(n)]]
+    if disagree:
+        print(f"   ⚠️  variants disagree at n={', '.join(disagree)}")
+
+
+def problem_dirs(selectors: list[str]) -> list[Path]:
+    """Problem directories by slug or number prefix (all problems when none are given)."""
+    dirs = sorted(p for p in PROBLEMS_DIR.iterdir() if p.is_dir() and not p.name.startswith((".", "_")))
+    if not selectors:
+        return dirs
+    selected = []
+    for selector in selectors:
+        matches = [p for p in dirs if p.name == selector or (selector.isdigit() and p.name.startswith(f"{selector}-"))]
+        if not matches:
+            raise SystemExit(f"❌ Problem not found: {selector}")
+        selected += matches
+    return selected
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Race every solution variant of each problem on size-scaled inputs.")
+    ap.add_argument("problems", nargs="*", help="Problem slugs or numbers (default: every problem with several variants)")
+    ap.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)),
+                    help=f"Comma-separated input sizes (default: {','.join(map(str, DEFAULT_SIZES))})")
+    ap.add_argument("--repeat", type=int, default=3, help="Timed runs per variant and size; the fastest counts (default: 3)")
+    ap.add_argument("--timeout", type=float, default=2.0,
+                    help="Seconds before a call is abandoned; the variant then skips larger sizes (default: 2)")
+    ap.add_argument("--seed", type=int, default=0, help="Seed for the generated inputs (default: 0)")
+    ap.add_argument("--out", type=Path, default=DEFAULT_OUT, help=f"Append results as JSON lines here (default: {DEFAULT_OUT})")
+    args = ap.parse_args()
+    sizes = sorted({int(s) for s in args.sizes.split(",") if s.strip()})
+
+    records = []
+    for problem_dir in problem_dirs(args.problems):
+        record = race_problem(problem_dir, sizes, args.repeat, args.timeout, args.seed)
+        if record is None:
+            if args.problems:
+                print(f"\n🏁 {problem_dir.name}: only one solution file, nothing to race")
+            continue
+        record["started_at"] = datetime.now(UTC).isoformat(timespec="seconds")
+        print_record(record)
+        records.append(record)
+
+    args.out.parent.mkdir(parents=True, exist_ok=True)
+    with open(args.out, "a", encoding="utf-8") as fp:
+        for record in records:
+            fp.write(json.dumps(record) + "\n")
+    print(f"\nResults for {len(records)} problems appended to {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
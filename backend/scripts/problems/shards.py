@@ -0,0 +1,297 @@
+#!/usr/bin/env python3
+"""
+Per-problem JSON fragments for the large extracted-metadata outputs.
+
+uses.json and problems_metadata.json are also written as one fragment per
+problem under lib/extracted-metadata/shards/<output name>/, plus a manifest
+listing the fragments in output order and where each one sits in the combined
+file:
+
+  shards/uses/manifest.json              {"format": 3, "combined": {"size": ..., "mtime_ns": "..."},
+                                          "shards": ["_core", ...], "spans": {"_core": [2, 5120], ...}}
+  shards/uses/1-two-sum.json             {"problems/1-two-sum/solution.py": [...]}
+  shards/uses/_core.json                 files outside problems/ ("_<top-level dir>", or "_root")
+  shards/problems_metadata/1-two-sum.json
+
+A full run writes each fragment and the combined file from the same text, in
+one pass. A single-problem run writes only the fragments it changes and patches
+the combined file in place: the bytes before the first changed span are left
+alone (unread), and only the rest of the file is rewritten. Fragments are laid
+out so the patched file is byte-identical to a full write, and the static
+imports of the combined files keep working.
+
+The combined file stays the source of truth: the fragments are not committed,
+and the manifest records the size and mtime of the combined file they match.
+When the combined file no longer matches (edited, checked out, or written by an
+older run), the fragments are stale and are rebuilt from it first. Checking
+that takes a stat, not a read.
+
+The consumer-side loader is lib/extracted-metadata-shards.ts.
+"""
+
+import bisect
+import io
+import json
+from collections.abc import Callable
+from pathlib import Path
+
+from json_writer import dump_compact_arrays, dump_range_index
+
+SHARDS_FORMAT = 3
+MANIFEST = "manifest.json"
+CORE_SHARD = "_core"
+ROOT_SHARD = "_root"
+# Between two fragments' spans in either combined file
+SEPARATOR = ",\n"
+
+
+def shard_dir(out: Path) -> Path:
+    """Fragment directory of a combined output, e.g. shards/uses for uses.json."""
+    return out.parent / "shards" / out.stem
+
+
+def file_shard(rel_path: str) -> str:
+    """'problems/<slug>/...' -> '<slug>'; 'core/...' -> '_core'; top-level files -> '_root'."""
+    parts = rel_path.split("/")
+    if len(parts) == 1:
+        return ROOT_SHARD
+    if parts[0] == "problems" and len(parts) > 2:
+        return parts[1]
+    return "_" + parts[0]
+
+
+def _shard_order(shard: str) -> tuple[str, ...]:
+    """Path parts of a shard's entries; ordering shards by it keeps entries in scan (Path) order."""
+    if shard == ROOT_SHARD:
+        return ("",)
+    return (shard[1:],) if shard.startswith("_") else ("problems", shard)
+
+
+def combined_stamp(path: Path) -> dict | None:
+    """Size and mtime of a combined file, which stand in for its content."""
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return None
+    # A string: nanoseconds since the epoch do not fit a JavaScript number
+    return {"size": stat.st_size, "mtime_ns": str(stat.st_mtime_ns)}
+
+
+def read_manifest(directory: Path, out: Path) -> dict | None:
+    """The manifest ("shards" in output order, "spans" in out), or None if there is no manifest
+    or the fragments were not written with the current combined file out."""
+    path = directory / MANIFEST
+    if not path.exists():
+        return None
+    data = json.loads(path.read_text(encoding="utf-8"))
+    if data.get("format") != SHARDS_FORMAT:
+        return None
+    if data.get("combined") != combined_stamp(out):
+        return None
+    return data
+
+
+def write_manifest(directory: Path, shards: list[str], spans: dict[str, list[int]], out: Path) -> None:
+    """Record the fragments, their byte spans in out, and out's stamp as just written."""
+    directory.mkdir(parents=True, exist_ok=True)
+    manifest = {"format": SHARDS_FORMAT, "combined": combined_stamp(out), "shards": shards, "spans": spans}
+    (directory / MANIFEST).write_text(json.dumps(manifest, indent=2) + "\n", encoding="utf-8")
+
+
+def _fragment(directory: Path, shard: str) -> Path:
+    return directory / f"{shard}.json"
+
+
+def _delete_unlisted(directory: Path, shards: list[str]) -> None:
+    """Delete fragments that are no longer listed (including those of a stale manifest)."""
+    keep = {f"{shard}.json" for shard in shards} | {MANIFEST}
+    for path in directory.glob("*.json"):
+        if path.name not in keep:
+            path.unlink()
+
+
+def _dumps(dump: Callable, value, *args) -> str:
+    fp = io.StringIO()
+    dump(value, fp, *args)
+    return fp.getvalue()
+
+
+def _write_combined(out: Path, head: str, pieces: dict[str, str], tail: str) -> dict[str, list[int]]:
+    """Write head + the pieces joined by SEPARATOR + tail; return each piece's byte span."""
+    spans: dict[str, list[int]] = {}
+    with open(out, "wb") as fp:
+        pos = fp.write(head.encode("utf-8"))
+        for i, (shard, piece) in enumerate(pieces.items()):
+            if i:
+                pos += fp.write(SEPARATOR.encode("utf-8"))
+            start, pos = pos, pos + fp.write(piece.encode("utf-8"))
+            spans[shard] = [start, pos]
+        fp.write(tail.encode("utf-8"))
+    return spans
+
+
+def _patch_combined(
+    out: Path, spans: dict[str, list[int]], order: list[str], changed: dict[str, str | None]
+) -> dict[str, list[int]]:
+    """Replace, insert (changed[shard] = text) or drop (None) pieces of out in place; return the new spans.
+
+    spans are the current pieces in file order and order the new one; neither may be
+    empty. Only the file from the first affected piece on is read and rewritten.
+    """
+    old = list(spans)
+    first = len(old) - 1
+    for shard in changed:
+        if shard in spans:
+            first = min(first, old.index(shard))
+        else:
+            # A new piece goes before the first current piece that follows it
+            following = [old.index(s) for s in order[order.index(shard) + 1:] if s in spans]
+            first = min(first, following[0] if following else len(old) - 1)
+    # The pieces before `first` are unchanged, so order starts with them too
+    region = order[first:]
+    cut = spans[old[first]][0] if region else spans[old[first - 1]][1]
+
+    with open(out, "r+b") as fp:
+        fp.seek(cut)
+        rest = fp.read()
+        new_spans = {shard: spans[shard] for shard in order[:first]}
+        pieces = []
+        pos = cut
+        for i, shard in enumerate(region):
+            if shard in changed:
+                piece = changed[shard].encode("utf-8")
+            else:
+                start, end = spans[shard]
+                piece = rest[start - cut:end - cut]
+            if i:
+                pieces.append(SEPARATOR.encode("utf-8"))
+                pos += len(SEPARATOR)
+            pieces.append(piece)
+            new_spans[shard] = [pos, pos + len(piece)]
+            pos += len(piece)
+        pieces.append(rest[spans[old[-1]][1] - cut:])
+        fp.seek(cut)
+        fp.write(b"".join(pieces))
+        fp.truncate()
+    return new_spans
+
+
+# ---------- uses.json (file -> [entry, ...]) ----------
+
+def _group_by_shard(index: dict[str, list]) -> dict[str, dict[str, list]]:
+    groups: dict[str, dict[str, list]] = {}
+    for rel_path, entries in index.items():
+        groups.setdefault(file_shard(rel_path), {})[rel_path] = entries
+    return groups
+
+
+def _write_range_fragment(directory: Path, shard: str, group: dict[str, list]) -> str:
+    """Write a fragment ('{\\n<entries>\\n}'); return its span in the combined file ('<entries>')."""
+    text = _dumps(dump_range_index, group)
+    _fragment(directory, shard).write_text(text, encoding="utf-8")
+    return text[2:-2]
+
+
+def write_sharded_index(out: Path, index: dict[str, list], problem: str | None = None) -> None:
+    """Write uses.json-style output as per-problem fragments plus the combined file.
+
+    With problem set, only that problem's fragment is replaced; entries for other
+    files in the index (core modules the problem imports) are merged into their
+    own fragments.
+    """
+    directory = shard_dir(out)
+    manifest = read_manifest(directory, out)
+    groups = _group_by_shard(index)
+
+    if problem and manifest and manifest["spans"]:
+        shards = list(manifest["shards"])
+        changed: dict[str, str | None] = {}
+        for shard, group in {problem: {}, **groups}.items():
+            path = _fragment(directory, shard)
+            if shard != problem and path.exists():
+                group = {**json.loads(path.read_text(encoding="utf-8")), **group}
+            if group:
+                changed[shard] = _write_range_fragment(directory, shard, group)
+                if shard not in shards:
+                    bisect.insort(shards, shard, key=_shard_order)
+            elif shard in shards:
+                changed[shard] = None
+                shards.remove(shard)
+                path.unlink()
+        if shards:
+            spans = _patch_combined(out, manifest["spans"], shards, changed)
+            write_manifest(directory, shards, spans, out)
+            return
+
+    if problem:
+        # No current fragments for this combined file: rebuild them from it
+        if out.exists():
+            existing = json.loads(out.read_text(encoding="utf-8"))
+            prefix = f"problems/{problem}/"
+            existing = {k: v for k, v in existing.items() if not k.startswith(prefix)}
+            existing.update(index)
+            index = existing
+        groups = _group_by_shard(index)
+
+    directory.mkdir(parents=True, exist_ok=True)
+    shards = sorted(groups, key=_shard_order)
+    pieces = {shard: _write_range_fragment(directory, shard, groups[shard]) for shard in shards}
+    _delete_unlisted(directory, shards)
+    spans = _write_combined(out, "{\n", pieces, "\n}")
+    write_manifest(directory, shards, spans, out)
+
+
+# ---------- problems_metadata.json ({"problems": {...}, "core": {...}}) ----------
+
+def _write_problem_fragment(directory: Path, slug: str, data: dict) -> str:
+    # Fragments are indented for their position in the combined file so splicing is verbatim
+    text = _dumps(dump_compact_arrays, data, 2)
+    _fragment(directory, slug).write_text(text, encoding="utf-8")
+    return f"    {json.dumps(slug, ensure_ascii=False)}: {text}"
+
+
+def write_sharded_problems_metadata(
+    out: Path,
+    problems: dict[str, dict],
+    core: dict[str, dict] | None = None,
+    problem: str | None = None,
+) -> None:
+    """Write problems_metadata.json as one fragment per problem (core in _core) plus the combined file.
+
+    With problem set, only that problem's fragment is replaced and core is left as-is.
+    """
+    directory = shard_dir(out)
+    manifest = read_manifest(directory, out)
+
+    if problem and manifest and manifest["spans"]:
+        shards = list(manifest["shards"])
+        changed: dict[str, str | None] = {}
+        for slug, data in problems.items():
+            changed[slug] = _write_problem_fragment(directory, slug, data)
+            if slug not in shards:
+                shards = [CORE_SHARD, *sorted([s for s in shards if s != CORE_SHARD] + [slug])]
+        order = [s for s in shards if s != CORE_SHARD]
+        spans = _patch_combined(out, manifest["spans"], order, changed)
+        write_manifest(directory, shards, spans, out)
+        return
+
+    if problem:
+        # No current fragments for this combined file: rebuild them from it
+        existing = {"problems": {}, "core": {}}
+        if out.exists():
+            existing = json.loads(out.read_text(encoding="utf-8"))
+        existing["problems"].update(problems)
+        problems, core = existing["problems"], existing["core"]
+
+    directory.mkdir(parents=True, exist_ok=True)
+    pieces = {slug: _write_problem_fragment(directory, slug, data) for slug, data in problems.items()}
+    core_text = _dumps(dump_compact_arrays, core or {}, 1)
+    _fragment(directory, CORE_SHARD).write_text(core_text, encoding="utf-8")
+    shards = [CORE_SHARD, *problems]
+    _delete_unlisted(directory, shards)
+
+    head, tail = '{\n  "problems": {\n', f'\n  }},\n  "core": {core_text}\n}}'
+    if not pieces:
+        head, tail = '{\n  "problems": {}', f',\n  "core": {core_text}\n}}'
+    spans = _write_combined(out, head, pieces, tail)
+    write_manifest(directory, shards, spans, out)
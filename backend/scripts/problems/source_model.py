@@ -0,0 +1,314 @@
+#!/usr/bin/env python3
+"""
+Shared per-file source model for the metadata generators.
+
+Every generator needs the same handful of artifacts for a solution file: the raw
+source text, the cleaned text (docstrings/comments removed), the AST of either,
+and the parsed docstring sections of its functions and classes. A SourceFile
+computes each artifact lazily and at most once, so a single process can feed all
+generators from one read/clean/parse per file.
+
+Used by generate_all_metadata.py and by the per-file entry points of the
+individual generators.
+
+ModuleGraph is the workspace-level counterpart: every module under the scan
+root, so imports can be resolved to the module names the generators use in
+qnames.
+"""
+
+import ast
+import contextlib
+import hashlib
+import posixpath
+from dataclasses import dataclass, field
+from functools import cache, cached_property
+from pathlib import Path
+from typing import Any
+
+import profiling
+from code_cleaner import clean_code_with_comments
+from docstring_parser import extract_metadata
+
+
+@dataclass
+class SourceFile:
+    """A Python file plus lazily computed, memoized analysis artifacts."""
+
+    path: Path
+    root: Path
+    text: str
+    _cleaned: dict[tuple[bool, bool], tuple[str, dict[int, str]]] = field(default_factory=dict, repr=False)
+    _sections: dict[int, dict[str, Any]] = field(default_factory=dict, repr=False)
+
+    @classmethod
+    def load(cls, path: Path, root: Path | None = None) -> SourceFile:
+        """Read a file from disk; root defaults to the file's directory."""
+        path = path.resolve()
+        root = (root or path.parent).resolve()
+        with profiling.stage("read"):
+            text = path.read_text(encoding="utf-8")
+        return cls(path=path, root=root, text=text)
+
+    @cached_property
+    def rel_path(self) -> str:
+        """Path relative to the scan root, e.g. 'problems/1-two-sum/solution.py'."""
+        return str(self.path.relative_to(self.root))
+
+    @cached_property
+    def module(self) -> str:
+        """Dotted module name relative to the scan root."""
+        return module_name(self.root, self.path)
+
+    @cached_property
+    def tree(self) -> ast.Module:
+        """AST of the raw source (docstrings intact)."""
+        with profiling.stage("parse"):
+            return ast.parse(self.text)
+
+    @cached_property
+    def cleaned_text(self) -> str:
+        """Source with docstrings and all comments removed (clean_code defaults)."""
+        return self.cleaned()
+
+    @cached_property
+    def cleaned_tree(self) -> ast.Module:
+        """AST of cleaned_text; its positions match the rendered code."""
+        cleaned_text = self.cleaned_text
+        with profiling.stage("parse"):
+            return ast.parse(cleaned_text)
+
+    def cleaned(
+        self,
+        remove_inline_end_of_line_comments: bool = True,
+        remove_inline_full_line_comments: bool = True,
+    ) -> str:
+        """clean_code() output for the given comment options, memoized per option pair."""
+        return self._clean(remove_inline_end_of_line_comments, remove_inline_full_line_comments)[0]
+
+    def comments(
+        self,
+        remove_inline_end_of_line_comments: bool = True,
+        remove_inline_full_line_comments: bool = True,
+    ) -> dict[int, str]:
+        """Comments kept in cleaned() for the same options: cleaned line (0-based) -> text."""
+        return self._clean(remove_inline_end_of_line_comments, remove_inline_full_line_comments)[1]
+
+    def _clean(self, *key: bool) -> tuple[str, dict[int, str]]:
+        # Text and comments come from the same tokenize pass, so asking for both is one clean
+        if key not in self._cleaned:
+            with profiling.stage("clean"):
+                self._cleaned[key] = clean_code_with_comments(self.text, *key)
+        return self._cleaned[key]
+
+    def sections(self, node: ast.AST) -> dict[str, Any]:
+        """Parsed docstring sections of a node from self.tree, memoized per node."""
+        key = id(node)
+        if key not in self._sections:
+            with profiling.stage("docstrings"):
+                raw = ast.get_docstring(node, clean=True) or ""
+                self._sections[key] = extract_metadata(raw, node) if raw.strip() else {}
+        return self._sections[key]
+
+
+class SourceCache:
+    """Path -> SourceFile map so each file is read and analyzed once per run."""
+
+    def __init__(self, root: Path):
+        self.root = root.resolve()
+        self._files: dict[Path, SourceFile] = {}
+
+    def get(self, path: Path) -> SourceFile:
+        """Return the SourceFile for path, loading it on first access."""
+        path = path.resolve()
+        src = self._files.get(path)
+        if src is None:
+            try:
+                path.relative_to(self.root)
+                root = self.root
+            except ValueError:
+                root = path.parent
+            src = self._files[path] = SourceFile.load(path, root)
+        return src
+
+
+# Import prefixes that name the scan root itself (imports written from the repository root)
+ROOT_PACKAGE_PREFIXES = ("backend.algorithms.", "algorithms.")
+
+
+def module_name(root: Path, path: Path) -> str:
+    """Dotted module name of path relative to root ('core/Tree/__init__.py' -> 'core.Tree.__init__')."""
+    parts = list(path.relative_to(root).parts)
+    parts[-1] = parts[-1].removesuffix(".py")
+    return ".".join(parts)
+
+
+class ModuleGraph:
+    """Every module under a scan root (module name -> file) and, lazily, the names each one defines.
+
+    Built once per run from a directory walk and shared by every file's import
+    resolution. resolve() answers each distinct (importer, import, sys.path
+    additions) from a memo, so repeated imports cost a dict lookup.
+    """
+
+    def __init__(self, root: Path, files: list[Path]):
+        self.root = root.resolve()
+        self.files: dict[str, Path] = {}
+        for path in files:
+            name = module_name(self.root, path.resolve())
+            self.files[name] = path
+            # A package resolves to its __init__ module, which is how its qnames are written
+            if name.endswith(".__init__"):
+                self.files.setdefault(name.removesuffix(".__init__"), path)
+        self._exports: dict[str, frozenset[str]] = {}
+        self._resolved: dict[tuple[str, str, tuple[str, ...]], str] = {}
+
+    @classmethod
+    def scan(cls, root: Path) -> ModuleGraph:
+        return cls(root, iter_py(root))
+
+    @cached_property
+    def fingerprint(self) -> str:
+        """Hash of the module set; resolution results are only valid for the same set."""
+        return hashlib.sha256("\n".join(sorted(self.files)).encode("utf-8")).hexdigest()[:16]
+
+    def canonical(self, name: str) -> str | None:
+        """Workspace module name for a module in the graph ('core.Tree' -> 'core.Tree.__init__')."""
+        path = self.files.get(name)
+        return None if path is None else module_name(self.root, path.resolve())
+
+    def exports(self, module: str) -> frozenset[str]:
+        """Top-level names a workspace module defines or imports (empty if unknown or unparsable)."""
+        names = self._exports.get(module)
+        if names is None:
+            names = frozenset()
+            path = self.files.get(module)
+            if path is not None:
+                with contextlib.suppress(OSError, SyntaxError, ValueError):
+                    names = frozenset(_top_level_names(ast.parse(path.read_text(encoding="utf-8"))))
+            self._exports[module] = names
+        return names
+
+    def exports_digest(self, module: str) -> str:
+        """Hash of a module's exports; a dependent's cached output is valid while it is unchanged."""
+        return hashlib.sha256("\n".join(sorted(self.exports(module))).encode("utf-8")).hexdigest()[:16]
+
+    def resolve(self, importer: str, module: str, search_dirs: tuple[str, ...] = ()) -> str:
+        """Workspace module name that `import module` in module importer refers to.
+
+        Tried in order: the name as-is relative to the root (with any
+        'backend.algorithms.' / 'algorithms.' prefix removed), a module next to the
+        importer (the script directory is on sys.path), then the importer's
+        sys.path additions (paths relative to its directory). The importer itself
+        is never a match. Anything else, such as the standard library, is returned
+        unchanged.
+        """
+        key = (importer, module, search_dirs)
+        resolved = self._resolved.get(key)
+        if resolved is None:
+            resolved = self._resolve(importer, module, search_dirs)
+            self._resolved[key] = resolved
+        return resolved
+
+    def _resolve(self, importer: str, module: str, search_dirs: tuple[str, ...]) -> str:
+        package = importer.rpartition(".")[0]
+        candidates = [module]
+        for prefix in ROOT_PACKAGE_PREFIXES:
+            if module.startswith(prefix):
+                candidates.insert(0, module.removeprefix(prefix))
+        if package:
+            candidates.append(f"{package}.{module}")
+        package_dir = package.replace(".", "/")
+        for added in search_dirs:
+            target = posixpath.normpath(posixpath.join(package_dir, added))
+            if target != "." and not target.startswith(".."):
+                candidates.append(f"{target.replace('/', '.')}.{module}")
+
+        for candidate in candidates:
+            name = self.canonical(candidate)
+            if name is not None and name != importer:
+                return name
+        return module
+
+
+def _top_level_names(tree: ast.Module) -> set[str]:
+    names: set[str] = set()
+    for node in tree.body:
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            names.add(node.name)
+        elif isinstance(node, (ast.Import, ast.ImportFrom)):
+            names.update((a.asname or a.name).split(".", 1)[0] for a in node.names if a.name != "*")
+        elif isinstance(node, (ast.Assign, ast.AnnAssign, ast.AugAssign)):
+            targets = node.targets if isinstance(node, ast.Assign) else [node.target]
+            for target in targets:
+                names.update(n.id for n in ast.walk(target) if isinstance(n, ast.Name))
+    return names
+
+
+@cache
+def module_graph(root: Path) -> ModuleGraph:
+    """ModuleGraph of root, scanned once per process (for the standalone generators)."""
+    return ModuleGraph.scan(root)
+
+
+def iter_py(root: Path) -> list[Path]:
+    """All .py files under root (skip hidden dirs and __pycache__)."""
+    root = root.resolve()
+    out: list[Path] = []
+    for p in root.rglob("*.py"):
+        if not p.is_file():
+            continue
+        parts = p.parts
+        if "__pycache__" in parts or any(seg.startswith(".") for seg in parts):
+            continue
+        out.append(p)
+    return out
+
+
+def _imported_core_files(root: Path, files: list[Path]) -> list[Path]:
+    """algorithms.core modules imported by files, resolved to paths under root/core."""
+    found: list[Path] = []
+    for f in files:
+        try:
+            tree = ast.parse(f.read_text(encoding="utf-8"))
+        except (OSError, SyntaxError):
+            continue
+        for node in ast.walk(tree):
+            if isinstance(node, ast.ImportFrom) and node.module:
+                names = [node.module]
+            elif isinstance(node, ast.Import):
+                names = [a.name for a in node.names]
+            else:
+                continue
+            for name in names:
+                # backend.algorithms.core.X / algorithms.core.X / core.X -> core/X
+                for prefix in ("backend.algorithms.", "algorithms."):
+                    name = name.removeprefix(prefix)
+                if not name.startswith("core."):
+                    continue
+                base = root.joinpath(*name.split("."))
+                for candidate in (base.with_suffix(".py"), base / "__init__.py"):
+                    if candidate.is_file() and candidate not in found:
+                        found.append(candidate)
+    return found
+
+
+def iter_problem_py(root: Path, problem: str, include_imports: bool = True) -> list[Path]:
+    """.py files of a single problem, plus the core modules they import.
+
+    Only the problem directory is enumerated, so the cost is proportional to the
+    problem rather than to the whole tree.
+    """
+    root = root.resolve()
+    problem_dir = root / "problems" / problem
+    if not problem_dir.is_dir():
+        print(f"Warning: problem directory not found: {problem_dir}")
+        return []
+    files = iter_py(problem_dir)
+    if include_imports:
+        files += [f for f in _imported_core_files(root, files) if f not in files]
+    return files
+
+
+def scan_files(root: Path, problem: str | None = None) -> list[Path]:
+    """Sorted .py files to process: the whole tree, or just one problem (and its core imports)."""
+    return sorted(iter_problem_py(root, problem) if problem else iter_py(root))
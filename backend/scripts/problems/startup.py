@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Import-time check for the `python3 -m scripts.problems` commands.
+
+For each command, a fresh interpreter imports the dispatcher and that command's
+script under `python -X importtime`. Modules the dispatcher already imported are
+subtracted, which leaves what the command itself costs before its main() runs.
+The dispatcher is measured the same way against a bare interpreter.
+The fastest of --runs is kept, since startup noise only ever adds time.
+
+The interactive commands have a budget: they must stay under STARTUP_BUDGET_MS
+and must not import any of HEAVY_MODULES. Exceeding either is reported as a
+regression and makes the run exit with status 1, so it can gate CI. The other
+commands are measured and reported only.
+
+CLI:
+  python3 -m scripts.problems startup [list create ...] [--runs 5] [--json]
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+
+from cli import COMMANDS, HERE
+
+DISPATCHER = "(dispatcher)"
+# Interactive commands -> import budget in ms (on top of the dispatcher, which has its own)
+STARTUP_BUDGET_MS = {
+    DISPATCHER: 5.0,
+    "list": 5.0,
+    "create": 5.0,
+}
+# Modules that must stay out of the interactive commands
+HEAVY_MODULES = ("argparse", "ast", "json", "re", "dataclasses", "pathlib", "psycopg2", "dotenv")
+
+
+def _import_times(code: str) -> dict[str, int] | None:
+    """Module -> self import time (µs) when running code in a fresh interpreter; None if it fails."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import sys; sys.path.insert(0, {HERE!r}); {code}"],
+        capture_output=True, text=True,
+    )
+    if proc.returncode != 0:
+        return None
+    times: dict[str, int] = {}
+    for line in proc.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, _, name = line.removeprefix("import time:").split("|")
+        times[name.strip()] = times.get(name.strip(), 0) + int(self_us)
+    return times
+
+
+def _cost(base: str, code: str, runs: int) -> dict[str, int] | None:
+    """Self import time (µs) of the modules code imports beyond base (fastest of runs); None if either fails."""
+    best = None
+    for _ in range(runs):
+        baseline = _import_times(base)
+        loaded = _import_times(code)
+        if baseline is None or loaded is None:
+            return None
+        modules = {name: us for name, us in loaded.items() if name not in baseline}
+        if best is None or sum(modules.values()) < sum(best.values()):
+            best = modules
+    return best
+
+
+def _result(name: str, modules: dict[str, int]) -> dict:
+    heaviest = sorted(modules.items(), key=lambda kv: kv[1], reverse=True)
+    return {
+        "command": name,
+        "ms": round(sum(modules.values()) / 1000, 2),
+        "modules": len(modules),
+        "heaviest": [{"module": module, "ms": round(us / 1000, 2)} for module, us in heaviest[:5]],
+        "heavy_imports": sorted(module for module in modules if module.split(".")[0] in HEAVY_MODULES),
+    }
+
+
+def measure(command: str, runs: int = 5) -> dict | None:
+    """Import cost of one command on top of the dispatcher; None if it cannot be imported."""
+    modules = _cost("import cli", f"import cli; cli.load({command!r})", runs)
+    return None if modules is None else _result(command, modules)
+
+
+def measure_dispatcher(runs: int = 5) -> dict:
+    """Import cost of the dispatcher itself on top of a bare interpreter."""
+    return _result(DISPATCHER, _cost("pass", "import cli", runs))
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Measure the problem commands' import time and check the startup budget.")
+    ap.add_argument("commands", nargs="*", metavar="command", help="Commands to measure (default: all)")
+    ap.add_argument("--runs", type=int, default=5, help="Fresh interpreters per command; the fastest counts (default: 5)")
+    ap.add_argument("--json", action="store_true", help="Print the results as JSON")
+    args = ap.parse_args()
+    unknown = [c for c in args.commands if c not in COMMANDS]
+    if unknown:
+        ap.error(f"unknown command(s) {', '.join(unknown)}; choose from {', '.join(COMMANDS)}")
+
+    results = []
+    failures = []
+    for command in [DISPATCHER, *(args.commands or COMMANDS)]:
+        result = measure_dispatcher(args.runs) if command == DISPATCHER else measure(command, args.runs)
+        if result is None:
+            # e.g. sync-db without psycopg2 installed
+            results.append({"command": command, "error": "import failed"})
+            if command in STARTUP_BUDGET_MS:
+                failures.append(f"{command}: import failed")
+            continue
+        budget = STARTUP_BUDGET_MS.get(command)
+        result["budget_ms"] = budget
+        if budget is not None:
+            if result["ms"] > budget:
+                failures.append(f"{command}: {result['ms']:.1f} ms > {budget:.1f} ms budget")
+            if result["heavy_imports"]:
+                failures.append(f"{command}: imports {', '.join(result['heavy_imports'])}")
+        results.append(result)
+
+    if args.json:
+        print(json.dumps({"results": results, "failures": failures}, indent=2))
+    else:
+        print("   command              import ms    budget  heaviest")
+        for r in results:
+            if "error" in r:
+                print(f"   {r['command']:<20} {'-':>9}  {'':>8}  {r['error']}")
+                continue
+            budget = f"{r['budget_ms']:.1f}" if r["budget_ms"] is not None else ""
+            heaviest = ", ".join(f"{h['module']} {h['ms']:.1f}" for h in r["heaviest"][:3])
+            print(f"   {r['command']:<20} {r['ms']:>9.1f}  {budget:>8}  {heaviest}")
+
+    if failures:
+        print("❌ Startup budget exceeded:", *failures, sep="\n   ", file=sys.stderr)
+        return 1
+    if not args.json:
+        print("✅ Interactive commands within the startup budget")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -10,14 +10,25 @@ Reads directly from Python files (not JSON) and extracts:
 Schema:
 1. problems table: Problem metadata from __init__.py
 2. solutions table: Code + analysis from *.py files
+
+By default problems are parsed in worker processes while a writer thread sends
+them to the database in batches with multi-row upserts (pipeline_sync), all in a
+single transaction, so a full sync costs a handful of round trips instead of
+several per row and parsing overlaps network latency. Rows are compared to the database by
+content digest first, and only new or changed rows are written (--dry-run prints
+that plan without writing). --per-problem keeps the old statement-per-row,
+commit-per-problem behaviour.
 """
 
 import os
 import sys
 import ast
+import hashlib
 import json
 import re
 import argparse
+import queue
+import threading
 from pathlib import Path
 from datetime import datetime
 import psycopg2
@@ -30,7 +41,14 @@ load_dotenv(env_path)
 
 # Import code cleaner
 sys.path.append(str(Path(__file__).parent))
+import profiling
 from code_cleaner import clean_code
+from docstring_parser import parse_simple_docstring
+from parallel import parallel_imap, resolve_jobs
+
+# Problems per write batch, and how many parsed batches may wait for the writer
+BATCH_SIZE = 50
+QUEUE_BATCHES = 2
 
 
 def get_db_connection():
@@ -50,112 +68,6 @@ def get_db_connection():
     return psycopg2.connect(database_url)
 
 
-def _process_section_lines(lines: list[tuple[str, str] | str]) -> str:
-    """Process section lines and convert to MDX-ready indentation."""
-    if not lines:
-        return ""
-
-    processed_lines = []
-
-    # Convert any string entries to tuples for consistency
-    normalized_lines = []
-    for line in lines:
-        if isinstance(line, str):
-            if line == "":
-                normalized_lines.append(("", ""))
-            else:
-                normalized_lines.append(("", line))
-        else:
-            normalized_lines.append(line)
-
-    # Find base indentation (minimum indentation among non-empty lines)
-    base_indent = float('inf')
-    for indent, content in normalized_lines:
-        if content.strip() and indent:
-            base_indent = min(base_indent, len(indent))
-
-    if base_indent == float('inf'):
-        base_indent = 0
-
-    # Process all lines, mapping to MDX indentation
-    for indent, content in normalized_lines:
-        if not content.strip():  # Empty line
-            processed_lines.append("")
-            continue
-
-        # Calculate original indentation level
-        original_indent = len(indent) if indent else 0
-
-        # Same-line content (no indent) stays at 0
-        if original_indent == 0:
-            processed_lines.append(content)
-            continue
-
-        # Calculate relative indent from base
-        relative_indent = original_indent - base_indent
-
-        # Mapping: preserve relative indentation as-is
-        # - Items at base level (relative 0) → 0 spaces
-        # - Items one level deeper (relative 4) → 4 spaces
-        # - And so on...
-        processed_lines.append(' ' * relative_indent + content)
-
-    return '\n'.join(processed_lines).strip()
-
-
-def parse_simple_docstring(docstring: str, expected_sections: list[str]) -> dict[str, str]:
-    """Parse simplified docstring format extracting sections."""
-    if not docstring:
-        return {}
-
-    result = {}
-    lines = docstring.strip().splitlines()
-    current_section = None
-    current_lines = []
-
-    for line in lines:
-        stripped = line.strip()
-        if not stripped:
-            if current_section and current_lines:
-                current_lines.append("")
-            continue
-
-        # Check if this line starts a new section
-        section_found = False
-        for section in expected_sections:
-            if stripped.lower().startswith(f"{section.lower()}:"):
-                # Process previous section if exists
-                if current_section and current_lines:
-                    processed_content = _process_section_lines(current_lines)
-                    if processed_content:
-                        result[current_section.lower().replace(' ', '_')] = processed_content
-
-                # Start new section
-                current_section = section
-                current_lines = []
-
-                # Check if value is on the same line
-                value_part = stripped[len(f"{section}:"):].strip()
-                if value_part:
-                    current_lines.append((" " * 0, value_part))  # No indentation for same-line content
-
-                section_found = True
-                break
-
-        if not section_found and current_section:
-            # This line belongs to current section - store with original indentation
-            leading_spaces = len(line) - len(line.lstrip())
-            current_lines.append((line[:leading_spaces], stripped))
-
-    # Don't forget the last section
-    if current_section and current_lines:
-        processed_content = _process_section_lines(current_lines)
-        if processed_content:
-            result[current_section.lower().replace(' ', '_')] = processed_content
-
-    return result
-
-
 def extract_problem_from_init(init_file: Path) -> dict:
     """Extract problem metadata from __init__.py docstring."""
     try:
@@ -168,7 +80,7 @@ def extract_problem_from_init(init_file: Path) -> dict:
             return {}
 
         expected_sections = ['Title', 'Definition', 'Leetcode', 'Difficulty', 'Topics', 'Group']
-        metadata = parse_simple_docstring(docstring, expected_sections)
+        metadata = parse_simple_docstring(docstring, expected_sections, nested_indent=0)
 
         # Parse topics list
         if 'topics' in metadata:
@@ -209,7 +121,7 @@ def extract_solution_from_file(py_file: Path) -> dict:
 
                 # Parse docstring
                 expected_sections = ['Intuition', 'Time Complexity', 'Args', 'Variables', 'Expressions', 'Returns']
-                result = parse_simple_docstring(docstring, expected_sections)
+                result = parse_simple_docstring(docstring, expected_sections, nested_indent=0)
                 result['code'] = code
 
                 # Parse args to dict
@@ -290,16 +202,15 @@ def extract_difficulty(difficulty: str | None) -> str:
 def get_directory_timestamps(directory: Path) -> dict:
     """Get created/updated timestamps for directory."""
     stat = directory.stat()
+    # st_birthtime is only reported on macOS/BSD; elsewhere use the inode change time
     return {
-        'created_at': datetime.fromtimestamp(stat.st_birthtime).isoformat(),
+        'created_at': datetime.fromtimestamp(getattr(stat, 'st_birthtime', stat.st_ctime)).isoformat(),
         'updated_at': datetime.fromtimestamp(stat.st_mtime).isoformat()
     }
 
 
-def upsert_problem(conn, slug: str, problem_dir: Path, problem_metadata: dict) -> str:
-    """Insert or update a problem and return its UUID."""
-    cursor = conn.cursor()
-
+def problem_values(slug: str, problem_metadata: dict) -> tuple:
+    """Content columns of a problems row (everything except timestamps)."""
     # Extract number from slug
     number = None
     if slug[0].isdigit():
@@ -312,39 +223,166 @@ def upsert_problem(conn, slug: str, problem_dir: Path, problem_metadata: dict) -
     if not title:
         title = ' '.join(word.capitalize() for word in slug.split('-')[1:])
 
-    # Get timestamps
-    timestamps = get_directory_timestamps(problem_dir)
-    created_at = timestamps['created_at']
-    updated_at = timestamps['updated_at']
-
-    # Topics
-    topics = problem_metadata.get('topics', [])
-
-    # Upsert problem
-    cursor.execute("""
-        INSERT INTO problems (slug, number, title, definition, leetcode_url, difficulty, topics, created_at, updated_at)
-        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
-        ON CONFLICT (slug)
-        DO UPDATE SET
-            number = EXCLUDED.number,
-            title = EXCLUDED.title,
-            definition = EXCLUDED.definition,
-            leetcode_url = EXCLUDED.leetcode_url,
-            difficulty = EXCLUDED.difficulty,
-            topics = EXCLUDED.topics,
-            updated_at = EXCLUDED.updated_at
-        RETURNING id
-    """, (
+    return (
         slug,
         number,
         title,
         problem_metadata.get('definition'),
         problem_metadata.get('leetcode'),
         extract_difficulty(problem_metadata.get('difficulty')),
-        topics,
-        created_at,
-        updated_at
-    ))
+        problem_metadata.get('topics', []),
+    )
+
+
+def problem_row(slug: str, problem_dir: Path, problem_metadata: dict) -> tuple:
+    """Column values for a problems row, in _PROBLEM_UPSERT column order."""
+    # Get timestamps
+    timestamps = get_directory_timestamps(problem_dir)
+
+    return problem_values(slug, problem_metadata) + (timestamps['created_at'], timestamps['updated_at'])
+
+
+def solution_values(file_name: str, solution_data: dict, order_index: int) -> tuple:
+    """Content columns of a solutions row (everything except problem_id and timestamps)."""
+    return (
+        file_name,
+        solution_data.get('code', ''),
+        solution_data.get('intuition'),
+        solution_data.get('time_complexity'),
+        solution_data.get('args') or None,
+        solution_data.get('variables') or None,
+        solution_data.get('expressions') or None,
+        solution_data.get('returns'),
+        order_index,
+    )
+
+
+def solution_row(problem_id: str, file_name: str, solution_data: dict, order_index: int) -> tuple:
+    """Column values for a solutions row, in _SOLUTION_UPSERT column order."""
+    values = list(solution_values(file_name, solution_data, order_index))
+
+    # Convert args/variables/expressions to JSON for PostgreSQL
+    for index in (4, 5, 6):
+        if values[index] is not None:
+            values[index] = psycopg2.extras.Json(values[index])
+
+    return (problem_id, *values)
+
+
+# ---------- Row digests ----------
+#
+# plan_sync compares rows by digest without fetching their content: the database
+# computes md5(concat_ws(',', md5(col1), md5(col2), ...)) over each column's text
+# form ('null' for NULL), and row_digest computes the same from the values on disk.
+# Each column's SQL expression is paired with a function rendering a Python value
+# the way PostgreSQL renders that expression. Should the two ever disagree, the row
+# just looks changed and is rewritten; a real change is never missed.
+
+
+def _text(value) -> str | None:
+    return None if value is None else str(value)
+
+
+def _text_array(value: list | None) -> str | None:
+    """array_to_json(text[])::text: compact, e.g. ["dp","greedy"]."""
+    return None if value is None else json.dumps(value, ensure_ascii=False, separators=(',', ':'))
+
+
+def jsonb_text(value) -> str:
+    """jsonb::text: ', ' and ': ' separators, object keys ordered by byte length, then bytes."""
+    if isinstance(value, dict):
+        keys = sorted(value, key=lambda k: (len(k.encode('utf-8')), k.encode('utf-8')))
+        items = ", ".join(f"{json.dumps(k, ensure_ascii=False)}: {jsonb_text(value[k])}" for k in keys)
+        return "{" + items + "}"
+    if isinstance(value, list):
+        return "[" + ", ".join(jsonb_text(item) for item in value) + "]"
+    return json.dumps(value, ensure_ascii=False)
+
+
+def _jsonb(value) -> str | None:
+    return None if value is None else jsonb_text(value)
+
+
+# (SQL expression, Python rendering), in problem_values / solution_values order
+PROBLEM_DIGEST_COLUMNS = [
+    ("p.slug", _text),
+    ("p.number::text", _text),
+    ("p.title", _text),
+    ("p.definition", _text),
+    ("p.leetcode_url", _text),
+    ("p.difficulty::text", _text),
+    ("array_to_json(p.topics)::text", _text_array),
+]
+SOLUTION_DIGEST_COLUMNS = [
+    ("s.file_name", _text),
+    ("s.code", _text),
+    ("s.intuition", _text),
+    ("s.time_complexity", _text),
+    ("s.args::text", _jsonb),
+    ("s.variables::text", _jsonb),
+    ("s.expressions::text", _jsonb),
+    ("s.returns", _text),
+    ("s.order_index::text", _text),
+]
+
+
+def digest_sql(columns: list[tuple[str, object]]) -> str:
+    """SQL expression computing row_digest of a row in the database."""
+    parts = ", ".join(f"coalesce(md5({expression}), 'null')" for expression, _ in columns)
+    return f"md5(concat_ws(',', {parts}))"
+
+
+def row_digest(columns: list[tuple[str, object]], values: tuple) -> str:
+    """Digest of a row's content columns, equal to digest_sql's for the same row in the database."""
+    parts = []
+    for (_, render), value in zip(columns, values, strict=True):
+        text = render(value)
+        parts.append('null' if text is None else hashlib.md5(text.encode('utf-8')).hexdigest())
+    return hashlib.md5(",".join(parts).encode('utf-8')).hexdigest()
+
+
+_PROBLEM_UPSERT = """
+    INSERT INTO problems (slug, number, title, definition, leetcode_url, difficulty, topics, created_at, updated_at)
+    VALUES {values}
+    ON CONFLICT (slug)
+    DO UPDATE SET
+        number = EXCLUDED.number,
+        title = EXCLUDED.title,
+        definition = EXCLUDED.definition,
+        leetcode_url = EXCLUDED.leetcode_url,
+        difficulty = EXCLUDED.difficulty,
+        topics = EXCLUDED.topics,
+        updated_at = EXCLUDED.updated_at
+    RETURNING id, slug
+"""
+
+_SOLUTION_UPSERT = """
+    INSERT INTO solutions (problem_id, file_name, code, intuition, time_complexity, args, variables, expressions, returns, order_index)
+    VALUES {values}
+    ON CONFLICT (problem_id, file_name)
+    DO UPDATE SET
+        code = EXCLUDED.code,
+        intuition = EXCLUDED.intuition,
+        time_complexity = EXCLUDED.time_complexity,
+        args = EXCLUDED.args,
+        variables = EXCLUDED.variables,
+        expressions = EXCLUDED.expressions,
+        returns = EXCLUDED.returns,
+        order_index = EXCLUDED.order_index,
+        updated_at = NOW()
+    RETURNING id
+"""
+
+
+def upsert_problem(conn, slug: str, problem_dir: Path, problem_metadata: dict) -> str:
+    """Insert or update a problem and return its UUID."""
+    cursor = conn.cursor()
+
+    # Upsert problem
+    cursor.execute(
+        _PROBLEM_UPSERT.format(values="(%s, %s, %s, %s, %s, %s, %s, %s, %s)"),
+        problem_row(slug, problem_dir, problem_metadata),
+    )
 
     problem_id = cursor.fetchone()[0]
     conn.commit()
@@ -356,39 +394,11 @@ def upsert_solution(conn, problem_id: str, file_name: str, solution_data: dict,
     """Insert or update a solution and return its UUID."""
     cursor = conn.cursor()
 
-    # Convert dicts to JSON for PostgreSQL
-    args = psycopg2.extras.Json(solution_data.get('args')) if solution_data.get('args') else None
-    variables = psycopg2.extras.Json(solution_data.get('variables')) if solution_data.get('variables') else None
-    expressions = psycopg2.extras.Json(solution_data.get('expressions')) if solution_data.get('expressions') else None
-
     # Upsert solution
-    cursor.execute("""
-        INSERT INTO solutions (problem_id, file_name, code, intuition, time_complexity, args, variables, expressions, returns, order_index)
-        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-        ON CONFLICT (problem_id, file_name)
-        DO UPDATE SET
-            code = EXCLUDED.code,
-            intuition = EXCLUDED.intuition,
-            time_complexity = EXCLUDED.time_complexity,
-            args = EXCLUDED.args,
-            variables = EXCLUDED.variables,
-            expressions = EXCLUDED.expressions,
-            returns = EXCLUDED.returns,
-            order_index = EXCLUDED.order_index,
-            updated_at = NOW()
-        RETURNING id
-    """, (
-        problem_id,
-        file_name,
-        solution_data.get('code', ''),
-        solution_data.get('intuition'),
-        solution_data.get('time_complexity'),
-        args,
-        variables,
-        expressions,
-        solution_data.get('returns'),
-        order_index
-    ))
+    cursor.execute(
+        _SOLUTION_UPSERT.format(values="(%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)"),
+        solution_row(problem_id, file_name, solution_data, order_index),
+    )
 
     solution_id = cursor.fetchone()[0]
     conn.commit()
@@ -396,35 +406,270 @@ def upsert_solution(conn, problem_id: str, file_name: str, solution_data: dict,
     return solution_id
 
 
-def sync_problem_to_db(conn, slug: str, problem_dir: Path):
-    """Sync a single problem to the database."""
-    print(f"Syncing: {slug}")
+def collect_problem(slug: str, problem_dir: Path) -> dict | None:
+    """Extract a problem and its solutions from disk without touching the database.
 
+    Returns None (after printing why) when the problem has no usable __init__.py.
+    """
     # Extract from __init__.py
     init_file = problem_dir / '__init__.py'
     if not init_file.exists():
         print(f"  ⚠️  No __init__.py found for {slug}")
-        return
+        return None
 
     problem_metadata = extract_problem_from_init(init_file)
     if not problem_metadata:
         print(f"  ⚠️  No metadata found in __init__.py for {slug}")
-        return
-
-    # Upsert problem
-    problem_id = upsert_problem(conn, slug, problem_dir, problem_metadata)
+        return None
 
     # Extract solutions from *.py files
-    solution_files = [f for f in problem_dir.glob('*.py')
-                      if f.name != '__init__.py' and not f.name.startswith('_')]
+    solution_files = sorted(f for f in problem_dir.glob('*.py')
+                            if f.name != '__init__.py' and not f.name.startswith('_'))
 
-    for order_index, py_file in enumerate(sorted(solution_files)):
+    solutions = []
+    for order_index, py_file in enumerate(solution_files):
         solution_data = extract_solution_from_file(py_file)
         if solution_data:
-            upsert_solution(conn, problem_id, py_file.name, solution_data, order_index)
+            solutions.append((py_file.name, solution_data, order_index))
+
+    return {
+        'slug': slug,
+        'problem_dir': problem_dir,
+        'metadata': problem_metadata,
+        'solutions': solutions,
+        'file_names': [f.name for f in solution_files],
+    }
+
+
+@profiling.timed("db:plan")
+def plan_sync(cursor, problems: list[dict]) -> dict:
+    """Diff the collected problems against the database by content digest.
+
+    The database digests its rows (digest_sql) with one query per table, so only
+    ids, keys and hashes cross the network, never the code or docstring text.
+    Only new or changed rows are written and untouched rows keep their updated_at.
+    """
+    slugs = [p['slug'] for p in problems]
+
+    cursor.execute(f"""
+        SELECT p.id, p.slug, {digest_sql(PROBLEM_DIGEST_COLUMNS)}
+        FROM problems p
+        WHERE p.slug = ANY(%s)
+    """, (slugs,))
+    problem_ids = {}
+    problem_digests = {}
+    for problem_id, slug, digest in cursor.fetchall():
+        problem_ids[slug] = problem_id
+        problem_digests[slug] = digest
+
+    cursor.execute(f"""
+        SELECT s.id, p.slug, s.file_name, {digest_sql(SOLUTION_DIGEST_COLUMNS)}
+        FROM solutions s
+        JOIN problems p ON p.id = s.problem_id
+        WHERE p.slug = ANY(%s)
+    """, (slugs,))
+    solution_ids = {}
+    solution_digests = {}
+    for solution_id, slug, file_name, digest in cursor.fetchall():
+        solution_ids[(slug, file_name)] = solution_id
+        solution_digests[(slug, file_name)] = digest
+
+    plan = {
+        'problem_ids': problem_ids,
+        'problems': [],
+        'solutions': [],
+        'deletes': [],
+        'changes': [],
+        'counts': {'insert': 0, 'update': 0, 'delete': 0, 'unchanged': 0},
+    }
+
+    def record(action: str, label: str):
+        plan['counts'][action] += 1
+        if action != 'unchanged':
+            plan['changes'].append((action, label))
+
+    for p in problems:
+        slug = p['slug']
+        digest = problem_digests.get(slug)
+        if digest is None:
+            record('insert', slug)
+            plan['problems'].append(p)
+        elif digest != row_digest(PROBLEM_DIGEST_COLUMNS, problem_values(slug, p['metadata'])):
+            record('update', slug)
+            plan['problems'].append(p)
+        else:
+            record('unchanged', slug)
+
+        for file_name, data, order_index in p['solutions']:
+            label = f"{slug}/{file_name}"
+            digest = solution_digests.get((slug, file_name))
+            if digest is None:
+                record('insert', label)
+                plan['solutions'].append((slug, file_name, data, order_index))
+            elif digest != row_digest(SOLUTION_DIGEST_COLUMNS, solution_values(file_name, data, order_index)):
+                record('update', label)
+                plan['solutions'].append((slug, file_name, data, order_index))
+            else:
+                record('unchanged', label)
+
+        # Solutions whose file no longer exists in the filesystem
+        file_names = set(p['file_names'])
+        for (existing_slug, file_name), solution_id in solution_ids.items():
+            if existing_slug == slug and file_name not in file_names:
+                record('delete', f"{slug}/{file_name}")
+                plan['deletes'].append(solution_id)
+
+    return plan
+
+
+def print_plan(plan: dict):
+    """Print the inserts/updates/deletes a sync would perform."""
+    symbols = {'insert': '+', 'update': '~', 'delete': '-'}
+    for action, label in plan['changes']:
+        print(f"  {symbols[action]} {action:<6} {label}")
+    counts = plan['counts']
+    print(f"\n  {counts['insert']} insert(s), {counts['update']} update(s), "
+          f"{counts['delete']} delete(s), {counts['unchanged']} unchanged")
+
+
+@profiling.timed("db:write")
+def write_batch(cursor, problems: list[dict], dry_run: bool = False) -> dict:
+    """Write the new or changed rows of a batch of problems; return its plan.
+
+    Unchanged rows are skipped (plan_sync); the rest are written with multi-row
+    INSERT ... ON CONFLICT statements (execute_values), and stale solutions are
+    removed with one DELETE. Does not commit. With dry_run nothing is written.
+    """
+    plan = plan_sync(cursor, problems)
+    if dry_run:
+        return plan
+
+    # 1. Problems -> ids
+    problem_ids = dict(plan['problem_ids'])
+    if plan['problems']:
+        problem_rows = [problem_row(p['slug'], p['problem_dir'], p['metadata']) for p in plan['problems']]
+        returned = psycopg2.extras.execute_values(
+            cursor, _PROBLEM_UPSERT.format(values="%s"), problem_rows, page_size=500, fetch=True
+        )
+        problem_ids.update({slug: problem_id for problem_id, slug in returned})
+
+    # 2. Solutions
+    if plan['solutions']:
+        solution_rows = [
+            solution_row(problem_ids[slug], file_name, data, order_index)
+            for slug, file_name, data, order_index in plan['solutions']
+        ]
+        psycopg2.extras.execute_values(
+            cursor, _SOLUTION_UPSERT.format(values="%s"), solution_rows, page_size=500
+        )
+
+    # 3. Stale solutions
+    if plan['deletes']:
+        cursor.execute(
+            "DELETE FROM solutions WHERE id = ANY(%s::uuid[])",
+            ([str(solution_id) for solution_id in plan['deletes']],),
+        )
+
+    return plan
+
+
+def _collect_dir(problem_dir: Path) -> tuple[str, dict | None, str | None]:
+    """collect_problem for a worker process: (slug, problem, error)."""
+    try:
+        return problem_dir.name, collect_problem(problem_dir.name, problem_dir), None
+    except Exception as e:
+        return problem_dir.name, None, str(e)
+
+
+def pipeline_sync(conn, problem_dirs: list[Path], jobs: int = 0, dry_run: bool = False) -> tuple[dict, int, int]:
+    """Sync problems with parsing and database writes overlapped.
+
+    Worker processes parse problem directories (collect_problem) while a single
+    writer thread sends BATCH_SIZE-problem batches to the database (write_batch).
+    The batch queue holds at most QUEUE_BATCHES batches, so parsing cannot run
+    arbitrarily far ahead of the network. All batches share one transaction,
+    committed at the end and rolled back on any failure (or on dry_run).
+
+    Returns (plan, problems synced, extraction errors); a database error is re-raised.
+    """
+    batches: queue.Queue = queue.Queue(maxsize=QUEUE_BATCHES)
+    plan = {'changes': [], 'counts': {'insert': 0, 'update': 0, 'delete': 0, 'unchanged': 0}}
+    failure: list[BaseException] = []
+
+    def writer():
+        done = False
+        try:
+            with conn.cursor() as cursor:
+                while (batch := batches.get()) is not None:
+                    if failure:
+                        continue  # keep draining so the producer never blocks
+                    try:
+                        batch_plan = write_batch(cursor, batch, dry_run)
+                    except Exception as e:
+                        failure.append(e)
+                        continue
+                    plan['changes'].extend(batch_plan['changes'])
+                    for action, count in batch_plan['counts'].items():
+                        plan['counts'][action] += count
+                done = True
+        except BaseException as e:
+            # e.g. opening the cursor failed: record it, or the producer never learns
+            failure.append(e)
+        # Drain up to the sentinel, or the producer blocks on the bounded queue forever
+        while not done and batches.get() is not None:
+            pass
+
+    thread = threading.Thread(target=writer, name='db-writer')
+    thread.start()
+
+    synced_count = 0
+    error_count = 0
+    batch = []
+    try:
+        for slug, problem, error in parallel_imap(_collect_dir, problem_dirs, jobs):
+            if error:
+                print(f"  ❌ Error extracting {slug}: {error}")
+                error_count += 1
+            elif problem:
+                batch.append(problem)
+                synced_count += 1
+            if len(batch) >= BATCH_SIZE:
+                batches.put(batch)
+                batch = []
+            if failure:
+                break
+        if batch and not failure:
+            batches.put(batch)
+    finally:
+        batches.put(None)
+        thread.join()
+
+    if failure or dry_run:
+        conn.rollback()
+    else:
+        conn.commit()
+    if failure:
+        raise failure[0]
+
+    return plan, synced_count, error_count
+
+
+def sync_problem_to_db(conn, slug: str, problem_dir: Path):
+    """Sync a single problem to the database (one round trip and commit per row)."""
+    print(f"Syncing: {slug}")
+
+    collected = collect_problem(slug, problem_dir)
+    if not collected:
+        return
+
+    # Upsert problem
+    problem_id = upsert_problem(conn, slug, problem_dir, collected['metadata'])
+
+    for file_name, solution_data, order_index in collected['solutions']:
+        upsert_solution(conn, problem_id, file_name, solution_data, order_index)
 
     # Delete solutions that no longer exist in the filesystem
-    solution_file_names = [f.name for f in solution_files]
+    solution_file_names = collected['file_names']
     cursor = conn.cursor()
     if solution_file_names:
         cursor.execute("""
@@ -442,7 +687,7 @@ def sync_problem_to_db(conn, slug: str, problem_dir: Path):
     if deleted_count > 0:
         print(f"  🗑️  Removed {deleted_count} stale solution(s)")
 
-    print(f"  ✅ Synced {slug} with {len(solution_files)} solution(s)")
+    print(f"  ✅ Synced {slug} with {len(solution_file_names)} solution(s)")
 
 
 def main():
@@ -450,8 +695,16 @@ def main():
     # Parse command-line arguments
     parser = argparse.ArgumentParser(description='Sync problem metadata to PostgreSQL database')
     parser.add_argument('problem_slug', nargs='?', help='Specific problem slug to sync (e.g., "53-maximum-subarray"). If not provided, syncs all problems.')
+    parser.add_argument('--per-problem', action='store_true', help='Write each problem and solution in its own statement and commit (slow; isolates failures to one problem)')
+    parser.add_argument('--dry-run', action='store_true', help='Report the inserts/updates/deletes a sync would perform without writing anything')
+    parser.add_argument('--jobs', '-j', type=int, default=0, help='Worker processes for parsing problems (default 0 = one per CPU)')
+    profiling.add_arguments(parser)
     args = parser.parse_args()
+    with profiling.profiled(args, "sync_problems_to_db"):
+        return _run(args)
 
+
+def _run(args: argparse.Namespace):
     # Path to problems directory
     problems_dir = Path(__file__).parent.parent.parent / 'algorithms' / 'problems'
 
@@ -469,33 +722,23 @@ def main():
 
     # Determine which problems to sync
     if args.problem_slug:
-        # Sync specific problem
         problem_dir = problems_dir / args.problem_slug
         if not problem_dir.exists() or not problem_dir.is_dir():
             print(f"❌ Problem not found: {args.problem_slug}")
             conn.close()
             sys.exit(1)
-
+        problem_dirs = [problem_dir]
         print(f"🔄 Syncing single problem: {args.problem_slug}\n")
-        try:
-            sync_problem_to_db(conn, args.problem_slug, problem_dir)
-            print(f"\n🎉 Successfully synced {args.problem_slug}")
-        except Exception as e:
-            print(f"❌ Error syncing {args.problem_slug}: {e}")
-            import traceback
-            traceback.print_exc()
-            conn.close()
-            sys.exit(1)
     else:
-        # Sync all problems
+        problem_dirs = [d for d in sorted(problems_dir.iterdir())
+                        if d.is_dir() and not d.name.startswith('.')]
         print("🔄 Syncing all problems to database...\n")
-        success_count = 0
-        error_count = 0
 
-        for problem_dir in sorted(problems_dir.iterdir()):
-            if not problem_dir.is_dir() or problem_dir.name.startswith('.'):
-                continue
+    success_count = 0
+    error_count = 0
 
+    if args.per_problem and not args.dry_run:
+        for problem_dir in problem_dirs:
             try:
                 sync_problem_to_db(conn, problem_dir.name, problem_dir)
                 success_count += 1
@@ -503,14 +746,34 @@ def main():
                 print(f"  ❌ Error syncing {problem_dir.name}: {e}")
                 import traceback
                 traceback.print_exc()
+                conn.rollback()
                 error_count += 1
+    else:
+        print(f"   Parsing with {resolve_jobs(args.jobs)} worker(s), writing in batches of {BATCH_SIZE}\n")
+        try:
+            plan, success_count, error_count = pipeline_sync(conn, problem_dirs, args.jobs, args.dry_run)
+        except Exception as e:
+            print(f"❌ Sync failed, transaction rolled back: {e}")
+            import traceback
+            traceback.print_exc()
+            conn.close()
+            sys.exit(1)
 
-        print(f"\n🎉 Sync complete!")
-        print(f"   ✅ Success: {success_count}")
-        print(f"   ❌ Errors: {error_count}")
+        print_plan(plan)
+        if args.dry_run:
+            print("\n🔍 Dry run: no changes written")
+            conn.close()
+            return
+
+    print(f"\n🎉 Sync complete!")
+    print(f"   ✅ Success: {success_count}")
+    print(f"   ❌ Errors: {error_count}")
 
     conn.close()
 
+    if args.problem_slug and error_count:
+        sys.exit(1)
+
 
 if __name__ == '__main__':
     main()
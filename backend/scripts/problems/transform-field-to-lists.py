@@ -15,6 +15,9 @@ import re
 from pathlib import Path
 from typing import List
 
+import profiling
+
+
 def transform_to_nested_list(text: str) -> str:
     """Transform text from paragraph to nested list format."""
     if not text or not text.strip():
@@ -56,13 +59,8 @@ def transform_to_nested_list(text: str) -> str:
 
     return '\n'.join(transformed_lines)
 
-def process_symbol_tags(input_file: Path, output_file: Path, fields: List[str]) -> None:
-    """Process symbol tags JSON file and transform specified fields."""
-    
-    # Read input file
-    with open(input_file, 'r', encoding='utf-8') as f:
-        data = json.load(f)
-    
+def transform_entries(data: dict, fields: List[str], verbose: bool = True) -> int:
+    """Transform the given fields of every symbol entry in place; return the number changed."""
     transformed_count = 0
     
     # Process each symbol entry
@@ -78,11 +76,28 @@ def process_symbol_tags(input_file: Path, output_file: Path, fields: List[str])
                 if transformed != original:
                     entry[field] = transformed
                     transformed_count += 1
-                    print(f"Transformed '{field}' for: {qname}")
-    
-    # Write output file with proper formatting
+                    if verbose:
+                        print(f"Transformed '{field}' for: {qname}")
+
+    return transformed_count
+
+@profiling.timed("write:symbol_tags")
+def write_symbol_tags_json(output_file: Path, data: dict) -> None:
+    """Write symbol tags in the final (sorted, indented) layout."""
     with open(output_file, 'w', encoding='utf-8') as f:
         json.dump(data, f, ensure_ascii=False, indent=2, sort_keys=True)
+
+def process_symbol_tags(input_file: Path, output_file: Path, fields: List[str]) -> None:
+    """Process symbol tags JSON file and transform specified fields."""
+    
+    # Read input file
+    with open(input_file, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    
+    transformed_count = transform_entries(data, fields)
+    
+    # Write output file with proper formatting
+    write_symbol_tags_json(output_file, data)
     
     print(f"\nTransformation complete!")
     print(f"- Input file: {input_file}")
@@ -112,7 +127,13 @@ def main():
         help="Fields to transform (default: time_complexity space_complexity)"
     )
     
+    profiling.add_arguments(parser)
     args = parser.parse_args()
+    with profiling.profiled(args, "transform_field_to_lists"):
+        return _run(args)
+
+
+def _run(args: argparse.Namespace):
     
     # Default output to input file (transform in place)
     output_file = args.output if args.output else args.input
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+File change events for generate_all_metadata.py --watch.
+
+Uses native filesystem events (inotify/FSEvents via watchfiles, which
+uvicorn[standard] already installs) and falls back to polling modification
+times when watchfiles is unavailable. Bursts of events, such as an editor's
+save-rename-chmod sequence or a formatter touching several files, are grouped
+into one batch.
+"""
+
+import contextlib
+import os
+import time
+from collections.abc import Iterator
+from pathlib import Path
+
+try:
+    from watchfiles import PythonFilter
+    from watchfiles import watch as _native_watch
+except ImportError:
+    _native_watch = None
+
+DEBOUNCE_MS = 50
+POLL_INTERVAL = 0.25
+
+
+def _is_watched(root: Path, path: Path) -> bool:
+    return path.suffix == ".py" and not any(
+        part.startswith(".") or part == "__pycache__" for part in path.relative_to(root).parts
+    )
+
+
+def _snapshot(root: Path) -> dict[Path, int]:
+    """mtime_ns of every watched .py file under root."""
+    mtimes: dict[Path, int] = {}
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = [d for d in dirnames if not d.startswith(".") and d != "__pycache__"]
+        for name in filenames:
+            if name.endswith(".py"):
+                path = Path(dirpath, name)
+                with contextlib.suppress(FileNotFoundError):
+                    mtimes[path] = path.stat().st_mtime_ns
+    return mtimes
+
+
+def _changed(before: dict[Path, int], after: dict[Path, int]) -> set[Path]:
+    return {p for p in before.keys() | after.keys() if before.get(p) != after.get(p)}
+
+
+def _poll_changes(root: Path, debounce_ms: int, interval: float) -> Iterator[set[Path]]:
+    snapshot = _snapshot(root)
+    while True:
+        time.sleep(interval)
+        current = _snapshot(root)
+        changed = _changed(snapshot, current)
+        # Keep collecting until the tree has been quiet for debounce_ms
+        while changed:
+            snapshot = current
+            time.sleep(debounce_ms / 1000)
+            current = _snapshot(root)
+            more = _changed(snapshot, current)
+            if not more:
+                break
+            changed |= more
+        if changed:
+            snapshot = current
+            yield changed
+
+
+def watch_changes(root: Path, debounce_ms: int = DEBOUNCE_MS, poll_interval: float = POLL_INTERVAL) -> Iterator[set[Path]]:
+    """Yield batches of changed (added, modified or deleted) .py files under root, forever."""
+    root = root.resolve()
+    if _native_watch is not None:
+        print(f"👀 Watching {root} (native file events)")
+        for changes in _native_watch(root, watch_filter=PythonFilter(), step=debounce_ms):
+            paths = {Path(p) for _, p in changes}
+            paths = {p for p in paths if _is_watched(root, p)}
+            if paths:
+                yield paths
+    else:
+        print(f"👀 Watching {root} (polling every {poll_interval}s; install watchfiles for native events)")
+        yield from _poll_changes(root, debounce_ms, poll_interval)
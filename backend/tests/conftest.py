@@ -0,0 +1,19 @@
+"""
+Shared setup for the backend tests.
+
+The problem scripts import their siblings by bare name (they run with their own
+directory on sys.path), and the algorithms import each other as
+backend.algorithms.*, so both the script directory and the repo root go on
+sys.path here.
+"""
+
+import sys
+from pathlib import Path
+
+BACKEND = Path(__file__).resolve().parent.parent
+SCRIPTS = BACKEND / "scripts" / "problems"
+ALGORITHMS = BACKEND / "algorithms"
+
+for path in (SCRIPTS, BACKEND.parent):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
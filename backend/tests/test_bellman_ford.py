@@ -0,0 +1,100 @@
+"""SPFA and vectorized Bellman-Ford against the classic algorithm on random graphs, negative cycles included."""
+
+import importlib
+import random
+
+import pytest
+
+# The package name has a hyphen, so it can only be imported by string
+PACKAGE = "backend.algorithms.core.bellman-ford"
+bellman_ford_classic = importlib.import_module(f"{PACKAGE}.classic").bellman_ford_classic
+spfa = importlib.import_module(f"{PACKAGE}.spfa").spfa
+
+INF = float("inf")
+SEEDS = range(200)
+
+
+def _random_graph(seed: int) -> tuple[int, list[tuple[int, int, int]], int]:
+    """Sparse or dense, with parallel edges, self-loops and some negative weights (integers, so sums are exact)."""
+    rng = random.Random(seed)
+    n = rng.randint(1, 12)
+    low = rng.choice([0, -2, -5])
+    edges = [(rng.randrange(n), rng.randrange(n), rng.randint(low, 10)) for _ in range(rng.randint(0, 3 * n))]
+    return n, edges, rng.randrange(n)
+
+
+def _classic(n, edges, source) -> list[float] | None:
+    """Classic Bellman-Ford distances, or None if it finds a reachable negative cycle."""
+    try:
+        return bellman_ford_classic(list(range(n)), edges, source)
+    except Exception as e:
+        assert str(e) == "Negative-weight cycle"
+        return None
+
+
+def _has_reachable_negative_cycle(n, edges, source) -> bool:
+    """Independent check: n rounds of relaxation still improve something only around a negative cycle."""
+    d = [INF] * n
+    d[source] = 0
+    for _ in range(n):
+        for u, v, w in edges:
+            d[v] = min(d[v], d[u] + w)
+    return any(d[u] + w < d[v] for u, v, w in edges)
+
+
+def test_random_graphs_include_negative_cycles():
+    cyclic = sum(_has_reachable_negative_cycle(*_random_graph(seed)) for seed in SEEDS)
+    assert 20 < cyclic < len(SEEDS) - 20
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_classic_detects_exactly_the_reachable_negative_cycles(seed):
+    graph = _random_graph(seed)
+    assert (_classic(*graph) is None) == _has_reachable_negative_cycle(*graph)
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_spfa_matches_classic(seed):
+    expected = _classic(*_random_graph(seed))
+    if expected is None:
+        with pytest.raises(Exception, match="Negative-weight cycle"):
+            spfa(*_random_graph(seed))
+    else:
+        assert spfa(*_random_graph(seed)) == expected
+
+
+def test_spfa_negative_self_loop_and_unreachable_cycle():
+    with pytest.raises(Exception, match="Negative-weight cycle"):
+        spfa(2, [(0, 1, 1), (1, 1, -1)], 0)
+    # A negative cycle the source cannot reach leaves those vertices at inf
+    assert spfa(3, [(0, 1, 4), (2, 2, -1)], 0) == [0, 4, INF]
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_vectorized_matches_classic(seed):
+    pytest.importorskip("numpy")
+    bellman_ford_vectorized = importlib.import_module(f"{PACKAGE}.vectorized").bellman_ford_vectorized
+
+    expected = _classic(*_random_graph(seed))
+    if expected is None:
+        with pytest.raises(Exception, match="Negative-weight cycle"):
+            bellman_ford_vectorized(*_random_graph(seed))
+    else:
+        assert bellman_ford_vectorized(*_random_graph(seed)).tolist() == expected
+
+
+@pytest.mark.parametrize("seed", range(50))
+def test_vectorized_max_edges_bounds_the_path_length(seed):
+    np = pytest.importorskip("numpy")
+    bellman_ford_vectorized = importlib.import_module(f"{PACKAGE}.vectorized").bellman_ford_vectorized
+
+    n, edges, source = _random_graph(seed)
+    k = random.Random(seed).randint(0, n)
+    # Layered reference: best cost using at most k edges (never raises, cycles or not)
+    d = [INF] * n
+    d[source] = 0
+    for _ in range(k):
+        prev = d[:]
+        for u, v, w in edges:
+            d[v] = min(d[v], prev[u] + w)
+    assert np.array_equal(bellman_ford_vectorized(n, edges, source, max_edges=k), d)
@@ -0,0 +1,72 @@
+"""BuildCache: a warm run reproduces a cold run, and cached entries go stale with their inputs."""
+
+import json
+
+from generate_all_metadata import generate_all
+
+SOLUTION = '''from core.graphs import bfs
+
+
+def solve(n: int) -> int:
+    """
+    Intuition:
+        Walk the graph.
+
+    Time Complexity:
+        O(n)
+    """
+    return bfs.walk(n)
+'''
+
+OUTPUTS = ("lsp_index.json", "symbol_tags.json", "uses.json", "expressions.json", "problems_metadata.json")
+
+
+def _tree(tmp_path):
+    root = tmp_path / "algorithms"
+    (root / "core" / "graphs").mkdir(parents=True)
+    (root / "core" / "graphs" / "__init__.py").write_text("")
+    (root / "core" / "graphs" / "bfs.py").write_text("def walk(n: int) -> int:\n    return n\n")
+    (root / "problems" / "1-walk").mkdir(parents=True)
+    (root / "problems" / "1-walk" / "solution.py").write_text(SOLUTION)
+    return root
+
+
+def _run(root, out_dir, cache_path) -> dict[str, bytes]:
+    generate_all(root, out_dir, cache_path=cache_path)
+    return {name: (out_dir / name).read_bytes() for name in OUTPUTS}
+
+
+def _bfs_use(out_dir) -> str:
+    """qname of `bfs` in `return bfs.walk(n)`."""
+    uses = json.loads((out_dir / "uses.json").read_text())["problems/1-walk/solution.py"]
+    return next(u["qname"] for u in uses if u["nameRange"]["start"] == {"line": 3, "character": 11})
+
+
+def test_warm_run_matches_cold_run(tmp_path):
+    root, cache_path = _tree(tmp_path), tmp_path / "cache.json"
+    cold = _run(root, tmp_path / "cold", cache_path)
+
+    saved = cache_path.read_bytes()
+    assert _run(root, tmp_path / "warm", cache_path) == cold
+    # Every output was a hit, so nothing was rewritten
+    assert cache_path.read_bytes() == saved
+
+
+def test_uses_entry_follows_imported_package_exports(tmp_path):
+    root, cache_path = _tree(tmp_path), tmp_path / "cache.json"
+    _run(root, tmp_path / "before", cache_path)
+    assert _bfs_use(tmp_path / "before") == "core.graphs.bfs:"
+
+    # Same module set, same importer: only the package's top-level names change
+    (root / "core" / "graphs" / "__init__.py").write_text("def bfs(): ...\n")
+    warm = _run(root, tmp_path / "warm", cache_path)
+    assert _bfs_use(tmp_path / "warm") != "core.graphs.bfs:"
+    assert warm == _run(root, tmp_path / "cold", None)
+
+
+def test_hit_counts_are_reported_only_with_a_cache_file(tmp_path, capsys):
+    root = _tree(tmp_path)
+    _run(root, tmp_path / "uncached", None)
+    assert "Build cache:" not in capsys.readouterr().out
+    _run(root, tmp_path / "cached", tmp_path / "cache.json")
+    assert "Build cache: 0 hits" in capsys.readouterr().out
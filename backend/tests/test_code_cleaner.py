@@ -0,0 +1,117 @@
+"""clean_code: the linear docstring-mask/tokenize cleaner against the per-line scanner it replaced."""
+
+import ast
+import io
+import tokenize
+
+import pytest
+from code_cleaner import (
+    clean_code,
+    clean_code_with_comments,
+    extract_inline_comments,
+    find_comments,
+)
+from conftest import ALGORITHMS
+
+FLAGS = [(True, True), (True, False), (False, True), (False, False)]
+
+
+def _scanner_clean_code(code_text: str, remove_end_of_line: bool, remove_full_line: bool) -> str:
+    """The previous clean_code for parseable code: docstring ranges, then a quote scanner per line."""
+    ranges = [
+        (node.body[0].lineno - 1, node.body[0].end_lineno - 1)
+        for node in ast.walk(ast.parse(code_text))
+        if isinstance(node, (ast.FunctionDef, ast.ClassDef)) and node.body
+        and isinstance(node.body[0], ast.Expr) and isinstance(node.body[0].value, ast.Constant)
+        and isinstance(node.body[0].value.value, str)
+    ]
+    lines = [line for i, line in enumerate(code_text.split("\n")) if not any(s <= i <= e for s, e in ranges)]
+
+    kept = []
+    for line in lines:
+        if line.strip().startswith("#"):
+            if not remove_full_line:
+                kept.append(line)
+            continue
+        if remove_end_of_line and "#" in line:
+            in_string, quote = False, None
+            for j, char in enumerate(line):
+                if char in "\"'" and (j == 0 or line[j - 1] != "\\"):
+                    if not in_string:
+                        in_string, quote = True, char
+                    elif char == quote:
+                        in_string, quote = False, None
+                elif char == "#" and not in_string:
+                    line = line[:j].rstrip()
+                    break
+        kept.append(line)
+
+    clean, empty = [], 0
+    for line in kept:
+        empty = 0 if line.strip() else empty + 1
+        if empty <= 1:
+            clean.append(line if line.strip() else "")
+    return "\n".join(clean).strip("\n")
+
+
+def _hash_in_multiline_string(code_text: str) -> bool:
+    return any(
+        token.type == tokenize.STRING and token.start[0] != token.end[0] and "#" in token.string
+        for token in tokenize.generate_tokens(io.StringIO(code_text).readline)
+    )
+
+
+SOURCES = sorted(ALGORITHMS.rglob("*.py"))
+
+
+@pytest.mark.parametrize("path", SOURCES, ids=lambda p: str(p.relative_to(ALGORITHMS)))
+def test_matches_scanner_on_the_tree(path):
+    code = path.read_text(encoding="utf-8")
+    try:
+        ast.parse(code)
+    except SyntaxError:
+        pytest.skip("unparseable files take the unchanged line-based fallback")
+    if _hash_in_multiline_string(code):
+        pytest.skip("the scanner cut '#' inside multi-line strings (see below)")
+    for flags in FLAGS:
+        assert clean_code(code, *flags) == _scanner_clean_code(code, *flags)
+
+
+SAMPLE = '''import heapq  # priority queue
+
+
+def f(xs):
+    """Docstring # not a comment."""
+    # full-line comment
+    s = "a # b"  # trailing
+    t = 'it\\'s # still a string'
+
+
+
+    return s, t
+'''
+
+
+@pytest.mark.parametrize("flags", FLAGS)
+def test_matches_scanner_on_quotes_and_blank_runs(flags):
+    assert clean_code(SAMPLE, *flags) == _scanner_clean_code(SAMPLE, *flags)
+
+
+def test_hash_in_multiline_string_is_not_a_comment():
+    # The scanner cut this line at the '#'; tokenize knows it is inside the string
+    code = 'QUERY = """\nSELECT 1 # not a comment\n"""\n'
+    assert clean_code(code) == code.rstrip("\n")
+    assert find_comments(code) == {}
+
+
+def test_kept_comments_index_the_cleaned_lines():
+    cleaned, comments = clean_code_with_comments(SAMPLE, False, True)
+    lines = cleaned.split("\n")
+    assert comments == {0: "priority queue", 3: "trailing"}
+    assert all(lines[i].endswith("# " + text) for i, text in comments.items())
+
+
+def test_untokenizable_code_falls_back_to_the_scanner():
+    code = "x = 1  # one\ny = (\n"
+    assert find_comments(code) is None
+    assert extract_inline_comments(code) == {0: "one"}
@@ -0,0 +1,83 @@
+"""Documented bounds reduced to a degree in n, including graph bounds in V and E."""
+
+import argparse
+import math
+import random
+
+import complexity
+from complexity import (
+    GRAPH_SIZES,
+    documented_degree,
+    documented_slope,
+    graph_variables,
+    measure_problem,
+    size_exponents,
+)
+from race_variants import (
+    ALGORITHMS_DIR,
+    load_problem,
+    make_inputs,
+    reference_parameters,
+)
+
+
+def test_documented_degree():
+    assert documented_degree("n log k") == 1
+    assert documented_degree("R * C") == 2
+    assert documented_degree("n²") == 2
+    assert documented_degree("2^n") == math.inf
+    assert documented_degree(r"\sqrt{n}") == 0.5
+
+
+def test_graph_bounds_use_size_exponents():
+    assert graph_variables(r"E \log V") == {"e", "v"}
+    assert graph_variables("n log n") == set()
+    # A complete graph on n points: E ~ n^2
+    assert documented_degree(r"E \log V", {"v": 1, "e": 2}) == 2
+    assert documented_degree("V + E", {"v": 0.5, "e": 1}) == 1
+
+
+def test_log_factors_steepen_the_documented_slope():
+    assert documented_slope("n", (64, 512)) == 1
+    assert documented_slope("n log n", (64, 512)) == 1.19
+    assert documented_slope(r"n \log(n)", (64, 512)) == 1.19
+    # log k names a fixed parameter, so it adds nothing
+    assert documented_slope("n log k", (64, 512)) == 1
+    assert documented_slope("V + E log V", (64, 512), {"v": 1, "e": 2}) == 2.19
+    assert documented_slope("2^n", (64, 512)) == math.inf
+
+
+def test_1584_heap_prim_is_not_flagged_for_its_log_factor(monkeypatch):
+    # The slopes measured for heap-based-prim.py (O(E log V)) run up to ~2.6 over n = 64..512
+    def run_variant(variant, inputs, *_, **__):
+        return {"status": "ok", "seconds": 0.4 * (len(inputs["points"]) / 512) ** 2.59}
+
+    monkeypatch.setattr(complexity, "run_variant", run_variant)
+    args = argparse.Namespace(max_n=1 << 16, budget=0.5, repeat=1, slack=0.5, seed=0)
+    entries = measure_problem(ALGORITHMS_DIR / "problems" / "1584-min-cost-to-connect-all-points", args)
+
+    heap = entries["problems/1584-min-cost-to-connect-all-points/heap-based-prim.py"]
+    assert [n for n, _ in heap["points"]] == [8, 16, 32, 64, 128, 256, 512]
+    assert heap["slope"] == 2.59
+    # E = n(n-1)/2 grows like n^2.01 over 64..512
+    assert heap["documented_degree"] == 2.01
+    assert heap["documented_slope"] == 2.2
+    assert not heap["flagged"]
+    # The same slope is too steep for O(V^2), which has no log factor
+    assert entries["problems/1584-min-cost-to-connect-all-points/array-based-prim.py"]["flagged"]
+
+
+def test_size_exponents_follow_the_generated_inputs():
+    problem = "1584-min-cost-to-connect-all-points"
+    reference = reference_parameters([v for v in load_problem(ALGORITHMS_DIR / "problems" / problem) if v.entry])
+    exponents = size_exponents(problem, reference, (256, 4096), seed=0)
+    assert exponents["v"] == 1
+    assert exponents["e"] == 2
+
+
+def test_graph_sizes_read_the_generated_inputs():
+    for problem, sizes in GRAPH_SIZES.items():
+        if problem == "1584-min-cost-to-connect-all-points":
+            continue  # generic inputs, covered above
+        counts = sizes(make_inputs(problem, [], 64, random.Random(0)))
+        assert set(counts) == {"v", "e"} and all(count > 0 for count in counts.values())
@@ -0,0 +1,84 @@
+"""CSRGraph construction and dijkstra_csr against plain relaxation on random graphs."""
+
+import random
+from itertools import pairwise
+
+import pytest
+from backend.algorithms.core.dijkstra.csr_dijkstra import dijkstra_csr, shortest_path
+from backend.algorithms.core.dijkstra.csr_graph import CSRGraph
+
+INF = float("inf")
+
+
+def _random_edges(rng: random.Random, n: int, m: int) -> list[tuple[int, int, int]]:
+    # Parallel edges and self-loops included
+    return [(rng.randrange(n), rng.randrange(n), rng.randint(0, 20)) for _ in range(m)]
+
+
+def _relaxed(n: int, edges, sources) -> list[float]:
+    """Distances by relaxing every edge until nothing improves (non-negative weights)."""
+    dist = [INF] * n
+    for s in sources:
+        dist[s] = 0
+    changed = True
+    while changed:
+        changed = False
+        for u, v, w in edges:
+            if dist[u] + w < dist[v]:
+                dist[v], changed = dist[u] + w, True
+    return dist
+
+
+def test_from_edges_groups_out_edges_in_input_order():
+    edges = [(2, 0, 5), (0, 1, 1), (2, 1, 7), (0, 2, 3)]
+    graph = CSRGraph.from_edges(3, edges)
+    assert list(graph.offsets) == [0, 2, 2, 4]
+    assert list(graph.neighbors(0)) == [(1, 1), (2, 3)]
+    assert list(graph.neighbors(2)) == [(0, 5), (1, 7)]
+    assert (len(graph), graph.edge_count, graph.degree(1)) == (3, 4, 0)
+
+
+def test_from_edges_undirected_and_separate_weights():
+    graph = CSRGraph.from_edges(3, [(0, 1), (1, 2)], [0.5, 0.25], undirected=True, typecode="d")
+    assert sorted(graph.neighbors(1)) == [(0, 0.5), (2, 0.25)]
+    assert graph.weights.typecode == "d"
+
+
+def test_from_edges_rejects_mismatched_weights():
+    with pytest.raises(ValueError):
+        CSRGraph.from_edges(3, [(0, 1), (1, 2)], [1])
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_dijkstra_csr_matches_relaxation(seed):
+    rng = random.Random(seed)
+    n = rng.randint(1, 30)
+    edges = _random_edges(rng, n, rng.randint(0, 4 * n))
+    sources = rng.sample(range(n), rng.randint(1, min(3, n)))
+    graph = CSRGraph.from_edges(n, edges)
+
+    dist, parent = dijkstra_csr(graph, sources)
+    assert dist == _relaxed(n, edges, sources)
+
+    # Each parent link is a tight edge, so the path costs exactly dist[target]
+    weight = {}
+    for u, v, w in edges:
+        weight[u, v] = min(w, weight.get((u, v), INF))
+    for target in range(n):
+        path = shortest_path(dist, parent, target)
+        if dist[target] == INF:
+            assert path == []
+            continue
+        assert path[0] in sources and path[-1] == target
+        assert sum(weight[u, v] for u, v in pairwise(path)) == dist[target]
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_dijkstra_csr_early_exit_finalizes_target(seed):
+    rng = random.Random(seed)
+    n = rng.randint(2, 30)
+    edges = _random_edges(rng, n, 3 * n)
+    graph = CSRGraph.from_edges(n, edges)
+    target = rng.randrange(n)
+    dist, _ = dijkstra_csr(graph, 0, target=target)
+    assert dist[target] == _relaxed(n, edges, [0])[target]
@@ -0,0 +1,116 @@
+"""SectionHeads: one dict lookup per line gives the same heads as the per-section checks it replaced."""
+
+import ast
+
+import pytest
+from conftest import ALGORITHMS
+from docstring_parser import (
+    _SECTION_HEADS,
+    _process_section_lines,
+    parse_sections,
+    parse_simple_docstring,
+    section_heads,
+)
+
+PROBLEM_SECTIONS = ("Title", "Definition", "Leetcode", "Difficulty", "Topics", "Group")
+SOLUTION_SECTIONS = ("Intuition", "Time Complexity", "Space Complexity", "Args", "Expressions", "Variables", "Returns")
+
+
+def _startswith_parse(docstring: str, expected_sections, nested_indent: int) -> dict[str, str]:
+    """The previous parse_simple_docstring: every expected section tried with startswith on every line."""
+    result, section, lines = {}, None, []
+
+    def flush():
+        if section and lines and (content := _process_section_lines(lines, nested_indent)):
+            result[section.lower().replace(" ", "_")] = content
+
+    for line in docstring.strip().splitlines():
+        stripped = line.strip()
+        if not stripped:
+            if section and lines:
+                lines.append("")
+            continue
+        head = next((s for s in expected_sections if stripped.lower().startswith(f"{s.lower()}:")), None)
+        if head:
+            flush()
+            section, lines = head, []
+            if value := stripped[len(head) + 1:].strip():
+                lines.append(("", value))
+        elif section:
+            lines.append((line[: len(line) - len(line.lstrip())], stripped))
+    flush()
+    return result
+
+
+def _docstrings() -> list[tuple[str, str]]:
+    found = []
+    for path in sorted(ALGORITHMS.rglob("*.py")):
+        try:
+            tree = ast.parse(path.read_text(encoding="utf-8"))
+        except SyntaxError:
+            continue
+        for node in ast.walk(tree):
+            if isinstance(node, (ast.Module, ast.FunctionDef, ast.ClassDef)) and (doc := ast.get_docstring(node)):
+                found.append((f"{path.relative_to(ALGORITHMS)}:{getattr(node, 'name', '')}", doc))
+    return found
+
+
+DOCSTRINGS = _docstrings()
+
+
+def test_match():
+    heads = section_heads(("Time Complexity", "Args"))
+    assert heads.match("Time Complexity: O(n)") == ("Time Complexity", " O(n)")
+    assert heads.match("Args:") == ("Args", "")
+    assert heads.match("args:") is None
+    assert heads.match("Arguments: x") is None
+    assert heads.match(": x") is None
+    assert heads.match("no colon") is None
+
+
+def test_case_insensitive_match_returns_the_canonical_name():
+    heads = section_heads(("Time Complexity",), case_sensitive=False)
+    assert heads.match("time COMPLEXITY: O(1)") == ("Time Complexity", " O(1)")
+
+
+def test_matchers_are_shared_per_section_list():
+    assert section_heads(PROBLEM_SECTIONS, False) is section_heads(PROBLEM_SECTIONS, False)
+    assert section_heads(PROBLEM_SECTIONS, False) is not section_heads(PROBLEM_SECTIONS, True)
+
+
+def test_parse_simple_docstring_layout():
+    doc = "Title: Two Sum\nDefinition: Find two numbers:\n    that add up\n        to target\n\nTopics: [array, hash]"
+    assert parse_simple_docstring(doc, PROBLEM_SECTIONS) == {
+        "title": "Two Sum",
+        "definition": "Find two numbers:\n    that add up\n        to target",
+        "topics": "[array, hash]",
+    }
+    assert parse_simple_docstring(doc, PROBLEM_SECTIONS, nested_indent=0)["definition"] == (
+        "Find two numbers:\nthat add up\n    to target"
+    )
+
+
+@pytest.mark.parametrize("sections", [PROBLEM_SECTIONS, SOLUTION_SECTIONS], ids=["problem", "solution"])
+@pytest.mark.parametrize("nested_indent", [4, 0])
+def test_parse_simple_docstring_matches_startswith_on_the_tree(sections, nested_indent):
+    for where, doc in DOCSTRINGS:
+        expected = _startswith_parse(doc, sections, nested_indent)
+        assert parse_simple_docstring(doc, sections, nested_indent) == expected, where
+
+
+def test_parse_sections_heads_match_the_membership_check_on_the_tree():
+    heads = section_heads(_SECTION_HEADS)
+    for _, doc in DOCSTRINGS:
+        for line in doc.splitlines():
+            s = line.strip()
+            head = heads.match(s) if s.endswith(":") else None
+            assert bool(head and not head[1]) == (s.endswith(":") and s[:-1] in _SECTION_HEADS), s
+
+
+def test_parse_sections():
+    doc = "Summary line.\n\nTime Complexity:\n    O(n)\n\nTopics:\n    array, two pointers\n"
+    assert parse_sections(doc) == {
+        "summary": "Summary line.",
+        "time_complexity": "O(n)",
+        "topics": ["array", "two pointers"],
+    }
@@ -0,0 +1,125 @@
+"""Documented expressions: the one-pass matcher against the per-expression search it replaced."""
+
+import random
+
+import pytest
+from generate_expressions import expressions_for_source, find_expression_positions
+from source_model import SourceFile
+
+
+def _find_each(source_lines: list[str], expr_text: str) -> list[dict]:
+    """The previous search: str.find for one expression, restarting one character past each hit."""
+    positions = []
+    for line_num, line in enumerate(source_lines):
+        pos = line.find(expr_text)
+        while pos != -1:
+            span = {"start": {"line": line_num, "character": pos},
+                    "end": {"line": line_num, "character": pos + len(expr_text)}}
+            positions.append({"range": span, "nameRange": span})
+            pos = line.find(expr_text, pos + 1)
+    return positions
+
+
+def _starts(positions: list[dict]) -> list[tuple[int, int]]:
+    return [(p["range"]["start"]["line"], p["range"]["start"]["character"]) for p in positions]
+
+
+def test_overlapping_occurrences():
+    found = find_expression_positions(["x = aaaa"], ["aa"])
+    assert _starts(found["aa"]) == [(0, 4), (0, 5), (0, 6)]
+
+
+def test_nested_occurrences():
+    lines = ["best = max(max(a, b), c)"]
+    found = find_expression_positions(lines, ["max(a, b)", "max(max(a, b), c)"])
+    assert _starts(found["max(max(a, b), c)"]) == [(0, 7)]
+    assert _starts(found["max(a, b)"]) == [(0, 11)]
+
+
+def test_prefix_expressions_are_all_reported():
+    lines = ["hold1 = max(hold1, -p)", "hold1 += 1"]
+    exprs = ["hold1", "hold1 = max(hold1, -p)", "hold1 = max"]
+    found = find_expression_positions(lines, exprs)
+    assert list(found) == exprs
+    assert _starts(found["hold1"]) == [(0, 0), (0, 12), (1, 0)]
+    assert _starts(found["hold1 = max"]) == [(0, 0)]
+    assert _starts(found["hold1 = max(hold1, -p)"]) == [(0, 0)]
+    assert found["hold1 = max"][0]["range"]["end"] == {"line": 0, "character": 11}
+
+
+def test_line_range_is_inclusive_and_clamped():
+    lines = ["a + b", "a + b", "a + b"]
+    assert _starts(find_expression_positions(lines, ["a + b"], (1, 1))["a + b"]) == [(1, 0)]
+    assert _starts(find_expression_positions(lines, ["a + b"], (-3, 99))["a + b"]) == [(0, 0), (1, 0), (2, 0)]
+
+
+@pytest.mark.parametrize("seed", range(200))
+def test_matches_the_per_expression_search(seed):
+    rng = random.Random(seed)
+    # A small alphabet makes overlaps, nesting and shared prefixes common
+    lines = ["".join(rng.choice("ab(), ") for _ in range(rng.randint(0, 30))) for _ in range(rng.randint(1, 6))]
+    exprs = []
+    for _ in range(rng.randint(1, 6)):
+        line = rng.choice(lines)
+        if line and rng.random() < 0.8:
+            start = rng.randrange(len(line))
+            exprs.append(line[start:start + rng.randint(1, 6)])
+        else:
+            exprs.append("".join(rng.choice("ab(") for _ in range(rng.randint(1, 3))))
+    exprs = list(dict.fromkeys(exprs))
+
+    found = find_expression_positions(lines, exprs)
+    assert found == {e: _find_each(lines, e) for e in exprs}
+
+
+SOURCE = '''def first(xs):
+    """
+    Expressions:
+        'total += x': accumulate
+    """
+    total = 0
+    for x in xs:
+        total += x
+    return total
+
+
+def second(xs):
+    """
+    Expressions:
+        'total += x': accumulate the other way
+    """
+    total = 0
+    for x in reversed(xs):
+        total += x
+    return total
+'''
+
+
+def _expressions(tmp_path, text: str) -> dict[str, list[tuple[int, int]]]:
+    path = tmp_path / "solution.py"
+    path.write_text(text)
+    by_qname: dict[str, list[tuple[int, int]]] = {}
+    for entry in expressions_for_source(SourceFile.load(path, tmp_path)):
+        by_qname.setdefault(entry["qname"], []).append(_starts([entry])[0])
+    return by_qname
+
+
+def test_each_function_only_matches_its_own_lines(tmp_path):
+    # Cleaned lines: first's `total += x` is on line 3, second's on line 9
+    assert _expressions(tmp_path, SOURCE) == {
+        "solution:first.total += x": [(3, 8)],
+        "solution:second.total += x": [(9, 8)],
+    }
+
+
+def test_unparsable_cleaned_code_falls_back_to_the_whole_file(tmp_path):
+    # A function whose body is only its docstring is empty once cleaned, so the cleaned tree fails to parse
+    text = SOURCE + '\n\ndef stub():\n    """Nothing to see."""\n'
+    probe = tmp_path / "probe.py"
+    probe.write_text(text)
+    with pytest.raises(SyntaxError):
+        _ = SourceFile.load(probe).cleaned_tree
+    assert _expressions(tmp_path, text) == {
+        "solution:first.total += x": [(3, 8), (9, 8)],
+        "solution:second.total += x": [(3, 8), (9, 8)],
+    }
@@ -0,0 +1,99 @@
+"""lsp_index.ranges.json: the columnar sidecar decodes back to the symbols in lsp_index.json."""
+
+import base64
+import json
+import sys
+from array import array
+
+from conftest import ALGORITHMS
+from generate_lsp_index import (
+    document_symbols,
+    iter_python_files,
+    ranges_path,
+    write_lsp_index,
+)
+from source_model import SourceFile, scan_files
+
+PROBLEM = "1584-min-cost-to-connect-all-points"
+
+
+def _documents(files) -> list[dict]:
+    documents = []
+    for path in files:
+        try:
+            documents.append(document_symbols(SourceFile.load(path, ALGORITHMS)))
+        except SyntaxError:
+            continue
+    return documents
+
+
+def _int32(encoded: str) -> list[int]:
+    column = array("i")
+    column.frombytes(base64.b64decode(encoded))
+    if sys.byteorder == "big":
+        column.byteswap()
+    return column.tolist()
+
+
+def _position(rng: dict) -> tuple[int, int, int, int]:
+    return rng["start"]["line"], rng["start"]["character"], rng["end"]["line"], rng["end"]["character"]
+
+
+def _assert_round_trip(out) -> None:
+    """Every column of the sidecar against a depth-first walk of lsp_index.json."""
+    documents = json.loads(out.read_text())["documents"]
+    sidecar = json.loads(ranges_path(out).read_text())
+    offsets, kinds, parents = _int32(sidecar["offsets"]), _int32(sidecar["kinds"]), _int32(sidecar["parents"])
+    ranges, name_ranges = _int32(sidecar["ranges"]), _int32(sidecar["nameRanges"])
+
+    assert sidecar["format"] == 1
+    assert sidecar["uris"] == [doc["uri"] for doc in documents]
+    assert len(offsets) == len(documents) + 1 and offsets[0] == 0
+
+    expected = []
+
+    def walk(symbols: list[dict], parent: int) -> None:
+        for symbol in symbols:
+            index = len(expected)
+            expected.append((symbol["name"], symbol["kind"], parent, _position(symbol["range"]),
+                             _position(symbol["nameRange"])))
+            walk(symbol["children"], index)
+
+    for d, doc in enumerate(documents):
+        walk(doc["symbols"], -1)
+        assert offsets[d + 1] == len(expected), doc["uri"]
+        # Within a document symbols come sorted by start, so they can be binary-searched
+        starts = [tuple(ranges[4 * i:4 * i + 2]) for i in range(offsets[d], offsets[d + 1])]
+        assert starts == sorted(starts), doc["uri"]
+
+    decoded = [
+        (name, kinds[i], parents[i], tuple(ranges[4 * i:4 * i + 4]), tuple(name_ranges[4 * i:4 * i + 4]))
+        for i, name in enumerate(sidecar["names"])
+    ]
+    assert decoded == expected
+
+
+def test_sidecar_round_trips_the_tree(tmp_path):
+    out = tmp_path / "lsp_index.json"
+    write_lsp_index(out, _documents(iter_python_files(ALGORITHMS)), ranges_out=ranges_path(out))
+    _assert_round_trip(out)
+    assert any(parent >= 0 for parent in _int32(json.loads(ranges_path(out).read_text())["parents"]))
+
+
+def test_single_problem_write_refreshes_an_existing_sidecar(tmp_path):
+    out = tmp_path / "lsp_index.json"
+    write_lsp_index(out, _documents(iter_python_files(ALGORITHMS)), ranges_out=ranges_path(out))
+
+    documents = _documents(scan_files(ALGORITHMS, PROBLEM))
+    for doc in documents:
+        # Shift every symbol by a line so the refreshed sidecar differs from the old one
+        for symbol in doc["symbols"]:
+            symbol["range"]["start"]["line"] += 1
+    write_lsp_index(out, documents, PROBLEM)
+    _assert_round_trip(out)
+
+
+def test_no_sidecar_unless_asked_for(tmp_path):
+    out = tmp_path / "lsp_index.json"
+    write_lsp_index(out, _documents(scan_files(ALGORITHMS, PROBLEM)), PROBLEM)
+    assert not ranges_path(out).exists()
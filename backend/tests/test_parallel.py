@@ -0,0 +1,27 @@
+"""parallel_map / parallel_imap: input order, and no process pool for fewer than two items."""
+
+import parallel
+import pytest
+
+
+def _square(x: int) -> int:
+    return x * x
+
+
+class NoPool:
+    def __init__(self, *args, **kwargs):
+        raise AssertionError("started a process pool")
+
+
+@pytest.mark.parametrize(("items", "expected"), [([], []), ([3], [9]), (iter([3]), [9])])
+def test_fewer_than_two_items_run_in_process(monkeypatch, items, expected):
+    monkeypatch.setattr(parallel, "ProcessPoolExecutor", NoPool)
+    assert list(parallel.parallel_imap(_square, items, jobs=4)) == expected
+    assert parallel.parallel_map(_square, [3], jobs=4) == [9]
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_results_come_back_in_input_order(jobs):
+    items = range(20)
+    assert parallel.parallel_map(_square, items, jobs) == [x * x for x in items]
+    assert list(parallel.parallel_imap(_square, iter(items), jobs, window=3)) == [x * x for x in items]
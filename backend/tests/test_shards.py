@@ -0,0 +1,175 @@
+"""Per-problem fragments: patching round-trips to a full write, and stale fragments are rebuilt."""
+
+import json
+import os
+import random
+
+import pytest
+from json_writer import dump_compact_arrays, dump_range_index, write_json
+from shards import (
+    read_manifest,
+    shard_dir,
+    write_sharded_index,
+    write_sharded_problems_metadata,
+)
+
+
+def _use(line: int, qname: str) -> dict:
+    span = {"start": {"line": line, "character": 4}, "end": {"line": line, "character": 9}}
+    return {"range": span, "nameRange": span, "qname": qname, "kind": "function"}
+
+
+USES = {
+    "core/dijkstra/algorithm.py": [_use(1, "heapq.heappop")],
+    "problems/1-two-sum/solution.py": [_use(3, "builtins.enumerate")],
+    "problems/53-maximum-subarray/solution.py": [_use(5, "builtins.max"), _use(6, "builtins.len")],
+}
+
+METADATA = {
+    "problems": {
+        "1-two-sum": {"title": "Two Sum", "topics": ["hash_table"]},
+        "53-maximum-subarray": {"title": "Maximum Subarray", "topics": ["dp", "kadane"]},
+    },
+    "core": {"dijkstra": {"title": "Dijkstra's Algorithm"}},
+}
+
+
+def _full_write(path, obj, dump) -> bytes:
+    write_json(path, obj, dump)
+    return path.read_bytes()
+
+
+def test_uses_full_write_matches_unsharded_layout(tmp_path):
+    out = tmp_path / "uses.json"
+    write_sharded_index(out, USES)
+    assert out.read_bytes() == _full_write(tmp_path / "plain.json", USES, dump_range_index)
+    manifest = read_manifest(shard_dir(out), out)
+    assert manifest["shards"] == ["_core", "1-two-sum", "53-maximum-subarray"]
+    # Each span holds its fragment's entries verbatim
+    combined = out.read_bytes()
+    for shard, (start, end) in manifest["spans"].items():
+        assert combined[start:end] == (shard_dir(out) / f"{shard}.json").read_bytes()[2:-2]
+
+
+def test_uses_single_problem_splice_matches_full_write(tmp_path):
+    out = tmp_path / "uses.json"
+    write_sharded_index(out, USES)
+
+    update = {"problems/53-maximum-subarray/solution.py": [_use(8, "builtins.sum")]}
+    write_sharded_index(out, update, problem="53-maximum-subarray")
+
+    expected = {**USES, **update}
+    assert out.read_bytes() == _full_write(tmp_path / "plain.json", expected, dump_range_index)
+
+
+def test_uses_new_problem_is_inserted_in_scan_order(tmp_path):
+    out = tmp_path / "uses.json"
+    write_sharded_index(out, USES)
+
+    update = {"problems/20-valid-parentheses/solution.py": [_use(2, "builtins.len")]}
+    write_sharded_index(out, update, problem="20-valid-parentheses")
+
+    assert read_manifest(shard_dir(out), out)["shards"] == [
+        "_core", "1-two-sum", "20-valid-parentheses", "53-maximum-subarray",
+    ]
+    expected = dict(sorted({**USES, **update}.items()))
+    assert out.read_bytes() == _full_write(tmp_path / "plain.json", expected, dump_range_index)
+
+
+def test_uses_single_problem_run_reads_no_other_fragment(tmp_path):
+    out = tmp_path / "uses.json"
+    write_sharded_index(out, USES)
+    (shard_dir(out) / "_core.json").unlink()
+    (shard_dir(out) / "1-two-sum.json").unlink()
+
+    update = {"problems/1-two-sum/solution.py": [_use(4, "builtins.sum")]}
+    write_sharded_index(out, update, problem="1-two-sum")
+    write_sharded_index(out, {}, problem="53-maximum-subarray")
+
+    expected = {k: v for k, v in {**USES, **update}.items() if "53-maximum-subarray" not in k}
+    assert out.read_bytes() == _full_write(tmp_path / "plain.json", expected, dump_range_index)
+    assert read_manifest(shard_dir(out), out)["shards"] == ["_core", "1-two-sum"]
+    assert not (shard_dir(out) / "53-maximum-subarray.json").exists()
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_uses_random_single_problem_runs_match_a_full_write(tmp_path, seed):
+    rng = random.Random(seed)
+    out, index = tmp_path / "uses.json", dict(USES)
+    write_sharded_index(out, index)
+    for step in range(20):
+        problem = rng.choice(["1-two-sum", "2-add-two-numbers", "20-valid-parentheses", "53-maximum-subarray"])
+        files = rng.sample(["solution.py", "alt.py", "ü.py"], rng.randint(0, 2))
+        update = {f"problems/{problem}/{name}": [_use(step, "builtins.len")] for name in files}
+        if rng.random() < 0.3:
+            update["core/heap.py"] = [_use(step, "heapq.heappush")]
+        write_sharded_index(out, update, problem=problem)
+        index = {k: v for k, v in index.items() if not k.startswith(f"problems/{problem}/")}
+        index.update(update)
+
+        write_sharded_index(tmp_path / "full" / "uses.json", index)
+        assert out.read_bytes() == (tmp_path / "full" / "uses.json").read_bytes()
+
+
+def test_uses_touched_combined_file_is_stale(tmp_path):
+    out = tmp_path / "uses.json"
+    write_sharded_index(out, USES)
+    assert read_manifest(shard_dir(out), out) is not None
+
+    # Same size, new mtime: the stamp no longer matches
+    stat = out.stat()
+    os.utime(out, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert read_manifest(shard_dir(out), out) is None
+
+
+def test_uses_edited_combined_file_is_not_reverted(tmp_path):
+    out = tmp_path / "uses.json"
+    write_sharded_index(out, USES)
+
+    # The combined file changes behind the fragments' back (edit, checkout, older run)
+    edited = {**USES, "problems/1-two-sum/solution.py": [_use(7, "builtins.dict")]}
+    write_json(out, edited, dump_range_index)
+    assert read_manifest(shard_dir(out), out) is None
+
+    update = {"problems/53-maximum-subarray/solution.py": [_use(8, "builtins.sum")]}
+    write_sharded_index(out, update, problem="53-maximum-subarray")
+
+    assert json.loads(out.read_text()) == {**edited, **update}
+    fragment = json.loads((shard_dir(out) / "1-two-sum.json").read_text())
+    assert fragment == {"problems/1-two-sum/solution.py": edited["problems/1-two-sum/solution.py"]}
+
+
+def test_problems_metadata_single_problem_splice_matches_full_write(tmp_path):
+    out = tmp_path / "problems_metadata.json"
+    write_sharded_problems_metadata(out, METADATA["problems"], METADATA["core"])
+    assert out.read_bytes() == _full_write(tmp_path / "plain.json", METADATA, dump_compact_arrays)
+
+    update = {"53-maximum-subarray": {"title": "Maximum Subarray", "topics": ["dp"]}}
+    write_sharded_problems_metadata(out, update, problem="53-maximum-subarray")
+
+    expected = {"problems": {**METADATA["problems"], **update}, "core": METADATA["core"]}
+    assert out.read_bytes() == _full_write(tmp_path / "plain.json", expected, dump_compact_arrays)
+
+    # A new problem goes in slug order, before the core section
+    added = {"10-regular-expression-matching": {"title": "Regular Expression Matching", "topics": []}}
+    write_sharded_problems_metadata(out, added, problem="10-regular-expression-matching")
+
+    expected["problems"] = dict(sorted({**expected["problems"], **added}.items()))
+    assert out.read_bytes() == _full_write(tmp_path / "plain.json", expected, dump_compact_arrays)
+
+
+def test_problems_metadata_edited_combined_file_is_not_reverted(tmp_path):
+    out = tmp_path / "problems_metadata.json"
+    write_sharded_problems_metadata(out, METADATA["problems"], METADATA["core"])
+
+    edited = json.loads(out.read_text())
+    edited["problems"]["1-two-sum"]["title"] = "Two Sum (edited)"
+    write_json(out, edited, dump_compact_arrays)
+
+    update = {"53-maximum-subarray": {"title": "Maximum Subarray", "topics": ["dp"]}}
+    write_sharded_problems_metadata(out, update, problem="53-maximum-subarray")
+
+    result = json.loads(out.read_text())
+    assert result["problems"]["1-two-sum"]["title"] == "Two Sum (edited)"
+    assert result["problems"]["53-maximum-subarray"] == update["53-maximum-subarray"]
+    assert result["core"] == METADATA["core"]
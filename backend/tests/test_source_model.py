@@ -0,0 +1,118 @@
+"""ModuleGraph: import resolution to workspace module names, and the uses it produces."""
+
+from generate_uses import uses_for_source
+from source_model import ModuleGraph, SourceFile
+
+MODULES = {
+    "core/Tree/__init__.py": "from .binary_tree_node import TreeNode\n",
+    "core/Tree/binary_tree_node.py": "class TreeNode:\n    pass\n",
+    "core/graphs/__init__.py": "",
+    "core/graphs/bfs.py": "def walk(n):\n    return n\n",
+    "more/tictactoe/game.py": "class Game:\n    pass\n",
+    "more/tictactoe/tictactoe.py": "from game import Game\n\nX, O = 'X', 'O'\n",
+    "more/tictactoe/runner/play.py": "import sys\n",
+    "problems/1-walk/solution.py": "",
+    "problems/1-walk/utils.py": "def helper():\n    pass\n",
+    "problems/2-own/utils.py": "import utils\n",
+}
+
+
+def _graph(tmp_path) -> ModuleGraph:
+    root = tmp_path / "algorithms"
+    for rel, text in MODULES.items():
+        (root / rel).parent.mkdir(parents=True, exist_ok=True)
+        (root / rel).write_text(text)
+    return ModuleGraph.scan(root)
+
+
+def test_packages_resolve_to_their_init_module(tmp_path):
+    graph = _graph(tmp_path)
+    assert graph.canonical("core.Tree") == "core.Tree.__init__"
+    assert graph.canonical("core.Tree.__init__") == "core.Tree.__init__"
+    assert graph.canonical("core.Tree.binary_tree_node") == "core.Tree.binary_tree_node"
+    assert graph.canonical("core.Tree.missing") is None
+
+
+def test_root_package_prefixes_are_stripped(tmp_path):
+    graph = _graph(tmp_path)
+    importer = "problems.1-walk.solution"
+    for module in ("backend.algorithms.core.Tree.binary_tree_node", "algorithms.core.Tree.binary_tree_node"):
+        assert graph.resolve(importer, module) == "core.Tree.binary_tree_node"
+    assert graph.resolve(importer, "backend.algorithms.core.Tree") == "core.Tree.__init__"
+
+
+def test_sibling_of_the_importer(tmp_path):
+    graph = _graph(tmp_path)
+    assert graph.resolve("more.tictactoe.tictactoe", "game") == "more.tictactoe.game"
+    assert graph.resolve("problems.1-walk.solution", "utils") == "problems.1-walk.utils"
+
+
+def test_the_importer_is_never_its_own_match(tmp_path):
+    # problems/2-own/utils.py importing `utils` is not importing itself
+    assert _graph(tmp_path).resolve("problems.2-own.utils", "utils") == "utils"
+
+
+def test_sys_path_additions_are_relative_to_the_importer(tmp_path):
+    graph = _graph(tmp_path)
+    assert graph.resolve("more.tictactoe.runner.play", "game") == "game"
+    assert graph.resolve("more.tictactoe.runner.play", "game", ("..",)) == "more.tictactoe.game"
+    # Additions that leave the scan root match nothing
+    assert graph.resolve("more.tictactoe.runner.play", "game", ("../../../..",)) == "game"
+
+
+def test_unknown_modules_are_returned_unchanged(tmp_path):
+    graph = _graph(tmp_path)
+    assert graph.resolve("problems.1-walk.solution", "heapq") == "heapq"
+    assert graph.resolve("problems.1-walk.solution", "collections.abc") == "collections.abc"
+
+
+def test_resolve_is_memoized_per_importer_and_additions(tmp_path):
+    graph = _graph(tmp_path)
+    graph.resolve("more.tictactoe.runner.play", "game")
+    graph.resolve("more.tictactoe.runner.play", "game")
+    graph.resolve("more.tictactoe.runner.play", "game", ("..",))
+    assert len(graph._resolved) == 2
+
+
+def test_exports_and_fingerprint(tmp_path):
+    graph = _graph(tmp_path)
+    assert graph.exports("core.Tree.__init__") == {"TreeNode"}
+    assert graph.exports("more.tictactoe.tictactoe") == {"Game", "X", "O"}
+    assert graph.exports("no.such.module") == frozenset()
+
+    other = _graph(tmp_path / "copy")
+    assert other.fingerprint == graph.fingerprint
+    (other.root / "core" / "graphs" / "dfs.py").write_text("")
+    assert ModuleGraph.scan(other.root).fingerprint != graph.fingerprint
+
+
+def _qnames(graph: ModuleGraph, rel: str, text: str) -> set[str]:
+    path = graph.root / rel
+    path.write_text(text)
+    return {use["qname"] for use in uses_for_source(SourceFile.load(path, graph.root), graph)}
+
+
+def test_uses_resolve_to_workspace_modules(tmp_path):
+    graph = _graph(tmp_path)
+    qnames = _qnames(
+        graph,
+        "problems/1-walk/solution.py",
+        "from backend.algorithms.core.Tree.binary_tree_node import TreeNode\n"
+        "from core.graphs import bfs\n"
+        "from core.Tree import TreeNode as Node\n"
+        "import utils\n"
+        "\n"
+        "TreeNode(), bfs.walk(1), Node(), utils.helper()\n",
+    )
+    assert {
+        "core.Tree.binary_tree_node:TreeNode",
+        "core.graphs.bfs:walk",
+        "core.Tree.__init__:TreeNode",
+        "problems.1-walk.utils:helper",
+    } <= qnames
+
+
+def test_relative_imports_anchor_at_the_importers_package(tmp_path):
+    graph = _graph(tmp_path)
+    qnames = _qnames(graph, "core/Tree/traverse.py", "from . import binary_tree_node\nbinary_tree_node.TreeNode\n")
+    assert "core.Tree.binary_tree_node:TreeNode" in qnames
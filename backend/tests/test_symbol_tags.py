@@ -0,0 +1,44 @@
+"""symbol_tags.json: byte-identical for every job count, start method and hash seed."""
+
+import ast
+import multiprocessing
+import os
+import subprocess
+import sys
+
+import pytest
+from conftest import ALGORITHMS, SCRIPTS
+from docstring_parser import _process_args_lsp
+
+# Runs generate_symbol_tags.py under a given multiprocessing start method
+RUN = """
+import multiprocessing, runpy, sys
+multiprocessing.set_start_method(sys.argv[1])
+sys.argv = ["generate_symbol_tags.py", *sys.argv[2:]]
+runpy.run_path("generate_symbol_tags.py", run_name="__main__")
+"""
+
+
+def _symbol_tags(tmp_path, jobs: int, start_method: str, hash_seed: int) -> bytes:
+    out = tmp_path / f"symbol_tags-{jobs}-{start_method}-{hash_seed}.json"
+    subprocess.run(
+        [sys.executable, "-c", RUN, start_method, "--root", str(ALGORITHMS), "--out", str(out), "--jobs", str(jobs)],
+        cwd=SCRIPTS, env={**os.environ, "PYTHONHASHSEED": str(hash_seed)}, check=True, capture_output=True,
+    )
+    return out.read_bytes()
+
+
+@pytest.mark.parametrize("start_method", ["fork", "forkserver", "spawn"])
+def test_jobs_do_not_change_the_output(tmp_path, start_method):
+    if start_method not in multiprocessing.get_all_start_methods():
+        pytest.skip(f"{start_method} is not available here")
+    serial = _symbol_tags(tmp_path, 1, "spawn", hash_seed=1)
+    # Another seed stands in for forkserver/spawn workers, which each draw their own when it is unset
+    assert _symbol_tags(tmp_path, 3, start_method, hash_seed=2) == serial
+
+
+def test_args_follow_the_signature_then_the_docstring():
+    node = ast.parse("def f(vertices: list, edges, source: int): pass").body[0]
+    lines = ["source: start", "edges: (u, v, w)", "extra: documented only"]
+    assert list(_process_args_lsp(lines, node)) == ["vertices", "edges", "source", "extra"]
+    assert _process_args_lsp(lines, node)["edges"] == {"documentation": "(u, v, w)"}
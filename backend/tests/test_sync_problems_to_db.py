@@ -0,0 +1,136 @@
+"""DB sync: digests computed in SQL vs on disk, plan_sync, and the pipelined writer's failure handling."""
+
+import threading
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("psycopg2")
+pytest.importorskip("dotenv")
+
+import sync_problems_to_db as sync  # noqa: E402
+
+
+# Outputs of PostgreSQL 16 for the same values
+def test_jsonb_text_matches_postgres_rendering():
+    value = {"b": 1, "aa": [1, "x\n"], "é": None, "c": {"zz": True, "y": "\x01"}}
+    assert sync.jsonb_text(value) == '{"b": 1, "c": {"y": "\\u0001", "zz": true}, "aa": [1, "x\\n"], "é": null}'
+
+
+def test_text_array_matches_array_to_json():
+    assert sync._text_array(["dp", "two pointers", "é"]) == '["dp","two pointers","é"]'
+
+
+def test_row_digest_matches_sql_digest():
+    # md5(concat_ws(',', coalesce(md5('a'), 'null'), coalesce(md5(NULL), 'null'), coalesce(md5(3::text), 'null')))
+    columns = [("a", sync._text), ("b", sync._text), ("c", sync._text)]
+    assert sync.row_digest(columns, ("a", None, 3)) == "4557baa2eab421e039ab030348aca775"
+    assert sync.digest_sql(columns) == (
+        "md5(concat_ws(',', coalesce(md5(a), 'null'), coalesce(md5(b), 'null'), coalesce(md5(c), 'null')))"
+    )
+
+
+class DigestCursor:
+    """Answers plan_sync's two queries from rows digested as the database would."""
+
+    def __init__(self, problems: list[tuple], solutions: list[tuple]):
+        self.problems, self.solutions, self.queries = problems, solutions, []
+
+    def execute(self, sql, params=None):
+        self.queries.append(sql)
+        self.last = self.problems if "FROM problems p\n" in sql else self.solutions
+
+    def fetchall(self):
+        return self.last
+
+
+def _problem(slug: str, solutions: dict[str, str]) -> dict:
+    return {
+        "slug": slug,
+        "metadata": {"title": slug.title(), "difficulty": "Easy", "topics": ["array"]},
+        "solutions": [(name, {"code": code}, i) for i, (name, code) in enumerate(solutions.items())],
+        "file_names": list(solutions),
+    }
+
+
+def _db_rows(problem: dict, problem_id: str) -> tuple[tuple, list[tuple]]:
+    slug = problem["slug"]
+    problem_row = (problem_id, slug, sync.row_digest(
+        sync.PROBLEM_DIGEST_COLUMNS, sync.problem_values(slug, problem["metadata"])))
+    solution_rows = [
+        (f"{problem_id}/{name}", slug, name,
+         sync.row_digest(sync.SOLUTION_DIGEST_COLUMNS, sync.solution_values(name, data, i)))
+        for name, data, i in problem["solutions"]
+    ]
+    return problem_row, solution_rows
+
+
+def test_plan_sync_compares_digests_only():
+    stored = _problem("1-two-sum", {"hash.py": "return 1", "brute.py": "return 2", "old.py": "pass"})
+    problem_row, solution_rows = _db_rows(stored, "p1")
+    cursor = DigestCursor([problem_row], solution_rows)
+
+    disk = [
+        _problem("1-two-sum", {"hash.py": "return 1", "brute.py": "return 3"}),
+        _problem("20-valid-parentheses", {"stack.py": "return []"}),
+    ]
+    plan = sync.plan_sync(cursor, disk)
+
+    assert plan["counts"] == {"insert": 2, "update": 1, "delete": 1, "unchanged": 2}
+    assert plan["changes"] == [
+        ("update", "1-two-sum/brute.py"),
+        ("delete", "1-two-sum/old.py"),
+        ("insert", "20-valid-parentheses"),
+        ("insert", "20-valid-parentheses/stack.py"),
+    ]
+    assert plan["deletes"] == ["p1/old.py"]
+    # Only hashes are selected, never the content columns themselves
+    assert all("s.code," not in sql and "md5(" in sql for sql in cursor.queries)
+
+
+class FakeConnection:
+    def __init__(self, cursor_error: Exception | None = None):
+        self.cursor_error = cursor_error
+        self.committed = self.rolled_back = False
+
+    def cursor(self):
+        if self.cursor_error:
+            raise self.cursor_error
+        raise AssertionError("not expected")
+
+    def commit(self):
+        self.committed = True
+
+    def rollback(self):
+        self.rolled_back = True
+
+
+def _run_with_timeout(fn, seconds: float = 10):
+    """fn() in a thread; fails instead of hanging the suite if it deadlocks."""
+    outcome = {}
+
+    def target():
+        try:
+            outcome["result"] = fn()
+        except BaseException as e:
+            outcome["error"] = e
+
+    thread = threading.Thread(target=target, daemon=True)
+    thread.start()
+    thread.join(seconds)
+    assert not thread.is_alive(), "pipeline_sync deadlocked"
+    if "error" in outcome:
+        raise outcome["error"]
+    return outcome["result"]
+
+
+def test_writer_failure_before_first_batch_reaches_the_producer(monkeypatch):
+    # One problem per batch so the producer fills the bounded queue quickly
+    monkeypatch.setattr(sync, "BATCH_SIZE", 1)
+    monkeypatch.setattr(sync, "_collect_dir", lambda d: (d.name, {"slug": d.name}, None))
+    conn = FakeConnection(cursor_error=RuntimeError("cursor failed"))
+    dirs = [Path(f"{i}-problem") for i in range(20)]
+
+    with pytest.raises(RuntimeError, match="cursor failed"):
+        _run_with_timeout(lambda: sync.pipeline_sync(conn, dirs, jobs=1))
+    assert conn.rolled_back and not conn.committed
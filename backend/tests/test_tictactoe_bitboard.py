@@ -0,0 +1,91 @@
+"""BitboardTicTacToe: same rules as TicTacToe, and an optimal move in every reachable position."""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# The game modules import each other by bare name
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "algorithms" / "more" / "tictactoe"))
+
+from tictactoe import TicTacToe  # noqa: E402
+from tictactoe_bitboard import SYMMETRIES, BitboardTicTacToe  # noqa: E402
+
+GAME = BitboardTicTacToe()
+
+
+def _reachable() -> list[tuple[int, int]]:
+    """Every position reachable from the empty board, terminal ones included."""
+    seen, stack = set(), [GAME.initial_state()]
+    while stack:
+        state = stack.pop()
+        if state in seen:
+            continue
+        seen.add(state)
+        if not GAME.terminal(state):
+            stack.extend(GAME.result(state, action) for action in GAME.actions(state))
+    return sorted(seen)
+
+
+REACHABLE = _reachable()
+NON_TERMINAL = [state for state in REACHABLE if not GAME.terminal(state)]
+
+
+def _values() -> dict[tuple[int, int], int]:
+    """Minimax value (for X) of every reachable position by exhaustive search, no pruning or tables."""
+    values: dict[tuple[int, int], int] = {}
+    # Fuller boards first, so every successor is valued before its parent
+    for state in sorted(REACHABLE, key=lambda s: -(s[0] | s[1]).bit_count()):
+        if GAME.terminal(state):
+            values[state] = GAME.utility(state)
+        else:
+            children = [values[GAME.result(state, a)] for a in GAME.actions(state)]
+            values[state] = max(children) if GAME.player(state) == "X" else min(children)
+    return values
+
+
+VALUES = _values()
+
+
+def _optimal(engine: BitboardTicTacToe, state: tuple[int, int]) -> bool:
+    move = engine.minimax(state)
+    return move in GAME.actions(state) and VALUES[GAME.result(state, move)] == VALUES[state]
+
+
+def test_reachable_positions():
+    assert (len(REACHABLE), len(NON_TERMINAL)) == (5478, 4520)
+    assert VALUES[GAME.initial_state()] == 0
+
+
+def test_rules_match_tictactoe():
+    reference = TicTacToe()
+    for state in REACHABLE:
+        board = GAME.to_board(state)
+        assert GAME.from_board(board) == state
+        assert GAME.player(state) == reference.player(board)
+        assert GAME.actions(state) == reference.actions(board)
+        assert GAME.winner(state) == reference.winner(board)
+        assert GAME.terminal(state) == reference.terminal(board)
+        assert GAME.utility(state) == reference.utility(board)
+
+
+def test_result_rejects_occupied_cell():
+    with pytest.raises(ValueError):
+        GAME.result(GAME.result(GAME.initial_state(), (1, 1)), (1, 1))
+
+
+def test_minimax_is_optimal_with_a_persistent_table():
+    engine = BitboardTicTacToe()
+    assert all(_optimal(engine, state) for state in NON_TERMINAL)
+    # At most one entry per position up to symmetry
+    canonical = {min(t[x] | t[o] << 9 for t in SYMMETRIES) for x, o in NON_TERMINAL}
+    assert len(engine._memo) <= len(canonical)
+
+
+def test_minimax_is_optimal_with_a_fresh_table():
+    assert all(_optimal(BitboardTicTacToe(), state) for state in NON_TERMINAL)
+
+
+def test_minimax_of_terminal_position_is_none():
+    terminal = next(state for state in REACHABLE if GAME.terminal(state))
+    assert GAME.minimax(terminal) is None
@@ -0,0 +1,70 @@
+/**
+ * Loader for the per-problem fragments of the extracted metadata.
+ *
+ * backend/scripts/problems/shards.py writes uses.json and problems_metadata.json
+ * both as a combined file and as one fragment per problem under
+ * lib/extracted-metadata/shards/<name>/, listed in shards/<name>/manifest.json.
+ * Build scripts that only need one problem can read just its fragment; anything
+ * that needs all problems should read the combined file, which is cheaper than
+ * opening every fragment.
+ * Fragment names starting with "_" hold non-problem entries (e.g. "_core").
+ *
+ * The fragments are not committed; the combined file is the source of truth.
+ * The manifest records the size and mtime of the combined file the fragments
+ * were written with, and they are only read while a stat of that file still
+ * matches. Otherwise these readers return null and callers fall back to the
+ * combined file.
+ */
+
+import fs from 'fs/promises'
+import path from 'path'
+
+interface ShardManifest {
+  format: number
+  combined: { size: number; mtime_ns: string } | null
+  shards: string[]
+}
+
+const SHARDS_FORMAT = 3
+
+function shardDir(metadataDir: string, name: string): string {
+  return path.join(metadataDir, 'shards', name)
+}
+
+async function combinedIsCurrent(metadataDir: string, name: string, manifest: ShardManifest): Promise<boolean> {
+  if (!manifest.combined) return false
+  try {
+    // bigint: nanosecond mtimes do not fit a number
+    const stat = await fs.stat(path.join(metadataDir, `${name}.json`), { bigint: true })
+    return stat.size === BigInt(manifest.combined.size) && stat.mtimeNs.toString() === manifest.combined.mtime_ns
+  } catch {
+    return false
+  }
+}
+
+/**
+ * Fragment names in output order, or null if the output has not been sharded yet
+ * or its fragments are stale (the combined file changed since they were written).
+ */
+export async function readShardManifest(metadataDir: string, name: string): Promise<string[] | null> {
+  try {
+    const content = await fs.readFile(path.join(shardDir(metadataDir, name), 'manifest.json'), 'utf-8')
+    const manifest = JSON.parse(content) as ShardManifest
+    if (manifest.format !== SHARDS_FORMAT) return null
+    return (await combinedIsCurrent(metadataDir, name, manifest)) ? manifest.shards : null
+  } catch {
+    return null
+  }
+}
+
+/** One fragment, or null if it does not exist or the fragments are stale. */
+export async function readShard<T>(metadataDir: string, name: string, shard: string): Promise<T | null> {
+  const shards = await readShardManifest(metadataDir, name)
+  if (!shards?.includes(shard)) return null
+  try {
+    const content = await fs.readFile(path.join(shardDir(metadataDir, name), `${shard}.json`), 'utf-8')
+    return JSON.parse(content) as T
+  } catch {
+    return null
+  }
+}
@@ -11,6 +11,7 @@
 import fs from 'fs/promises'
 import path from 'path'
 import { fileURLToPath } from 'url'
+import { readShard } from '../lib/extracted-metadata-shards'
 
 const __filename = fileURLToPath(import.meta.url)
 const __dirname = path.dirname(__filename)
@@ -429,18 +430,21 @@ async function main(): Promise<void> {
       }
     }
 
-    // Read the problems metadata
-    const metadataPath = path.join(__dirname, '..', 'lib', 'extracted-metadata', 'problems_metadata.json')
-    const metadataContent = await fs.readFile(metadataPath, 'utf-8')
-    const problemsMetadata = (JSON.parse(metadataContent) as { problems: ProblemsMetadata }).problems
+    // Read the problems metadata: one problem's fragment if current, else the combined file
+    const metadataDir = path.join(__dirname, '..', 'lib', 'extracted-metadata')
+    const readCombined = async () => {
+      const metadataContent = await fs.readFile(path.join(metadataDir, 'problems_metadata.json'), 'utf-8')
+      return (JSON.parse(metadataContent) as { problems: ProblemsMetadata }).problems
+    }
 
     // Ensure the problems/tutorials components directory exists
     const problemsDir = path.join(__dirname, '..', 'components', 'problems', 'tutorials')
     await ensureDirectoryExists(problemsDir)
 
     if (singleProblem) {
-      // Single problem mode
-      const problem = problemsMetadata[singleProblem] as Problem | undefined
+      // Single problem mode - only this problem's fragment is read
+      const problem = (await readShard<Problem>(metadataDir, 'problems_metadata', singleProblem))
+        ?? ((await readCombined())[singleProblem] as Problem | undefined)
 
       if (!problem) {
         console.error(`❌ Problem not found in metadata: ${singleProblem}`)
@@ -473,6 +477,7 @@ async function main(): Promise<void> {
     }
 
     // Full regeneration mode
+    const problemsMetadata = await readCombined()
     console.log(`Found ${Object.keys(problemsMetadata).length} problems to generate MDX files for`)
 
     let generatedCount = 0